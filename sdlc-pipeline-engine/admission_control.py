@@ -0,0 +1,277 @@
+"""
+Admission Control
+Bounds concurrently running pipeline executions behind a durable, bounded wait queue
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Deque, List, Optional, Tuple
+
+import aiofiles
+
+
+class AdmissionRejectedError(RuntimeError):
+    """Raised when an execution cannot be admitted or queued"""
+
+    def __init__(self, message: str, queue_depth: int, estimated_wait_seconds: float):
+        super().__init__(message)
+        self.queue_depth = queue_depth
+        self.estimated_wait_seconds = estimated_wait_seconds
+
+
+class AdmissionController:
+    """Tracks running executions and queues the overflow.
+
+    At most ``max_active_executions`` run at once; up to ``max_queued_executions``
+    more wait in FIFO order (or by ``priority``, highest first, with
+    ``queue_policy: priority``). Beyond that, admission fails fast with an
+    estimated wait. Queue entries are JSON files under ``path`` so queued
+    executions survive a restart (see :meth:`recover`). In-process callers
+    that hold their own work (batch items) wait for a slot instead, behind
+    the queued executions (see :meth:`wait_for_slot`).
+    """
+
+    def __init__(self, config: Dict[str, Any], path: Path):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+
+        # 0 disables the corresponding limit
+        self.max_active_executions = config.get('max_active_executions', 10)
+        self.max_queued_executions = config.get('max_queued_executions', 100)
+        self.queue_policy = config.get('queue_policy', 'fifo')
+        # Seed for wait estimates until executions have finished
+        self.default_execution_seconds = config.get('default_execution_seconds', 300)
+        self.smoothing = config.get('smoothing', 0.2)
+
+        # execution_id -> perf_counter at admission
+        self._active: Dict[str, float] = {}
+        # (sort key, seq, execution_id) of queued entries in queue order; a key's index is its position
+        self._queue: List[tuple] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        # (execution_id, future) of in-process callers waiting for a slot, in arrival order
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+
+        self._avg_run_seconds: Optional[float] = None
+        self._avg_queue_wait_seconds: Optional[float] = None
+        self.admitted_count = 0
+        self.rejected_count = 0
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._entries)
+
+    def has_capacity(self) -> bool:
+        """Whether a new execution can start now without jumping the queue"""
+        if self._entries or self._waiters:
+            return False
+        return self._has_free_slot()
+
+    def _has_free_slot(self) -> bool:
+        return not self.max_active_executions or len(self._active) < self.max_active_executions
+
+    def admit(self, execution_id: str):
+        """Count an execution as running (resumed executions are admitted regardless of capacity)"""
+        if execution_id not in self._active:
+            self._active[execution_id] = time.perf_counter()
+            self.admitted_count += 1
+
+    def release(self, execution_id: str):
+        """Stop counting an execution as running"""
+        admitted_at = self._active.pop(execution_id, None)
+        if admitted_at is not None:
+            self._avg_run_seconds = self._smooth(self._avg_run_seconds, time.perf_counter() - admitted_at)
+
+    async def wait_for_slot(self, execution_id: str):
+        """Admit an execution once a slot is free, after everything queued before it.
+        Nothing is persisted: the caller keeps the work and waits for its turn.
+        """
+
+        if self.has_capacity():
+            self.admit(execution_id)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((execution_id, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the caller gave up
+                self._active.pop(execution_id, None)
+            else:
+                try:
+                    self._waiters.remove((execution_id, waiter))
+                except ValueError:
+                    pass
+            raise
+
+    async def enqueue(
+        self,
+        execution_id: str,
+        pipeline_id: str,
+        user_inputs: Dict[str, Any],
+        execution_options: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Queue an execution, returning its position; raises AdmissionRejectedError when full"""
+
+        if self.max_queued_executions and len(self._entries) >= self.max_queued_executions:
+            self.rejected_count += 1
+            wait = self.estimated_wait(len(self._entries))
+            raise AdmissionRejectedError(
+                f"Execution queue is full ({len(self._entries)} queued); estimated wait {wait:.0f}s",
+                len(self._entries),
+                wait
+            )
+
+        self._seq += 1
+        entry = {
+            'execution_id': execution_id,
+            'pipeline_id': pipeline_id,
+            'user_inputs': user_inputs,
+            'execution_options': execution_options or {},
+            'priority': int((execution_options or {}).get('priority', 0)),
+            'seq': self._seq,
+            'enqueued_at': datetime.utcnow().isoformat(),
+            'enqueued_at_epoch': time.time()
+        }
+        # Reserve the slot before the first await so concurrent callers see it
+        self._push(entry)
+        await self._persist(entry)
+        return self.position(execution_id)
+
+    def admit_next(self) -> List[Dict[str, Any]]:
+        """Dequeue and admit as many queued executions as capacity allows.
+        Returns the queued entries admitted; slots left over go to in-process waiters.
+        """
+
+        admitted = []
+        while self._queue and self._has_free_slot():
+            _, _, execution_id = self._queue.pop(0)
+            entry = self._entries.pop(execution_id)
+            self._unlink(execution_id)
+            self._avg_queue_wait_seconds = self._smooth(
+                self._avg_queue_wait_seconds, max(0.0, time.time() - entry['enqueued_at_epoch'])
+            )
+            self.admit(execution_id)
+            admitted.append(entry)
+
+        while self._waiters and self._has_free_slot():
+            execution_id, waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.admit(execution_id)
+            waiter.set_result(None)
+        return admitted
+
+    def remove(self, execution_id: str) -> bool:
+        """Drop a queued execution (e.g. cancelled before it started)"""
+        entry = self._entries.pop(execution_id, None)
+        if entry is None:
+            return False
+        key = self._queue_key(entry)
+        del self._queue[bisect.bisect_left(self._queue, key)]
+        self._unlink(execution_id)
+        return True
+
+    def position(self, execution_id: str) -> Optional[int]:
+        """Zero-based position of a queued execution"""
+        entry = self._entries.get(execution_id)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self._queue, self._queue_key(entry))
+
+    def estimated_wait(self, position: int) -> float:
+        """Seconds until the execution at ``position`` should start, from recent run times"""
+        if not self.max_active_executions:
+            return 0.0
+        run_seconds = self._avg_run_seconds if self._avg_run_seconds is not None else self.default_execution_seconds
+        return math.ceil((position + 1) / self.max_active_executions) * run_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'active': len(self._active),
+            'max_active': self.max_active_executions,
+            'queued': len(self._entries),
+            'max_queued': self.max_queued_executions,
+            'waiting': len(self._waiters),
+            'queue_policy': self.queue_policy,
+            'avg_execution_seconds': self._avg_run_seconds,
+            'avg_queue_wait_seconds': self._avg_queue_wait_seconds,
+            'estimated_wait_seconds': self.estimated_wait(len(self._entries)),
+            'admitted': self.admitted_count,
+            'rejected': self.rejected_count
+        }
+
+    async def recover(self) -> List[Dict[str, Any]]:
+        """Reload entries queued by a previous run, in queue order"""
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        recovered = []
+        for entry_file in self.path.glob('*.json'):
+            try:
+                async with aiofiles.open(entry_file, 'r') as f:
+                    recovered.append(json.loads(await f.read()))
+            except Exception as e:
+                self.logger.error(f"Failed to recover queued execution {entry_file.name}: {str(e)}")
+
+        recovered.sort(key=lambda entry: (self._sort_key(entry), entry['seq']))
+        for entry in recovered:
+            if entry['execution_id'] not in self._entries:
+                self._seq = max(self._seq, entry['seq'])
+                self._push(entry)
+
+        if recovered:
+            self.logger.info(f"Recovered {len(recovered)} queued executions")
+        return recovered
+
+    def _push(self, entry: Dict[str, Any]):
+        self._entries[entry['execution_id']] = entry
+        key = self._queue_key(entry)
+        # FIFO arrivals sort last, so this is almost always an append
+        if not self._queue or self._queue[-1] < key:
+            self._queue.append(key)
+        else:
+            bisect.insort(self._queue, key)
+
+    def _queue_key(self, entry: Dict[str, Any]) -> tuple:
+        return self._sort_key(entry), entry['seq'], entry['execution_id']
+
+    def _sort_key(self, entry: Dict[str, Any]) -> int:
+        return -entry.get('priority', 0) if self.queue_policy == 'priority' else 0
+
+    def _smooth(self, average: Optional[float], sample: float) -> float:
+        return sample if average is None else average + self.smoothing * (sample - average)
+
+    async def _persist(self, entry: Dict[str, Any]):
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry_file = self.path / f"{entry['execution_id']}.json"
+        tmp_file = entry_file.with_suffix('.tmp')
+        async with aiofiles.open(tmp_file, 'w') as f:
+            await f.write(json.dumps(entry, default=str))
+        os.replace(tmp_file, entry_file)
+        # Dequeued or cancelled while being written
+        if entry['execution_id'] not in self._entries:
+            self._unlink(entry['execution_id'])
+
+    def _unlink(self, execution_id: str):
+        try:
+            (self.path / f"{execution_id}.json").unlink()
+        except FileNotFoundError:
+            pass
+
+
+__all__ = ['AdmissionController', 'AdmissionRejectedError']
@@ -69,6 +69,20 @@ class AIResponse:
     processing_time: float
     metadata: Dict[str, Any]
 
+class ProviderAPIError(Exception):
+    """Error response (or timeout) from an AI provider after the client's own retries.
+    ``status`` is the HTTP status, or None for a timeout.
+    """
+    
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+    
+    @property
+    def retryable(self) -> bool:
+        """Timeouts, rate limits and server errors; other 4xx (auth, bad request) are final"""
+        return self.status is None or self.status in (408, 409, 429) or self.status >= 500
+
 class AIPromptProcessor:
     """AI Prompt Processor for handling various AI model interactions"""
     
@@ -339,15 +353,16 @@ class AIPromptProcessor:
                             )
                         else:
                             error_text = await response.text()
-                            if attempt == config.retry_attempts - 1:
-                                raise Exception(f"OpenAI API error: {response.status} - {error_text}")
+                            error = ProviderAPIError(f"OpenAI API error: {response.status} - {error_text}", response.status)
+                            if attempt == config.retry_attempts - 1 or not error.retryable:
+                                raise error
                             
                             # Wait before retry
                             await asyncio.sleep(2 ** attempt)
                             
                 except asyncio.TimeoutError:
                     if attempt == config.retry_attempts - 1:
-                        raise Exception("OpenAI API timeout")
+                        raise ProviderAPIError("OpenAI API timeout")
                     await asyncio.sleep(2 ** attempt)
     
     async def _process_anthropic(self, prompt: str, config: AIModelConfig) -> AIResponse:
@@ -406,14 +421,15 @@ class AIPromptProcessor:
                             )
                         else:
                             error_text = await response.text()
-                            if attempt == config.retry_attempts - 1:
-                                raise Exception(f"Anthropic API error: {response.status} - {error_text}")
+                            error = ProviderAPIError(f"Anthropic API error: {response.status} - {error_text}", response.status)
+                            if attempt == config.retry_attempts - 1 or not error.retryable:
+                                raise error
                             
                             await asyncio.sleep(2 ** attempt)
                             
                 except asyncio.TimeoutError:
                     if attempt == config.retry_attempts - 1:
-                        raise Exception("Anthropic API timeout")
+                        raise ProviderAPIError("Anthropic API timeout")
                     await asyncio.sleep(2 ** attempt)
     
     async def _process_azure_openai(self, prompt: str, config: AIModelConfig) -> AIResponse:
@@ -469,14 +485,15 @@ class AIPromptProcessor:
                             )
                         else:
                             error_text = await response.text()
-                            if attempt == config.retry_attempts - 1:
-                                raise Exception(f"Azure OpenAI API error: {response.status} - {error_text}")
+                            error = ProviderAPIError(f"Azure OpenAI API error: {response.status} - {error_text}", response.status)
+                            if attempt == config.retry_attempts - 1 or not error.retryable:
+                                raise error
                             
                             await asyncio.sleep(2 ** attempt)
                             
                 except asyncio.TimeoutError:
                     if attempt == config.retry_attempts - 1:
-                        raise Exception("Azure OpenAI API timeout")
+                        raise ProviderAPIError("Azure OpenAI API timeout")
                     await asyncio.sleep(2 ** attempt)
     
     async def _process_google_gemini(self, prompt: str, config: AIModelConfig) -> AIResponse:
@@ -541,12 +558,13 @@ class AIPromptProcessor:
                             )
                         else:
                             error_text = await response.text()
-                            if attempt == config.retry_attempts - 1:
-                                raise Exception(f"Google Gemini API error: {response.status} - {error_text}")
+                            error = ProviderAPIError(f"Google Gemini API error: {response.status} - {error_text}", response.status)
+                            if attempt == config.retry_attempts - 1 or not error.retryable:
+                                raise error
                             await asyncio.sleep(2 ** attempt)
                 except asyncio.TimeoutError:
                     if attempt == config.retry_attempts - 1:
-                        raise Exception("Google Gemini API timeout")
+                        raise ProviderAPIError("Google Gemini API timeout")
                     await asyncio.sleep(2 ** attempt)
     
     def _track_usage(self, response: AIResponse):
@@ -0,0 +1,690 @@
+"""
+Pipeline API Server
+Asyncio HTTP and WebSocket API used by the SDLC pipeline UI
+"""
+
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from aiohttp import web, WSMsgType
+
+from sdlc_pipeline_engine.admission_control import AdmissionRejectedError
+
+# Socket.IO (protocol v5 over Engine.IO v4) packet prefixes used by socket.io-client
+_EIO_OPEN = '0'
+_EIO_PING = '2'
+_EIO_PONG = '3'
+_EIO_MESSAGE = '4'
+_SIO_CONNECT = '0'
+_SIO_DISCONNECT = '1'
+_SIO_EVENT = '2'
+
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset pagination cursor for the last row of a page"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise web.HTTPBadRequest(
+            text=json.dumps({'error': 'Invalid cursor'}), content_type='application/json'
+        )
+
+
+def decode_keyset_cursor(cursor: str) -> Tuple[str, str]:
+    """(created_at, id) key from a cursor made by encode_cursor(created_at, id)"""
+    values = decode_cursor(cursor)
+    if not (isinstance(values, list) and len(values) == 2 and all(isinstance(value, str) for value in values)):
+        raise web.HTTPBadRequest(
+            text=json.dumps({'error': 'Invalid cursor'}), content_type='application/json'
+        )
+    return values[0], values[1]
+
+
+def parse_range(header: str, size: int) -> Tuple[int, int]:
+    """Single HTTP byte range (``bytes=a-b``, ``bytes=a-``, ``bytes=-n``) as ``[start, end)``"""
+
+    unit, _, spec = header.partition('=')
+    try:
+        if unit.strip() != 'bytes' or ',' in spec:
+            raise ValueError(header)
+        first, _, last = spec.strip().partition('-')
+        if first:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+        else:
+            start, end = max(0, size - int(last)), size
+    except ValueError:
+        start, end = size, size
+    if start >= end:
+        raise web.HTTPRequestRangeNotSatisfiable(headers={'Content-Range': f'bytes */{size}'})
+    return start, end
+
+
+class _SocketClient:
+    """One connected websocket client and its pending, coalesced updates"""
+
+    def __init__(self, ws: web.WebSocketResponse, sid: str):
+        self.ws = ws
+        self.sid = sid
+        self.executions: Set[str] = set()
+        self.pipelines: Set[str] = set()
+        # (event, key...) -> (event name, payload); a newer update replaces a queued one
+        self.pending: Dict[Tuple, Tuple[str, Dict[str, Any]]] = {}
+        self.wakeup = asyncio.Event()
+        self.last_pong = time.monotonic()
+
+    def queue(self, key: Tuple, name: str, payload: Dict[str, Any]):
+        # Re-insert so the coalesced update is sent after events queued since the old one
+        self.pending.pop(key, None)
+        self.pending[key] = (name, payload)
+        self.wakeup.set()
+
+
+class PipelineAPIServer:
+    """REST endpoints for pipelines, executions, approvals and templates plus a
+    Socket.IO-compatible websocket pushing execution events to the UI.
+    """
+
+    def __init__(self, orchestrator: Any, config: Dict[str, Any]):
+        self.orchestrator = orchestrator
+        self.artifact_manager = orchestrator.artifact_manager
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+        self.host = config.get('host', '0.0.0.0')
+        self.port = int(config.get('port', 8000))
+        self.default_page_size = config.get('page_size', 50)
+        self.max_page_size = config.get('max_page_size', 500)
+        self.compression_threshold = config.get('compression_threshold_bytes', 8192)
+        self.cors_origins = config.get('cors_origins', ['*'])
+        # Updates for the same execution/stage within this window are sent once
+        self.coalesce_seconds = config.get('websocket_coalesce_ms', 100) / 1000.0
+        self.ping_interval = config.get('websocket_ping_interval_seconds', 25)
+        self.ping_timeout = config.get('websocket_ping_timeout_seconds', 20)
+
+        self._clients: Set[_SocketClient] = set()
+        self._execution_pipelines: Dict[str, str] = {}
+        self._events = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def build_app(self) -> web.Application:
+        # The error middleware is outermost so every error response, raised or returned, gets CORS headers
+        app = web.Application(middlewares=[self._error_middleware, self._cors_middleware])
+        app.router.add_get('/health', self.health)
+
+        app.router.add_get('/api/pipelines', self.list_pipelines)
+        app.router.add_post('/api/pipelines', self.create_pipeline)
+        app.router.add_get('/api/pipelines/{pipeline_id}', self.get_pipeline)
+        app.router.add_put('/api/pipelines/{pipeline_id}', self.update_pipeline)
+        app.router.add_delete('/api/pipelines/{pipeline_id}', self.delete_pipeline)
+        app.router.add_post('/api/pipelines/{pipeline_id}/duplicate', self.duplicate_pipeline)
+        app.router.add_post('/api/pipelines/{pipeline_id}/execute', self.execute_pipeline)
+        app.router.add_post('/api/pipelines/{pipeline_id}/plan', self.plan_execution)
+
+        app.router.add_get('/api/executions', self.list_executions)
+        app.router.add_get('/api/executions/{execution_id}', self.get_execution)
+        app.router.add_post('/api/executions/{execution_id}/pause', self.pause_execution)
+        app.router.add_post('/api/executions/{execution_id}/resume', self.resume_execution)
+        app.router.add_post('/api/executions/{execution_id}/cancel', self.cancel_execution)
+
+        app.router.add_get('/api/approvals', self.list_approvals)
+        app.router.add_post('/api/approvals/{approval_id}/approve', self.approve_request)
+        app.router.add_post('/api/approvals/{approval_id}/reject', self.reject_request)
+
+        app.router.add_get('/api/artifacts/{artifact_id}', self.get_artifact)
+        app.router.add_get('/api/artifacts/{artifact_id}/content', self.get_artifact_content)
+
+        app.router.add_get('/api/templates', self.list_templates)
+        app.router.add_post('/api/templates/{template_id}/create', self.create_from_template)
+
+        app.router.add_get('/socket.io/', self.socketio_handler)
+        return app
+
+    async def start(self):
+        """Start listening and forwarding orchestrator events to websocket clients"""
+
+        self._events = self.orchestrator.event_bus.subscribe()
+        self._dispatch_task = asyncio.create_task(self._dispatch_events())
+
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.logger.info(f"API server listening on http://{self.host}:{self.port}")
+
+    async def stop(self):
+        if self._events is not None:
+            self._events.close()
+        if self._dispatch_task is not None:
+            self._dispatch_task.cancel()
+            await asyncio.gather(self._dispatch_task, return_exceptions=True)
+        for client in list(self._clients):
+            await client.ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    # -- helpers -------------------------------------------------------------
+
+    @web.middleware
+    async def _cors_middleware(self, request: web.Request, handler):
+        if request.method == 'OPTIONS':
+            response = web.Response(status=204)
+        else:
+            response = await handler(request)
+
+        self._add_cors_headers(request, response)
+        return response
+
+    def _add_cors_headers(self, request: web.Request, response: web.StreamResponse):
+        origin = request.headers.get('Origin')
+        if origin and ('*' in self.cors_origins or origin in self.cors_origins):
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.headers['Access-Control-Allow-Credentials'] = 'true'
+            response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
+            response.headers['Access-Control-Allow-Headers'] = 'Authorization, Content-Type, If-None-Match, Range'
+            response.headers['Access-Control-Expose-Headers'] = 'ETag, Retry-After, Content-Range, Accept-Ranges'
+
+    @web.middleware
+    async def _error_middleware(self, request: web.Request, handler):
+        try:
+            return await handler(request)
+        except web.HTTPException as e:
+            # Raised responses (bad cursor, unknown route) skip the CORS middleware
+            self._add_cors_headers(request, e)
+            raise
+        except Exception as e:
+            response = self._error_response(request, e)
+            self._add_cors_headers(request, response)
+            return response
+
+    def _error_response(self, request: web.Request, error: Exception) -> web.Response:
+        if isinstance(error, AdmissionRejectedError):
+            response = self._json({
+                'error': str(error),
+                'queue_depth': error.queue_depth,
+                'estimated_wait_seconds': error.estimated_wait_seconds
+            }, status=429)
+            response.headers['Retry-After'] = str(max(1, int(error.estimated_wait_seconds)))
+            return response
+        if isinstance(error, ValueError):
+            status = 404 if 'not found' in str(error).lower() else 400
+            return self._json({'error': str(error)}, status=status)
+        self.logger.error(f"API error on {request.method} {request.path}: {str(error)}", exc_info=True)
+        return self._json({'error': 'Internal server error'}, status=500)
+
+    def _json(
+        self,
+        payload: Any,
+        status: int = 200,
+        request: Optional[web.Request] = None
+    ) -> web.Response:
+        """JSON response; with a request, adds an ETag and answers If-None-Match with 304"""
+
+        body = json.dumps(payload, default=str).encode('utf-8')
+        headers = {}
+
+        if request is not None:
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            headers['ETag'] = etag
+            headers['Cache-Control'] = 'no-cache'
+            if_none_match = request.headers.get('If-None-Match', '')
+            if etag in (tag.strip() for tag in if_none_match.split(',')) or if_none_match.strip() == '*':
+                return web.Response(status=304, headers=headers)
+
+        response = web.Response(body=body, status=status, content_type='application/json', headers=headers)
+        if len(body) >= self.compression_threshold:
+            response.enable_compression()
+        return response
+
+    async def _read_json(self, request: web.Request) -> Dict[str, Any]:
+        if not request.can_read_body:
+            return {}
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            raise ValueError("Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise ValueError("Request body must be a JSON object")
+        return data
+
+    def _page_size(self, request: web.Request) -> int:
+        try:
+            limit = int(request.query.get('limit', self.default_page_size))
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        return max(1, min(limit, self.max_page_size))
+
+    def _approver(self, request: web.Request, data: Dict[str, Any]) -> str:
+        return data.get('approver') or request.headers.get('X-User') or 'api'
+
+    # -- pipelines -----------------------------------------------------------
+
+    async def health(self, request: web.Request) -> web.Response:
+        return self._json({
+            'status': 'ok',
+            'active_executions': len(self.orchestrator.active_executions),
+            'websocket_clients': len(self._clients)
+        })
+
+    async def list_pipelines(self, request: web.Request) -> web.Response:
+        limit = self._page_size(request)
+        cursor = request.query.get('cursor')
+        after = decode_keyset_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to know whether another page exists
+        documents = await self.artifact_manager.list_documents('pipeline', after, limit + 1)
+        has_more = len(documents) > limit
+        documents = documents[:limit]
+
+        pipelines = []
+        for document in documents:
+            definition = await self.artifact_manager.load_pipeline_definition(document['id'])
+            if definition is not None:
+                pipelines.append(definition)
+
+        return self._json({
+            'pipelines': pipelines,
+            'next_cursor': encode_cursor(documents[-1]['created_at'], documents[-1]['id']) if has_more else None
+        }, request=request)
+
+    async def create_pipeline(self, request: web.Request) -> web.Response:
+        definition = await self._read_json(request)
+        pipeline_id = await self.orchestrator.create_pipeline(definition)
+        return self._json({'pipeline_id': pipeline_id}, status=201)
+
+    async def get_pipeline(self, request: web.Request) -> web.Response:
+        pipeline_id = request.match_info['pipeline_id']
+        definition = await self.artifact_manager.load_pipeline_definition(pipeline_id)
+        if definition is None:
+            raise ValueError(f"Pipeline not found: {pipeline_id}")
+        return self._json(definition, request=request)
+
+    async def update_pipeline(self, request: web.Request) -> web.Response:
+        definition = await self._read_json(request)
+        await self.orchestrator.update_pipeline(request.match_info['pipeline_id'], definition)
+        return web.Response(status=204)
+
+    async def delete_pipeline(self, request: web.Request) -> web.Response:
+        pipeline_id = request.match_info['pipeline_id']
+        if not await self.orchestrator.delete_pipeline(pipeline_id):
+            raise ValueError(f"Pipeline not found: {pipeline_id}")
+        return web.Response(status=204)
+
+    async def duplicate_pipeline(self, request: web.Request) -> web.Response:
+        pipeline_id = request.match_info['pipeline_id']
+        data = await self._read_json(request)
+
+        definition = await self.artifact_manager.load_pipeline_definition(pipeline_id)
+        if definition is None:
+            raise ValueError(f"Pipeline not found: {pipeline_id}")
+        definition = {k: v for k, v in definition.items() if k not in ('id', 'stored_at')}
+        definition['name'] = data.get('name') or f"{definition.get('name', pipeline_id)} (copy)"
+
+        new_pipeline_id = await self.orchestrator.create_pipeline(definition)
+        return self._json({'pipeline_id': new_pipeline_id}, status=201)
+
+    async def execute_pipeline(self, request: web.Request) -> web.Response:
+        data = await self._read_json(request)
+        execution_id = await self.orchestrator.execute_pipeline(
+            request.match_info['pipeline_id'],
+            data.get('user_inputs') or {},
+            data.get('execution_options')
+        )
+        return self._json({'execution_id': execution_id}, status=202)
+
+    async def plan_execution(self, request: web.Request) -> web.Response:
+        data = await self._read_json(request)
+        estimate = await self.orchestrator.plan_execution(
+            request.match_info['pipeline_id'],
+            data.get('user_inputs') or {},
+            executions=int(data.get('executions', 1)),
+            max_concurrency=data.get('max_concurrency')
+        )
+        return self._json(estimate)
+
+    # -- executions ----------------------------------------------------------
+
+    async def list_executions(self, request: web.Request) -> web.Response:
+        limit = self._page_size(request)
+        cursor = request.query.get('cursor')
+        after = decode_keyset_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to know whether another page exists
+        executions = await self.orchestrator.list_executions(
+            pipeline_id=request.query.get('pipeline_id'), after=after, limit=limit + 1
+        )
+        has_more = len(executions) > limit
+        executions = executions[:limit]
+
+        return self._json({
+            'executions': executions,
+            'next_cursor': encode_cursor(
+                executions[-1]['start_time'] or '', executions[-1]['execution_id']
+            ) if has_more else None
+        }, request=request)
+
+    async def get_execution(self, request: web.Request) -> web.Response:
+        execution_id = request.match_info['execution_id']
+        document = await self.orchestrator.get_execution_details(execution_id)
+        if document is None:
+            raise ValueError(f"Execution not found: {execution_id}")
+        return self._json(document, request=request)
+
+    async def pause_execution(self, request: web.Request) -> web.Response:
+        await self.orchestrator.pause_execution(request.match_info['execution_id'])
+        return web.Response(status=204)
+
+    async def resume_execution(self, request: web.Request) -> web.Response:
+        await self.orchestrator.resume_execution(request.match_info['execution_id'])
+        return web.Response(status=204)
+
+    async def cancel_execution(self, request: web.Request) -> web.Response:
+        await self.orchestrator.cancel_execution(request.match_info['execution_id'])
+        return web.Response(status=204)
+
+    # -- approvals -----------------------------------------------------------
+
+    async def list_approvals(self, request: web.Request) -> web.Response:
+        limit = self._page_size(request)
+        cursor = request.query.get('cursor')
+        after = decode_keyset_cursor(cursor) if cursor else None
+
+        requests = await self.orchestrator.list_approval_requests(
+            request.query.get('execution_id'), request.query.get('status'), after, limit + 1
+        )
+        approvals = [{'id': approval['approval_id'], 'status': 'pending', **approval} for approval in requests]
+
+        has_more = len(approvals) > limit
+        approvals = approvals[:limit]
+        next_cursor = None
+        if has_more:
+            last = approvals[-1]
+            next_cursor = encode_cursor(last.get('created_at') or last.get('stored_at', ''), last['approval_id'])
+
+        return self._json({'approvals': approvals, 'next_cursor': next_cursor}, request=request)
+
+    async def approve_request(self, request: web.Request) -> web.Response:
+        data = await self._read_json(request)
+        result = await self.orchestrator.approve_request(
+            request.match_info['approval_id'], self._approver(request, data), data.get('comments')
+        )
+        return self._json({'id': result['approval_id'], **result})
+
+    async def reject_request(self, request: web.Request) -> web.Response:
+        data = await self._read_json(request)
+        result = await self.orchestrator.reject_request(
+            request.match_info['approval_id'], self._approver(request, data), data.get('comments')
+        )
+        return self._json({'id': result['approval_id'], **result})
+
+    # -- artifacts -----------------------------------------------------------
+
+    async def get_artifact(self, request: web.Request) -> web.Response:
+        artifact_id = request.match_info['artifact_id']
+        artifact = await self.artifact_manager.get_artifact(artifact_id)
+        if artifact is None:
+            raise ValueError(f"Artifact not found: {artifact_id}")
+        payload = {k: v for k, v in vars(artifact).items() if k != 'content'}
+        payload['compression_ratio'] = artifact.compression_ratio
+        return self._json(payload, request=request)
+
+    async def get_artifact_content(self, request: web.Request) -> web.StreamResponse:
+        """Stream artifact content with Range support; compressed blobs are passed
+        through as-is to clients that accept their encoding.
+        """
+
+        artifact_id = request.match_info['artifact_id']
+        artifact = await self.artifact_manager.get_artifact(artifact_id)
+        if artifact is None:
+            raise ValueError(f"Artifact not found: {artifact_id}")
+
+        etag = f'"{artifact.checksum}"'
+        if etag in (tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')):
+            return web.Response(status=304, headers={'ETag': etag})
+
+        headers = {
+            'ETag': etag,
+            'Accept-Ranges': 'bytes',
+            'Content-Type': f"{self.artifact_manager.get_media_type(artifact.type)}; charset=utf-8"
+        }
+
+        range_header = request.headers.get('Range')
+        accepted = {value.split(';')[0].strip() for value in request.headers.get('Accept-Encoding', '').split(',')}
+        # Dictionary-compressed zstd frames cannot be decoded by clients
+        if range_header is None and artifact.stored_size and artifact.codec in ('gzip', 'zstd') and artifact.codec in accepted:
+            chunks = await self.artifact_manager.stream_artifact_content(artifact_id, decode=False)
+            headers['Content-Encoding'] = artifact.codec
+            status, length = 200, artifact.stored_size
+        elif range_header is not None:
+            start, end = parse_range(range_header, artifact.size)
+            chunks = await self.artifact_manager.stream_artifact_content(artifact_id, start, end)
+            headers['Content-Range'] = f"bytes {start}-{end - 1}/{artifact.size}"
+            status, length = 206, end - start
+        else:
+            chunks = await self.artifact_manager.stream_artifact_content(artifact_id)
+            status, length = 200, artifact.size
+        if chunks is None:
+            raise ValueError(f"Artifact content not found: {artifact_id}")
+
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = length
+        await response.prepare(request)
+        async for chunk in chunks:
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+
+    # -- templates -----------------------------------------------------------
+
+    async def list_templates(self, request: web.Request) -> web.Response:
+        templates = await self.artifact_manager.list_pipeline_templates()
+        return self._json({'templates': templates}, request=request)
+
+    async def create_from_template(self, request: web.Request) -> web.Response:
+        template_id = request.match_info['template_id']
+        data = await self._read_json(request)
+
+        template = await self.artifact_manager.load_pipeline_template(template_id)
+        if template is None:
+            raise ValueError(f"Template not found: {template_id}")
+
+        definition = copy.deepcopy({k: v for k, v in template.items() if k != 'id'})
+        project_name = data.get('project_name')
+        if project_name:
+            definition['name'] = project_name
+            definition.setdefault('metadata', {})['project_name'] = project_name
+        definition.setdefault('metadata', {})['template_id'] = template_id
+
+        pipeline_id = await self.orchestrator.create_pipeline(definition)
+        return self._json({'pipeline_id': pipeline_id}, status=201)
+
+    # -- websocket -----------------------------------------------------------
+
+    async def socketio_handler(self, request: web.Request) -> web.StreamResponse:
+        """Minimal Socket.IO endpoint (websocket transport only) for socket.io-client"""
+
+        if request.query.get('transport') != 'websocket':
+            return self._json({'code': 0, 'message': 'Transport unknown'}, status=400)
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        client = _SocketClient(ws, uuid.uuid4().hex)
+        await ws.send_str(_EIO_OPEN + json.dumps({
+            'sid': client.sid,
+            'upgrades': [],
+            'pingInterval': int(self.ping_interval * 1000),
+            'pingTimeout': int(self.ping_timeout * 1000),
+            'maxPayload': 1000000
+        }))
+
+        self._clients.add(client)
+        tasks = [
+            asyncio.create_task(self._flush_client(client)),
+            asyncio.create_task(self._ping_client(client))
+        ]
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                await self._handle_client_packet(client, msg.data)
+        finally:
+            self._clients.discard(client)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return ws
+
+    async def _handle_client_packet(self, client: _SocketClient, packet: str):
+        if packet == _EIO_PONG:
+            client.last_pong = time.monotonic()
+            return
+        if packet == _EIO_PING:
+            await client.ws.send_str(_EIO_PONG)
+            return
+        if not packet.startswith(_EIO_MESSAGE) or len(packet) < 2:
+            return
+
+        sio_type, body = packet[1], packet[2:]
+        if sio_type == _SIO_CONNECT:
+            await client.ws.send_str(_EIO_MESSAGE + _SIO_CONNECT + json.dumps({'sid': client.sid}))
+        elif sio_type == _SIO_DISCONNECT:
+            await client.ws.close()
+        elif sio_type == _SIO_EVENT:
+            # Skip an optional namespace and ack id before the JSON array
+            start = body.find('[')
+            if start < 0:
+                return
+            try:
+                name, *args = json.loads(body[start:])
+            except (ValueError, TypeError):
+                return
+            await self._handle_client_event(client, name, args[0] if args else {})
+
+    async def _handle_client_event(self, client: _SocketClient, name: str, data: Dict[str, Any]):
+        data = data if isinstance(data, dict) else {}
+        execution_id = data.get('executionId') or data.get('execution_id')
+        pipeline_id = data.get('pipelineId') or data.get('pipeline_id')
+
+        try:
+            if name == 'subscribe_execution' and execution_id:
+                client.executions.add(execution_id)
+                # Send the current state so the client does not miss updates published before subscribing
+                summary = await self.orchestrator.get_execution_details(execution_id, include_outputs=False)
+                key = ('execution_status', execution_id)
+                if summary is not None and key not in client.pending:
+                    client.queue(key, 'execution_status', summary)
+            elif name == 'unsubscribe_execution' and execution_id:
+                client.executions.discard(execution_id)
+            elif name == 'subscribe_pipeline' and pipeline_id:
+                client.pipelines.add(pipeline_id)
+            elif name == 'unsubscribe_pipeline' and pipeline_id:
+                client.pipelines.discard(pipeline_id)
+            elif name == 'get_execution_status' and execution_id:
+                document = await self.orchestrator.get_execution_details(execution_id)
+                if document is not None:
+                    await self._emit(client, 'execution_status', document)
+            elif name == 'approval_response':
+                approval_id = data.get('approvalId') or data.get('approval_id')
+                if not approval_id:
+                    raise ValueError("approval_response requires an approvalId")
+                if data.get('approved'):
+                    await self.orchestrator.approve_request(approval_id, 'websocket', data.get('comments'))
+                else:
+                    await self.orchestrator.reject_request(approval_id, 'websocket', data.get('comments'))
+        except ValueError as e:
+            await self._emit(client, 'error', {'message': str(e)})
+        except Exception as e:
+            self.logger.error(f"Failed to handle websocket event {name}: {str(e)}", exc_info=True)
+            await self._emit(client, 'error', {'message': 'Internal server error'})
+
+    async def _emit(self, client: _SocketClient, name: str, payload: Dict[str, Any]):
+        await client.ws.send_str(_EIO_MESSAGE + _SIO_EVENT + json.dumps([name, payload], default=str))
+
+    async def _flush_client(self, client: _SocketClient):
+        """Send a client's queued updates, coalescing bursts within the coalesce window"""
+
+        while True:
+            await client.wakeup.wait()
+            if self.coalesce_seconds > 0:
+                await asyncio.sleep(self.coalesce_seconds)
+            client.wakeup.clear()
+            pending, client.pending = client.pending, {}
+            for name, payload in pending.values():
+                await self._emit(client, name, payload)
+
+    async def _ping_client(self, client: _SocketClient):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            if time.monotonic() - client.last_pong > self.ping_interval + self.ping_timeout:
+                await client.ws.close()
+                return
+            await client.ws.send_str(_EIO_PING)
+
+    async def _dispatch_events(self):
+        """Route orchestrator events to interested websocket clients"""
+
+        async for event in self._events:
+            execution_id = event['execution_id']
+            if event['event'] == 'execution_status':
+                self._execution_pipelines[execution_id] = event.get('pipeline_id')
+            pipeline_id = self._execution_pipelines.get(execution_id)
+
+            name, key, payload = self._client_event(event)
+            for client in self._clients:
+                if (
+                    event['event'] == 'approval_required'
+                    or execution_id in client.executions
+                    or (pipeline_id is not None and pipeline_id in client.pipelines)
+                ):
+                    client.queue(key, name, payload)
+
+            if event['event'] == 'execution_status' and event.get('status') in TERMINAL_STATUSES:
+                self._execution_pipelines.pop(execution_id, None)
+
+    def _client_event(self, event: Dict[str, Any]) -> Tuple[str, Tuple, Dict[str, Any]]:
+        """Socket event name, coalescing key and payload (with the UI's camelCase ids)"""
+
+        name = event['event']
+        payload = dict(event)
+        payload['executionId'] = event['execution_id']
+
+        if name == 'stage_completed':
+            payload['stageId'] = event['stage_id']
+            return name, (name, event['execution_id'], event['stage_id']), payload
+        if name == 'approval_required':
+            payload['stageId'] = event['stage_id']
+            payload['approvalId'] = event['approval_id']
+            return name, (name, event['approval_id']), payload
+        if name == 'stage_started':
+            payload['stageId'] = event['stage_id']
+            return name, (name, event['execution_id'], event['stage_id']), payload
+        return name, (name, event['execution_id']), payload
+
+
+__all__ = ['PipelineAPIServer', 'encode_cursor', 'decode_cursor', 'decode_keyset_cursor']
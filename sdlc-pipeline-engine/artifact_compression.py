@@ -0,0 +1,213 @@
+"""
+Artifact Compression
+Streaming zstd/gzip compression of artifact blobs with per-type zstd dictionaries
+"""
+
+import asyncio
+import gzip
+import logging
+import zlib
+from pathlib import Path
+from typing import Dict, Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+CODEC_IDENTITY = 'identity'
+CODEC_GZIP = 'gzip'
+CODEC_ZSTD = 'zstd'
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Suffix for the hard link exposing a compressed blob in the execution directory
+CODEC_SUFFIXES = {CODEC_IDENTITY: '', CODEC_GZIP: '.gz', CODEC_ZSTD: '.zst'}
+
+
+def codec_family(codec: str) -> str:
+    """'zstd:<dict id>' -> 'zstd'"""
+    return codec.split(':', 1)[0]
+
+
+class ArtifactCompressor:
+    """Compresses artifact content for the blob store.
+
+    Blobs are self-describing: artifact content is UTF-8 text, which can never
+    start with the gzip or zstd magic bytes, so the codec (and the zstd
+    dictionary id, carried in the frame header) is recovered from the blob
+    itself. Codec names recorded in the index are ``identity``, ``gzip``,
+    ``zstd`` or ``zstd:<dictionary id>``.
+    """
+
+    def __init__(self, config: Dict[str, Any], dictionary_dir: Path):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+        self.enabled = config.get('compression_enabled', True)
+        codec = config.get('compression_codec', CODEC_ZSTD if zstandard else CODEC_GZIP)
+        if codec == CODEC_ZSTD and zstandard is None:
+            self.logger.warning("zstandard is not installed; compressing artifacts with gzip")
+            codec = CODEC_GZIP
+        self.codec = codec
+        self.level = config.get('compression_level', 3 if codec == CODEC_ZSTD else 6)
+        # Smaller artifacts are stored as-is unless a dictionary is available
+        self.min_size = config.get('compression_min_size', 512)
+        self.chunk_size = config.get('compression_chunk_size', 1024 * 1024)
+
+        # zstd dictionaries, trained per artifact type from small artifacts
+        self.dictionary_dir = Path(dictionary_dir)
+        self.dictionary_samples = config.get('compression_dictionary_samples', 200)
+        self.dictionary_size = config.get('compression_dictionary_size', 16 * 1024)
+        self.dictionary_max_sample_size = config.get('compression_dictionary_max_sample_size', 64 * 1024)
+
+        self._dictionaries: Dict[int, Any] = {}
+        self._type_dictionaries: Dict[str, int] = {}
+        self._samples: Dict[str, List[bytes]] = {}
+        self._training: set = set()
+        if zstandard is not None:
+            self._load_dictionaries()
+
+    def _load_dictionaries(self):
+        self.dictionary_dir.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.dictionary_dir.glob('*.dict')):
+            artifact_type, _, dict_id = path.stem.rpartition('-')
+            try:
+                dictionary = zstandard.ZstdCompressionDict(path.read_bytes())
+                self._dictionaries[int(dict_id)] = dictionary
+                self._type_dictionaries[artifact_type] = int(dict_id)
+            except Exception as e:
+                self.logger.error(f"Failed to load compression dictionary {path.name}: {str(e)}")
+
+    def choose_codec(self, artifact_type: str, size: int) -> str:
+        if not self.enabled:
+            return CODEC_IDENTITY
+        if self.codec == CODEC_ZSTD and artifact_type in self._type_dictionaries:
+            return f"{CODEC_ZSTD}:{self._type_dictionaries[artifact_type]}"
+        return self.codec if size >= self.min_size else CODEC_IDENTITY
+
+    def _compressor(self, codec: str):
+        if codec_family(codec) == CODEC_ZSTD:
+            dictionary = self._dictionaries[int(codec.split(':', 1)[1])] if ':' in codec else None
+            return zstandard.ZstdCompressor(level=self.level, dict_data=dictionary).compressobj()
+        # wbits=31 writes a gzip container
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, codec: str, data: bytes) -> Tuple[str, bytes]:
+        """One-shot compression; falls back to identity when it does not pay off"""
+        if codec == CODEC_IDENTITY:
+            return codec, data
+        compressor = self._compressor(codec)
+        compressed = compressor.compress(data) + compressor.flush()
+        if len(compressed) >= len(data):
+            return CODEC_IDENTITY, data
+        return codec, compressed
+
+    async def compress_stream(self, codec: str, data: bytes) -> AsyncIterator[bytes]:
+        """Compress in chunk_size pieces off the event loop"""
+        compressor = self._compressor(codec)
+        for offset in range(0, len(data), self.chunk_size):
+            chunk = await asyncio.to_thread(compressor.compress, data[offset:offset + self.chunk_size])
+            if chunk:
+                yield chunk
+        tail = compressor.flush()
+        if tail:
+            yield tail
+
+    def detect(self, head: bytes) -> str:
+        """Codec of a stored blob from its first bytes (at least 18)"""
+        if head.startswith(_GZIP_MAGIC):
+            return CODEC_GZIP
+        if head.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                return CODEC_ZSTD
+            dict_id = zstandard.get_frame_parameters(head).dict_id
+            return f"{CODEC_ZSTD}:{dict_id}" if dict_id else CODEC_ZSTD
+        return CODEC_IDENTITY
+
+    def _decompressor(self, codec: str):
+        if codec_family(codec) == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed artifacts")
+            dictionary = None
+            if ':' in codec:
+                dictionary = self._dictionaries.get(int(codec.split(':', 1)[1]))
+                if dictionary is None:
+                    raise RuntimeError(f"Compression dictionary {codec} is not available")
+            return zstandard.ZstdDecompressor(dict_data=dictionary).decompressobj()
+        return zlib.decompressobj(31)
+
+    def decompress_chunks(self, codec: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Incrementally decompress a stored blob read in chunks"""
+        if codec == CODEC_IDENTITY:
+            yield from chunks
+            return
+        decompressor = self._decompressor(codec)
+        for chunk in chunks:
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        if codec == CODEC_GZIP:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+    async def decompress_stream(self, codec: str, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Incrementally decompress a stored blob streamed in chunks"""
+        if codec == CODEC_IDENTITY:
+            async for chunk in chunks:
+                yield chunk
+            return
+        decompressor = self._decompressor(codec)
+        async for chunk in chunks:
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        if codec == CODEC_GZIP:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+    def decompress(self, data: bytes) -> bytes:
+        codec = self.detect(data[:18])
+        if codec == CODEC_IDENTITY:
+            return data
+        if codec == CODEC_GZIP:
+            return gzip.decompress(data)
+        return b''.join(self.decompress_chunks(codec, [data]))
+
+    async def observe(self, artifact_type: str, data: bytes):
+        """Collect small artifacts of a type and train its dictionary once enough are seen"""
+
+        if (
+            zstandard is None or self.codec != CODEC_ZSTD or not self.enabled or not self.dictionary_samples
+            or artifact_type in self._type_dictionaries or artifact_type in self._training
+            or len(data) > self.dictionary_max_sample_size
+        ):
+            return
+
+        samples = self._samples.setdefault(artifact_type, [])
+        samples.append(data)
+        if len(samples) < self.dictionary_samples:
+            return
+
+        self._training.add(artifact_type)
+        del self._samples[artifact_type]
+        try:
+            dictionary = await asyncio.to_thread(zstandard.train_dictionary, self.dictionary_size, samples)
+            dict_id = dictionary.dict_id()
+            path = self.dictionary_dir / f"{artifact_type}-{dict_id}.dict"
+            await asyncio.to_thread(path.write_bytes, dictionary.as_bytes())
+            self._dictionaries[dict_id] = dictionary
+            self._type_dictionaries[artifact_type] = dict_id
+            self.logger.info(f"Trained compression dictionary {dict_id} for {artifact_type} artifacts")
+        except Exception as e:
+            self.logger.warning(f"Could not train compression dictionary for {artifact_type}: {str(e)}")
+        finally:
+            self._training.discard(artifact_type)
+
+
+__all__ = [
+    'ArtifactCompressor', 'codec_family', 'CODEC_IDENTITY', 'CODEC_GZIP', 'CODEC_ZSTD', 'CODEC_SUFFIXES'
+]
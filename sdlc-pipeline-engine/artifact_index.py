@@ -0,0 +1,555 @@
+"""
+Artifact Index
+Transactional SQLite (WAL) index of artifact metadata
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+
+# Applied in order; PRAGMA user_version records how many have run
+_MIGRATIONS = [
+    """
+    CREATE TABLE artifacts (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        execution_id TEXT NOT NULL,
+        stage_id TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        checksum TEXT NOT NULL,
+        version TEXT NOT NULL,
+        metadata TEXT NOT NULL
+    );
+    CREATE INDEX idx_artifacts_execution ON artifacts (execution_id);
+    CREATE INDEX idx_artifacts_stage ON artifacts (stage_id);
+    CREATE INDEX idx_artifacts_type ON artifacts (type);
+    CREATE INDEX idx_artifacts_created ON artifacts (created_at);
+    """,
+    # Content-addressed blobs; rows indexed before this have blob = NULL (content in the execution path)
+    """
+    ALTER TABLE artifacts ADD COLUMN blob TEXT;
+    CREATE INDEX idx_artifacts_blob ON artifacts (blob);
+    CREATE TABLE blobs (
+        checksum TEXT PRIMARY KEY,
+        refcount INTEGER NOT NULL
+    );
+    """,
+    # Blob codec (see artifact_compression) and its size on disk; NULL stored_size means not measured
+    """
+    ALTER TABLE artifacts ADD COLUMN codec TEXT NOT NULL DEFAULT 'identity';
+    ALTER TABLE artifacts ADD COLUMN stored_size INTEGER;
+    """,
+    # Last content access (epoch seconds) for least-recently-used eviction; written in batches
+    """
+    ALTER TABLE artifacts ADD COLUMN accessed_at REAL;
+    """,
+    # Version chains per (project, artifact name); delta is NULL for versions stored in full
+    """
+    CREATE TABLE artifact_versions (
+        project TEXT NOT NULL,
+        name TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        artifact_id TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at TEXT NOT NULL,
+        delta BLOB,
+        PRIMARY KEY (project, name, version)
+    );
+    CREATE INDEX idx_artifact_versions_artifact ON artifact_versions (artifact_id);
+    """,
+    # Pipelines, executions and approvals in (created_at, id) order for keyset pagination; content stays in files
+    """
+    CREATE TABLE documents (
+        kind TEXT NOT NULL,
+        id TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        pipeline_id TEXT,
+        execution_id TEXT,
+        status TEXT,
+        PRIMARY KEY (kind, id)
+    );
+    CREATE INDEX idx_documents_order ON documents (kind, created_at, id);
+    """,
+]
+
+DOCUMENT_COLUMNS = ('kind', 'id', 'created_at', 'pipeline_id', 'execution_id', 'status')
+
+ARTIFACT_COLUMNS = (
+    'id', 'name', 'type', 'execution_id', 'stage_id', 'created_at', 'size', 'checksum', 'version', 'metadata',
+    'blob', 'codec', 'stored_size'
+)
+
+
+class ArtifactIndexStore:
+    """Artifact metadata in SQLite, one row per artifact.
+
+    All statements run on a single dedicated thread that owns the connection,
+    so writers are serialized and never block the event loop. Each write is
+    its own transaction; WAL mode keeps readers and a crashed writer from
+    corrupting the index.
+    """
+
+    def __init__(self, path: Path, synchronous: str = 'NORMAL'):
+        self.path = Path(path)
+        self.synchronous = synchronous
+        self.logger = logging.getLogger(__name__)
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='artifact-index')
+        self._conn: Optional[sqlite3.Connection] = None
+
+    async def open(self):
+        await self._run(self._open)
+
+    def _open(self):
+        if self._conn is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        # NORMAL is crash-safe in WAL mode; FULL also survives power loss at a latency cost
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        conn.execute('PRAGMA foreign_keys=ON')
+
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, script in enumerate(_MIGRATIONS[version:], start=version + 1):
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                for statement in script.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f'PRAGMA user_version={number}')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        self._conn = conn
+
+    async def close(self):
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        self._open()
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(self._conn)
+            self._conn.execute('COMMIT')
+            return result
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    @staticmethod
+    def _row_values(artifact: Dict[str, Any]) -> tuple:
+        return tuple(
+            json.dumps(artifact.get('metadata') or {}, default=str) if column == 'metadata' else artifact.get(column)
+            for column in ARTIFACT_COLUMNS
+        )
+    
+    @staticmethod
+    def _release_blob(conn: sqlite3.Connection, blob: str, released: List[str]):
+        conn.execute('UPDATE blobs SET refcount = refcount - 1 WHERE checksum = ?', (blob,))
+        row = conn.execute('SELECT refcount FROM blobs WHERE checksum = ?', (blob,)).fetchone()
+        if row is not None and row[0] <= 0:
+            conn.execute('DELETE FROM blobs WHERE checksum = ?', (blob,))
+            released.append(blob)
+
+    @staticmethod
+    def _row_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        artifact = dict(row)
+        artifact['metadata'] = json.loads(artifact['metadata']) if artifact.get('metadata') else {}
+        return artifact
+
+    async def put(
+        self,
+        artifact: Dict[str, Any],
+        blob_exists: Optional[Callable[[str], bool]] = None,
+        release_blob: Optional[Callable[[str], None]] = None
+    ) -> List[str]:
+        """Insert or replace one artifact row (see put_many)"""
+        return await self.put_many([artifact], blob_exists, release_blob)
+
+    async def put_many(
+        self,
+        artifacts: Iterable[Dict[str, Any]],
+        blob_exists: Optional[Callable[[str], bool]] = None,
+        release_blob: Optional[Callable[[str], None]] = None
+    ) -> List[str]:
+        """Insert or replace rows in a single transaction, counting blob references.
+
+        Blobs left unreferenced by replaced rows are passed to ``release_blob``.
+        Returns referenced blobs that ``blob_exists`` reports missing after the
+        commit (removed by a concurrent delete) so the caller can rewrite them.
+        Callbacks run on the index thread, serialized with other index writes.
+        """
+        artifacts = list(artifacts)
+        rows = [self._row_values(artifact) for artifact in artifacts]
+        sql = (
+            f"INSERT OR REPLACE INTO artifacts ({', '.join(ARTIFACT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in ARTIFACT_COLUMNS)})"
+        )
+
+        def put() -> List[str]:
+            released: List[str] = []
+
+            def write(conn: sqlite3.Connection):
+                for artifact, row in zip(artifacts, rows):
+                    previous = conn.execute('SELECT blob FROM artifacts WHERE id = ?', (artifact['id'],)).fetchone()
+                    previous_blob = previous[0] if previous else None
+                    conn.execute(sql, row)
+                    blob = artifact.get('blob')
+                    if blob == previous_blob:
+                        continue
+                    if blob:
+                        conn.execute(
+                            'INSERT INTO blobs (checksum, refcount) VALUES (?, 1) '
+                            'ON CONFLICT (checksum) DO UPDATE SET refcount = refcount + 1',
+                            (blob,)
+                        )
+                    if previous_blob:
+                        self._release_blob(conn, previous_blob, released)
+
+            self._transaction(write)
+            for blob in released:
+                if release_blob:
+                    release_blob(blob)
+            referenced = {artifact['blob'] for artifact in artifacts if artifact.get('blob')}
+            return [blob for blob in referenced if blob_exists and not blob_exists(blob)]
+
+        return await self._run(put)
+
+    async def delete(self, artifact_id: str, release_blob: Optional[Callable[[str], None]] = None) -> bool:
+        return await self.delete_many([artifact_id], release_blob) > 0
+
+    async def delete_many(
+        self,
+        artifact_ids: Iterable[str],
+        release_blob: Optional[Callable[[str], None]] = None
+    ) -> int:
+        """Delete rows in a single transaction; returns the number removed.
+        Blobs whose last reference is removed are passed to ``release_blob``.
+        """
+        ids = list(artifact_ids)
+
+        def delete() -> int:
+            released: List[str] = []
+
+            def remove(conn: sqlite3.Connection) -> int:
+                removed = 0
+                for artifact_id in ids:
+                    row = conn.execute('SELECT blob FROM artifacts WHERE id = ?', (artifact_id,)).fetchone()
+                    if row is None:
+                        continue
+                    conn.execute('DELETE FROM artifacts WHERE id = ?', (artifact_id,))
+                    conn.execute('DELETE FROM artifact_versions WHERE artifact_id = ?', (artifact_id,))
+                    removed += 1
+                    if row[0]:
+                        self._release_blob(conn, row[0], released)
+                return removed
+
+            removed = self._transaction(remove)
+            for blob in released:
+                if release_blob:
+                    release_blob(blob)
+            return removed
+
+        return await self._run(delete)
+
+    async def sweep_blobs(self, candidates: Iterable[str], release_blob: Callable[[str], None]) -> int:
+        """Release blobs among ``candidates`` that no row references (e.g. left by a crash)"""
+        candidates = list(candidates)
+
+        def sweep() -> int:
+            self._open()
+            swept = 0
+            for blob in candidates:
+                if self._conn.execute('SELECT 1 FROM blobs WHERE checksum = ?', (blob,)).fetchone() is None:
+                    release_blob(blob)
+                    swept += 1
+            return swept
+
+        return await self._run(sweep)
+
+    async def get(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        def get() -> Optional[Dict[str, Any]]:
+            self._open()
+            row = self._conn.execute(
+                f"SELECT {', '.join(ARTIFACT_COLUMNS)} FROM artifacts WHERE id = ?", (artifact_id,)
+            ).fetchone()
+            return self._row_dict(row) if row else None
+
+        return await self._run(get)
+
+    async def load_all(self) -> List[Dict[str, Any]]:
+        def load() -> List[Dict[str, Any]]:
+            self._open()
+            return [
+                self._row_dict(row) for row in self._conn.execute(f"SELECT {', '.join(ARTIFACT_COLUMNS)} FROM artifacts")
+            ]
+
+        return await self._run(load)
+
+    async def load_access_times(self) -> Dict[str, float]:
+        """Last recorded access per artifact (artifacts never read are omitted)"""
+
+        def load() -> Dict[str, float]:
+            self._open()
+            return dict(self._conn.execute('SELECT id, accessed_at FROM artifacts WHERE accessed_at IS NOT NULL'))
+
+        return await self._run(load)
+
+    async def touch_many(self, access_times: Dict[str, float]):
+        """Record access times for many artifacts in one transaction"""
+
+        rows = [(accessed_at, artifact_id) for artifact_id, accessed_at in access_times.items()]
+        await self._run(self._transaction, lambda conn: conn.executemany(
+            'UPDATE artifacts SET accessed_at = ? WHERE id = ?', rows
+        ))
+
+    async def count(self) -> int:
+        def count() -> int:
+            self._open()
+            return self._conn.execute('SELECT COUNT(*) FROM artifacts').fetchone()[0]
+
+        return await self._run(count)
+
+    async def version_heads(self) -> Dict[tuple, int]:
+        """Latest version number per (project, name)"""
+
+        def heads() -> Dict[tuple, int]:
+            self._open()
+            rows = self._conn.execute('SELECT project, name, MAX(version) FROM artifact_versions GROUP BY project, name')
+            return {(project, name): version for project, name, version in rows}
+
+        return await self._run(heads)
+
+    async def put_version(self, version: Dict[str, Any]):
+        columns = ('project', 'name', 'version', 'artifact_id', 'checksum', 'size', 'created_at')
+        await self._run(self._transaction, lambda conn: conn.execute(
+            f"INSERT OR REPLACE INTO artifact_versions ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            tuple(version[column] for column in columns)
+        ))
+
+    async def get_version(
+        self,
+        project: Optional[str] = None,
+        name: Optional[str] = None,
+        version: Optional[int] = None,
+        artifact_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """One version row, by (project, name, version) or by artifact id"""
+
+        def get() -> Optional[Dict[str, Any]]:
+            self._open()
+            if artifact_id is not None:
+                row = self._conn.execute(
+                    'SELECT * FROM artifact_versions WHERE artifact_id = ?', (artifact_id,)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    'SELECT * FROM artifact_versions WHERE project = ? AND name = ? AND version = ?',
+                    (project, name, version)
+                ).fetchone()
+            return dict(row) if row else None
+
+        return await self._run(get)
+
+    async def list_versions(self, project: str, name: str) -> List[Dict[str, Any]]:
+        """Version rows of an artifact, oldest first, without delta payloads"""
+
+        def versions() -> List[Dict[str, Any]]:
+            self._open()
+            return [dict(row) for row in self._conn.execute(
+                'SELECT project, name, version, artifact_id, checksum, size, created_at, '
+                'LENGTH(delta) AS delta_size FROM artifact_versions '
+                'WHERE project = ? AND name = ? ORDER BY version', (project, name)
+            )]
+
+        return await self._run(versions)
+
+    async def version_chain(self, project: str, name: str, version: int) -> List[Dict[str, Any]]:
+        """Rows from ``version`` up to and including the first one stored in full"""
+
+        def chain() -> List[Dict[str, Any]]:
+            self._open()
+            rows = []
+            for row in self._conn.execute(
+                'SELECT * FROM artifact_versions WHERE project = ? AND name = ? AND version >= ? ORDER BY version',
+                (project, name, version)
+            ):
+                rows.append(dict(row))
+                if row['delta'] is None:
+                    break
+            return rows
+
+        return await self._run(chain)
+
+    async def version_dependents(self, artifact_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Delta-encoded versions based on one of ``artifact_ids`` that are not themselves among them"""
+        ids = set(artifact_ids)
+
+        def dependents() -> List[Dict[str, Any]]:
+            self._open()
+            rows = []
+            for artifact_id in ids:
+                row = self._conn.execute(
+                    'SELECT older.* FROM artifact_versions AS newer JOIN artifact_versions AS older '
+                    'ON older.project = newer.project AND older.name = newer.name AND older.version = newer.version - 1 '
+                    'WHERE newer.artifact_id = ? AND older.delta IS NOT NULL', (artifact_id,)
+                ).fetchone()
+                if row is not None and row['artifact_id'] not in ids:
+                    rows.append(dict(row))
+            return rows
+
+        return await self._run(dependents)
+
+    async def rebase_version(
+        self,
+        version: Dict[str, Any],
+        delta: bytes,
+        release_blob: Optional[Callable[[str], None]] = None
+    ):
+        """Store a version as a delta and drop its artifact's reference to the full blob"""
+
+        def rebase():
+            released: List[str] = []
+
+            def write(conn: sqlite3.Connection):
+                conn.execute(
+                    'UPDATE artifact_versions SET delta = ? WHERE project = ? AND name = ? AND version = ?',
+                    (delta, version['project'], version['name'], version['version'])
+                )
+                row = conn.execute('SELECT blob FROM artifacts WHERE id = ?', (version['artifact_id'],)).fetchone()
+                conn.execute(
+                    "UPDATE artifacts SET blob = NULL, codec = 'delta', stored_size = ? WHERE id = ?",
+                    (len(delta), version['artifact_id'])
+                )
+                if row is not None and row[0]:
+                    self._release_blob(conn, row[0], released)
+
+            self._transaction(write)
+            for blob in released:
+                if release_blob:
+                    release_blob(blob)
+
+        await self._run(rebase)
+
+    async def materialize_version(self, version: Dict[str, Any], blob: str, codec: str, stored_size: int):
+        """Point a delta-encoded version back at a full blob"""
+
+        def write(conn: sqlite3.Connection):
+            conn.execute(
+                'UPDATE artifact_versions SET delta = NULL WHERE project = ? AND name = ? AND version = ?',
+                (version['project'], version['name'], version['version'])
+            )
+            conn.execute(
+                'UPDATE artifacts SET blob = ?, codec = ?, stored_size = ? WHERE id = ?',
+                (blob, codec, stored_size, version['artifact_id'])
+            )
+            conn.execute(
+                'INSERT INTO blobs (checksum, refcount) VALUES (?, 1) '
+                'ON CONFLICT (checksum) DO UPDATE SET refcount = refcount + 1',
+                (blob,)
+            )
+
+        await self._run(self._transaction, write)
+
+    async def put_documents(self, documents: Iterable[Dict[str, Any]]):
+        """Insert or update document rows in one transaction.
+
+        An existing row keeps its created_at (so updates do not move it between
+        pages) and any column the update leaves as None.
+        """
+        rows = [tuple(document.get(column) for column in DOCUMENT_COLUMNS) for document in documents]
+        sql = (
+            f"INSERT INTO documents ({', '.join(DOCUMENT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in DOCUMENT_COLUMNS)}) "
+            'ON CONFLICT (kind, id) DO UPDATE SET '
+            'pipeline_id = COALESCE(excluded.pipeline_id, pipeline_id), '
+            'execution_id = COALESCE(excluded.execution_id, execution_id), '
+            'status = COALESCE(excluded.status, status)'
+        )
+        await self._run(self._transaction, lambda conn: conn.executemany(sql, rows))
+
+    async def delete_document(self, kind: str, document_id: str):
+        await self._run(self._transaction, lambda conn: conn.execute(
+            'DELETE FROM documents WHERE kind = ? AND id = ?', (kind, document_id)
+        ))
+
+    async def list_documents(
+        self,
+        kind: str,
+        after: Optional[Tuple[str, str]] = None,
+        limit: int = 50,
+        **filters: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Rows of one kind ordered by (created_at, id), starting after a key; None filters are ignored"""
+
+        clauses = ['kind = ?']
+        params: List[Any] = [kind]
+        if after is not None:
+            clauses.append('(created_at, id) > (?, ?)')
+            params.extend(after)
+        for column, value in filters.items():
+            if column not in DOCUMENT_COLUMNS:
+                raise ValueError(f"Unknown document column: {column}")
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        sql = (
+            f"SELECT {', '.join(DOCUMENT_COLUMNS)} FROM documents WHERE {' AND '.join(clauses)} "
+            'ORDER BY created_at, id LIMIT ?'
+        )
+
+        def documents() -> List[Dict[str, Any]]:
+            self._open()
+            return [dict(row) for row in self._conn.execute(sql, (*params, limit))]
+
+        return await self._run(documents)
+
+    async def count_documents(self) -> int:
+        def count() -> int:
+            self._open()
+            return self._conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+        return await self._run(count)
+
+    async def migrate_from_json(self, index_file: Path) -> int:
+        """One-time import of the legacy metadata/artifact_index.json.
+
+        Content is not carried over (it lives in the artifact files). The JSON
+        file is renamed to ``.migrated`` once its rows are committed.
+        """
+
+        index_file = Path(index_file)
+        if not index_file.exists():
+            return 0
+
+        def read() -> List[Dict[str, Any]]:
+            with open(index_file, 'r') as f:
+                return json.load(f).get('artifacts', [])
+
+        artifacts = await self._run(read)
+        await self.put_many(
+            {**artifact, 'version': artifact.get('version') or '1.0', 'codec': 'identity'} for artifact in artifacts
+        )
+        index_file.rename(index_file.with_suffix('.json.migrated'))
+        self.logger.info(f"Migrated {len(artifacts)} artifacts from {index_file.name} to SQLite")
+        return len(artifacts)
+
+
+__all__ = ['ArtifactIndexStore', 'ARTIFACT_COLUMNS', 'DOCUMENT_COLUMNS']
@@ -4,24 +4,38 @@ Handles storage, retrieval, and versioning of pipeline artifacts
 """
 
 import asyncio
+import bisect
 import json
 import os
 import shutil
 import hashlib
 import logging
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import mimetypes
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, AsyncIterator, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 import aiofiles
 import yaml
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+from sdlc_pipeline_engine.artifact_compression import ArtifactCompressor, CODEC_IDENTITY, CODEC_SUFFIXES, codec_family
+from sdlc_pipeline_engine.artifact_index import ArtifactIndexStore
+from sdlc_pipeline_engine.artifact_versions import CODEC_DELTA, compute_delta, apply_delta, unified_diff
+from sdlc_pipeline_engine.blob_store import BlobStore
+from sdlc_pipeline_engine.storage_quota import (
+    StorageUsage, StorageQuotaExceededError, created_at_epoch, QUOTA_POLICIES,
+    QUOTA_POLICY_REJECT, QUOTA_POLICY_EVICT_LRU
+)
 
 @dataclass
 class Artifact:
     id: str
     name: str
     type: str
-    content: str
+    content: Optional[str]  # None for artifacts loaded from the index; see get_artifact_content
     metadata: Dict[str, Any]
     created_at: str
     size: int
@@ -29,13 +43,72 @@ class Artifact:
     execution_id: str
     stage_id: str
     version: str = "1.0"
+    # Checksum of the content blob in objects/; None for artifacts stored before blobs
+    blob: Optional[str] = None
+    # How the blob is stored (identity, gzip, zstd or zstd:<dictionary id>) and its size on disk
+    codec: str = CODEC_IDENTITY
+    stored_size: Optional[int] = None
+    
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if not self.stored_size:
+            return None
+        return round(self.size / self.stored_size, 3)
 
-@dataclass
-class ArtifactIndex:
-    artifacts: List[Artifact]
-    total_count: int
-    total_size: int
-    last_updated: str
+class ArtifactRecord:
+    """Metadata-only artifact kept in the in-memory index.
+
+    Content is never held here (it is read from the blob store on demand), and
+    the ids repeated across many artifacts are interned so records share them.
+    """
+    
+    __slots__ = (
+        'id', 'name', 'type', 'metadata', 'created_at', 'size', 'checksum',
+        'execution_id', 'stage_id', 'version', 'blob', 'codec', 'stored_size'
+    )
+    
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        type: str,
+        metadata: Dict[str, Any],
+        created_at: str,
+        size: int,
+        checksum: str,
+        execution_id: str,
+        stage_id: str,
+        version: str = "1.0",
+        blob: Optional[str] = None,
+        codec: str = CODEC_IDENTITY,
+        stored_size: Optional[int] = None
+    ):
+        self.id = id
+        self.name = sys.intern(name)
+        self.type = sys.intern(type)
+        self.metadata = metadata
+        self.created_at = created_at
+        self.size = size
+        self.checksum = checksum
+        self.execution_id = sys.intern(execution_id)
+        self.stage_id = sys.intern(stage_id)
+        self.version = sys.intern(version)
+        self.blob = blob
+        self.codec = sys.intern(codec or CODEC_IDENTITY)
+        self.stored_size = stored_size
+    
+    @classmethod
+    def from_artifact(cls, artifact: Artifact) -> 'ArtifactRecord':
+        return cls(**{name: getattr(artifact, name) for name in cls.__slots__})
+    
+    def to_artifact(self, content: Optional[str] = None) -> Artifact:
+        return Artifact(content=content, **{name: getattr(self, name) for name in self.__slots__})
+    
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if not self.stored_size:
+            return None
+        return round(self.size / self.stored_size, 3)
 
 class ArtifactManager:
     """Manages pipeline artifacts with versioning and metadata"""
@@ -49,14 +122,74 @@ class ArtifactManager:
         self.max_storage_size = config.get('max_storage_size', 10 * 1024 * 1024 * 1024)  # 10GB
         self.retention_days = config.get('retention_days', 365)
         self.compression_enabled = config.get('compression_enabled', True)
+        # What happens when a store would exceed max_storage_size (0 disables the limit)
+        self.quota_policy = config.get('storage_quota_policy', QUOTA_POLICY_REJECT)
+        if self.quota_policy not in QUOTA_POLICIES:
+            raise ValueError(f"Unknown storage_quota_policy: {self.quota_policy}")
+        # Artifacts read or written more recently than this are never evicted
+        self.eviction_min_idle_seconds = config.get('eviction_min_idle_seconds', 3600)
+        # Access times are persisted to the index in batches of this many
+        self.access_flush_batch = config.get('access_flush_batch', 256)
+        # Background retention is opt-in: run every interval (0 disables), deleting in batches at a bounded rate
+        self.retention_interval_seconds = config.get('retention_interval_seconds', 0)
+        # Scheduled runs also sweep unreferenced blobs at most this often (0: only when collect_garbage is called)
+        self.gc_interval_seconds = config.get('gc_interval_seconds', 7 * 24 * 3600)
+        self.retention_batch_size = config.get('retention_batch_size', 500)
+        self.retention_max_deletes_per_second = config.get('retention_max_deletes_per_second', 2000)
+        # Version chains per (project, artifact name): the newest version and every
+        # version_snapshot_interval-th one are kept in full, the rest as deltas
+        self.versioning_enabled = config.get('versioning_enabled', True)
+        self.version_snapshot_interval = max(1, config.get('version_snapshot_interval', 10))
+        # Per-artifact <name>.metadata.json files next to the content, for tools that read the tree
+        self.metadata_sidecars = config.get('metadata_sidecars', True)
+        # Concurrent blob writes in store_artifacts_batch
+        self._io_semaphore = asyncio.Semaphore(config.get('io_concurrency', 8))
+        # Chunk size of streamed reads
+        self.read_chunk_size = config.get('read_chunk_size', 256 * 1024)
         
         # Initialize storage structure
         self._initialize_storage()
         
-        # In-memory index for performance
-        self.artifact_index: Dict[str, Artifact] = {}
-        # Load index asynchronously
-        asyncio.create_task(self._load_index())
+        # Content stored once per checksum; the index counts references to each blob
+        self.blob_store = BlobStore(self.storage_path / 'objects')
+        # Transparent blob compression (compression_enabled); zstd dictionaries live beside the index
+        self.compressor = ArtifactCompressor(config, self.storage_path / 'metadata' / 'dictionaries')
+        
+        # Durable metadata index (SQLite, WAL); content stays in the blob store
+        self.index_store = ArtifactIndexStore(
+            self.storage_path / 'metadata' / 'artifact_index.db',
+            synchronous=config.get('index_synchronous', 'NORMAL')
+        )
+        
+        # In-memory index for performance (metadata only; content stays in the blob store)
+        self.artifact_index: Dict[str, ArtifactRecord] = {}
+        # Secondary indexes: sorted (created_at, id) keys overall and per execution, stage and type
+        self._by_time: List[Tuple[str, str]] = []
+        self._by_execution: Dict[str, List[Tuple[str, str]]] = {}
+        self._by_stage: Dict[str, List[Tuple[str, str]]] = {}
+        self._by_type: Dict[str, List[Tuple[str, str]]] = {}
+        # Running totals and access recency, maintained with the index
+        self.usage = StorageUsage()
+        self._quota_lock = asyncio.Lock()
+        self._reserved_bytes = 0
+        self._access_flush: Optional[asyncio.Task] = None
+        self.evicted_artifacts = 0
+        self._retention_lock = asyncio.Lock()
+        self._retention_task: Optional[asyncio.Task] = None
+        # Latest version number per (project, artifact name)
+        self._version_heads: Dict[Tuple[str, str], int] = {}
+        # Load index asynchronously; constructed outside a running loop, start() loads it
+        try:
+            self._load_task: Optional[asyncio.Task] = asyncio.get_running_loop().create_task(self._load_index())
+        except RuntimeError:
+            self._load_task = None
+    
+    async def start(self):
+        """Wait until the artifact index is loaded (starting the load if construction could not)"""
+        
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._load_index())
+        await asyncio.shield(self._load_task)
     
     def _initialize_storage(self):
         """Initialize storage directory structure"""
@@ -67,6 +200,7 @@ class ArtifactManager:
             self.storage_path / 'pipelines',
             self.storage_path / 'templates',
             self.storage_path / 'metadata',
+            self.storage_path / 'objects',
             self.storage_path / 'backups'
         ]
         
@@ -76,47 +210,358 @@ class ArtifactManager:
         self.logger.info(f"Initialized artifact storage at {self.storage_path}")
     
     async def _load_index(self):
-        """Load artifact index from storage"""
+        """Load artifact index from storage, migrating a legacy JSON index once"""
+        
+        try:
+            await self.index_store.open()
+            await self.index_store.migrate_from_json(self.storage_path / 'metadata' / 'artifact_index.json')
+            if await self.index_store.count_documents() == 0:
+                await self._backfill_documents()
+            
+            for key, version in (await self.index_store.version_heads()).items():
+                self._version_heads[key] = max(version, self._version_heads.get(key, 0))
+            
+            access_times = await self.index_store.load_access_times()
+            for artifact_data in await self.index_store.load_all():
+                record = ArtifactRecord(**artifact_data)
+                if record.id not in self.artifact_index:
+                    self._index_add(record, access_times.get(record.id))
+            self.usage.sort_access()
+            
+            self.logger.info(f"Loaded {len(self.artifact_index)} artifacts from index")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to load artifact index: {str(e)}")
+    
+    async def _backfill_documents(self):
+        """Index pipelines, executions and approvals stored before the documents table existed"""
+        
+        documents = await asyncio.to_thread(self._scan_documents)
+        if documents:
+            await self.index_store.put_documents(documents)
+            self.logger.info(f"Indexed {len(documents)} stored pipelines, executions and approvals")
+    
+    def _scan_documents(self) -> List[Dict[str, Any]]:
+        documents = []
+        for path in (self.storage_path / 'pipelines').glob('*.yaml'):
+            try:
+                definition = yaml.safe_load(path.read_text()) or {}
+            except Exception as e:
+                self.logger.warning(f"Skipping unreadable pipeline definition {path.name}: {str(e)}")
+                continue
+            documents.append({'kind': 'pipeline', 'id': path.stem, 'created_at': str(definition.get('stored_at', ''))})
         
-        index_file = self.storage_path / 'metadata' / 'artifact_index.json'
+        for path in (self.storage_path / 'executions').glob('*.json'):
+            for suffix in ('_result.json', '_parked.json'):
+                if not path.name.endswith(suffix):
+                    continue
+                try:
+                    document = json.loads(path.read_text())
+                except Exception as e:
+                    self.logger.warning(f"Skipping unreadable execution file {path.name}: {str(e)}")
+                    continue
+                state = document.get('execution_state', {}) if suffix == '_result.json' else document
+                documents.append(self._execution_document(path.name[:-len(suffix)], state))
         
-        if index_file.exists():
+        for path in (self.storage_path / 'metadata').glob('approval_*.json'):
             try:
-                async with aiofiles.open(index_file, 'r') as f:
-                    content = await f.read()
-                    index_data = json.loads(content)
-                    
-                    for artifact_data in index_data.get('artifacts', []):
-                        artifact = Artifact(**artifact_data)
-                        self.artifact_index[artifact.id] = artifact
-                
-                self.logger.info(f"Loaded {len(self.artifact_index)} artifacts from index")
-                
+                request = json.loads(path.read_text())
             except Exception as e:
-                self.logger.error(f"Failed to load artifact index: {str(e)}")
+                self.logger.warning(f"Skipping unreadable approval request {path.name}: {str(e)}")
+                continue
+            documents.append(self._approval_document(request))
+        return documents
     
-    async def _save_index(self):
-        """Save artifact index to storage"""
+    @staticmethod
+    def _execution_document(execution_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Documents row of a stored execution result or parked checkpoint"""
         
-        index_file = self.storage_path / 'metadata' / 'artifact_index.json'
+        context = state.get('context')
+        context = context if isinstance(context, dict) else {}
+        return {
+            'kind': 'execution',
+            'id': execution_id,
+            'created_at': context.get('metadata', {}).get('start_time') or '',
+            'pipeline_id': context.get('project_id'),
+            'status': str(state['status']).split('.')[-1].lower() if state.get('status') else None
+        }
+    
+    @staticmethod
+    def _approval_document(request: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'kind': 'approval',
+            'id': request['approval_id'],
+            'created_at': request.get('created_at') or request.get('stored_at', ''),
+            'execution_id': request.get('execution_id'),
+            'status': request.get('status', 'pending')
+        }
+    
+    async def _index_documents(self, *documents: Dict[str, Any]):
+        # Loading first backfills older files, which only happens while the table is empty
+        await self.start()
+        await self.index_store.put_documents(documents)
+    
+    async def list_documents(
+        self,
+        kind: str,
+        after: Optional[Tuple[str, str]] = None,
+        limit: int = 50,
+        **filters: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Pipeline, execution or approval keys in (created_at, id) order, after a keyset cursor"""
         
-        try:
-            artifacts_data = [asdict(artifact) for artifact in self.artifact_index.values()]
+        await self.start()
+        return await self.index_store.list_documents(kind, after, limit, **filters)
+    
+    async def index_execution(self, execution_id: str, pipeline_id: str, start_time: str, status: str):
+        """Index an execution when it is created, before any result or checkpoint is stored"""
+        
+        await self._index_documents({
+            'kind': 'execution', 'id': execution_id, 'created_at': start_time,
+            'pipeline_id': pipeline_id, 'status': status
+        })
+    
+    def _secondary_indexes(self, record: ArtifactRecord) -> List[List[Tuple[str, str]]]:
+        return [
+            self._by_time,
+            self._by_execution.setdefault(record.execution_id, []),
+            self._by_stage.setdefault(record.stage_id, []),
+            self._by_type.setdefault(record.type, [])
+        ]
+    
+    def _index_add(self, record: ArtifactRecord, accessed_at: Optional[float] = None):
+        """Add a record to the in-memory index, its secondary indexes and the usage counters"""
+        
+        self._index_remove(record.id)
+        self.artifact_index[record.id] = record
+        self.usage.add(record, accessed_at)
+        key = (record.created_at, record.id)
+        for keys in self._secondary_indexes(record):
+            # New artifacts are the newest, so this is almost always an append
+            if not keys or keys[-1] < key:
+                keys.append(key)
+            else:
+                bisect.insort(keys, key)
+    
+    def _index_remove(self, artifact_id: str) -> Optional[ArtifactRecord]:
+        record = self.artifact_index.pop(artifact_id, None)
+        if record is None:
+            return None
+        self.usage.remove(record)
+        key = (record.created_at, record.id)
+        for index, value in (
+            (self._by_execution, record.execution_id), (self._by_stage, record.stage_id), (self._by_type, record.type)
+        ):
+            keys = index.get(value)
+            if keys is not None:
+                self._remove_key(keys, key)
+                if not keys:
+                    del index[value]
+        self._remove_key(self._by_time, key)
+        return record
+    
+    @staticmethod
+    def _remove_key(keys: List[Tuple[str, str]], key: Tuple[str, str]):
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+    
+    def _index_row(self, artifact: Artifact) -> Dict[str, Any]:
+        """Index columns of an artifact (everything but content)"""
+        
+        return {
+            'id': artifact.id,
+            'name': artifact.name,
+            'type': artifact.type,
+            'execution_id': artifact.execution_id,
+            'stage_id': artifact.stage_id,
+            'created_at': artifact.created_at,
+            'size': artifact.size,
+            'checksum': artifact.checksum,
+            'version': artifact.version,
+            'metadata': artifact.metadata,
+            'blob': artifact.blob,
+            'codec': artifact.codec,
+            'stored_size': artifact.stored_size
+        }
+    
+    async def store_artifact(
+        self,
+        name: str,
+        content: str,
+        artifact_type: str,
+        execution_id: str,
+        stage_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        project: Optional[str] = None
+    ) -> str:
+        """Store an artifact and return its ID.
+        With a project (or ``project_name`` in metadata) the artifact becomes the next
+        version of that project's artifact with the same name.
+        """
+        
+        artifact, data = self._new_artifact(name, content, artifact_type, execution_id, stage_id, metadata)
+        artifact_id = artifact.id
+        version_key = self._assign_version(artifact, project, metadata)
+        
+        async with self._reserve_storage(self._incoming_bytes([(artifact, data)])):
+            # Store artifact file
+            artifact_path = await self._store_artifact_file(artifact, data)
             
-            index_data = ArtifactIndex(
-                artifacts=artifacts_data,
-                total_count=len(artifacts_data),
-                total_size=sum(artifact.size for artifact in self.artifact_index.values()),
-                last_updated=datetime.utcnow().isoformat()
+            # Update index
+            missing = await self.index_store.put(
+                self._index_row(artifact), self.blob_store.exists, self.blob_store.unlink
             )
+            if missing:
+                # The blob was collected by a concurrent delete before our reference committed
+                await self._write_blob(artifact, data)
+            self._index_add(ArtifactRecord.from_artifact(artifact))
+        
+        if version_key:
+            await self._record_version(artifact, data, version_key)
+        
+        self.logger.info(f"Stored artifact {artifact_id}: {name} ({artifact.size} bytes, {artifact.codec})")
+        
+        return artifact_id
+    
+    async def store_artifacts_batch(self, artifacts: List[Dict[str, Any]]) -> List[str]:
+        """Store several artifacts (e.g. every file a stage generated) and return their IDs in order.
+        
+        Each entry takes the keyword arguments of store_artifact (including ``project``). Blobs are written
+        concurrently, at most ``io_concurrency`` at a time, and all metadata is
+        committed in a single index transaction.
+        """
+        
+        prepared = [
+            self._new_artifact(
+                entry['name'], entry['content'], entry['artifact_type'],
+                entry['execution_id'], entry['stage_id'], entry.get('metadata')
+            )
+            for entry in artifacts
+        ]
+        version_keys = [
+            self._assign_version(artifact, entry.get('project'), entry.get('metadata'))
+            for (artifact, _), entry in zip(prepared, artifacts)
+        ]
+        
+        async def write(artifact: Artifact, data: bytes):
+            async with self._io_semaphore:
+                await self._store_artifact_file(artifact, data)
+        
+        async with self._reserve_storage(self._incoming_bytes(prepared)):
+            await asyncio.gather(*(write(artifact, data) for artifact, data in prepared))
             
-            async with aiofiles.open(index_file, 'w') as f:
-                await f.write(json.dumps(asdict(index_data), indent=2))
-                
+            missing = set(await self.index_store.put_many(
+                [self._index_row(artifact) for artifact, _ in prepared], self.blob_store.exists, self.blob_store.unlink
+            ))
+            for artifact, data in prepared:
+                if artifact.blob in missing:
+                    # Collected by a concurrent delete before our references committed
+                    await self._write_blob(artifact, data)
+                    missing.discard(artifact.blob)
+                self._index_add(ArtifactRecord.from_artifact(artifact))
+        
+        for (artifact, data), version_key in zip(prepared, version_keys):
+            if version_key:
+                await self._record_version(artifact, data, version_key)
+        
+        self.logger.info(f"Stored {len(prepared)} artifacts "
+                        f"({sum(artifact.size for artifact, _ in prepared)} bytes) in one batch")
+        
+        return [artifact.id for artifact, _ in prepared]
+    
+    def _incoming_bytes(self, prepared: List[Tuple[Artifact, bytes]]) -> int:
+        """Upper bound on new stored bytes: uncompressed size of blobs not already held"""
+        
+        blobs = {artifact.blob: len(data) for artifact, data in prepared if not self.usage.holds_blob(artifact.blob)}
+        return sum(blobs.values())
+    
+    @asynccontextmanager
+    async def _reserve_storage(self, incoming: int):
+        """Hold ``incoming`` bytes of the storage quota while a store is in flight"""
+        
+        async with self._quota_lock:
+            await self._ensure_capacity(incoming)
+            self._reserved_bytes += incoming
+        try:
+            yield
+        finally:
+            self._reserved_bytes -= incoming
+    
+    async def _ensure_capacity(self, incoming: int):
+        """Make room for ``incoming`` bytes under max_storage_size, evicting per the quota policy"""
+        
+        if not self.max_storage_size or incoming <= 0:
+            return
+        available = self.max_storage_size - self.usage.stored_bytes - self._reserved_bytes
+        if incoming <= available:
+            return
+        
+        needed = incoming - available
+        victims = [] if self.quota_policy == QUOTA_POLICY_REJECT else self._select_evictions(needed)
+        freed = self.usage.bytes_freed_by(victims)
+        if freed < needed:
+            raise StorageQuotaExceededError(
+                f"Storing {incoming} bytes would exceed max_storage_size ({self.max_storage_size} bytes, "
+                f"{max(0, available)} available, policy {self.quota_policy})",
+                incoming,
+                max(0, available)
+            )
+        
+        await self.delete_artifacts([record.id for record in victims])
+        self.evicted_artifacts += len(victims)
+        self.logger.warning(f"Evicted {len(victims)} artifacts ({freed} bytes) to stay within max_storage_size")
+    
+    def _select_evictions(self, needed: int) -> List[ArtifactRecord]:
+        """Cold artifacts whose deletion frees at least ``needed`` stored bytes (fewer if not possible)"""
+        
+        idle_before = time.time() - self.eviction_min_idle_seconds
+        victims: List[ArtifactRecord] = []
+        released: Dict[str, int] = {}
+        freed = 0
+        
+        if self.quota_policy == QUOTA_POLICY_EVICT_LRU:
+            for artifact_id, _ in self.usage.least_recently_used(idle_before):
+                record = self.artifact_index[artifact_id]
+                victims.append(record)
+                freed += self.usage.release(record, released)
+                if freed >= needed:
+                    break
+            return victims
+        
+        # Oldest executions first, skipping any written or read recently (possibly still running)
+        for execution_id, keys in sorted(self._by_execution.items(), key=lambda item: item[1][0]):
+            if created_at_epoch(keys[-1][0]) >= idle_before:
+                continue
+            records = [self.artifact_index[artifact_id] for _, artifact_id in keys]
+            if any(self.usage.last_access(record.id) >= idle_before for record in records):
+                continue
+            victims.extend(records)
+            freed += sum(self.usage.release(record, released) for record in records)
+            if freed >= needed:
+                break
+        return victims
+    
+    def _touch(self, artifact_id: str):
+        """Record a content access; persisted to the index in batches"""
+        
+        pending = self.usage.touch(artifact_id, time.time())
+        if pending >= self.access_flush_batch and (self._access_flush is None or self._access_flush.done()):
+            self._access_flush = asyncio.create_task(self.flush_access_times())
+    
+    async def flush_access_times(self) -> int:
+        """Write access times recorded since the last flush to the index"""
+        
+        pending = self.usage.take_pending_access()
+        if not pending:
+            return 0
+        try:
+            await self.index_store.touch_many(pending)
         except Exception as e:
-            self.logger.error(f"Failed to save artifact index: {str(e)}")
+            self.logger.error(f"Failed to persist artifact access times: {str(e)}")
+        return len(pending)
     
-    async def store_artifact(
+    def _new_artifact(
         self,
         name: str,
         content: str,
@@ -124,67 +569,82 @@ class ArtifactManager:
         execution_id: str,
         stage_id: str,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Store an artifact and return its ID"""
-        
-        # Generate artifact ID
-        artifact_id = self._generate_artifact_id(name, execution_id, stage_id)
+    ) -> Tuple[Artifact, bytes]:
+        """Build an artifact and its encoded content"""
         
-        # Calculate checksum
-        checksum = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        # Calculate checksum (also the blob address)
+        data = content.encode('utf-8')
+        checksum = hashlib.sha256(data).hexdigest()
         
-        # Create artifact object
         artifact = Artifact(
-            id=artifact_id,
+            id=self._generate_artifact_id(name, execution_id, stage_id),
             name=name,
             type=artifact_type,
             content=content,
             metadata=metadata or {},
             created_at=datetime.utcnow().isoformat(),
-            size=len(content.encode('utf-8')),
+            size=len(data),
             checksum=checksum,
             execution_id=execution_id,
-            stage_id=stage_id
+            stage_id=stage_id,
+            blob=checksum
         )
-        
-        # Store artifact file
-        artifact_path = await self._store_artifact_file(artifact)
-        
-        # Update index
-        self.artifact_index[artifact_id] = artifact
-        await self._save_index()
-        
-        self.logger.info(f"Stored artifact {artifact_id}: {name} ({artifact.size} bytes)")
-        
-        return artifact_id
+        return artifact, data
     
-    async def _store_artifact_file(self, artifact: Artifact) -> Path:
-        """Store artifact content to file"""
+    async def _store_artifact_file(self, artifact: Artifact, data: bytes) -> Path:
+        """Store artifact content as a blob, referenced from the execution directory"""
         
         # Create directory structure: executions/{execution_id}/{stage_id}/
         artifact_dir = self.storage_path / 'executions' / artifact.execution_id / artifact.stage_id
         artifact_dir.mkdir(parents=True, exist_ok=True)
         
-        # Determine file extension based on artifact type
-        file_extension = self._get_file_extension(artifact.type)
-        file_path = artifact_dir / f"{artifact.name}{file_extension}"
+        await self._ensure_blob(artifact, data)
+        await self.compressor.observe(artifact.type, data)
         
-        # Store content
-        async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-            await f.write(artifact.content)
+        # The execution path is a hard link to the blob, suffixed with its codec (.gz/.zst)
+        file_path = artifact_dir / self._artifact_file_name(artifact)
+        self.blob_store.link(artifact.blob, file_path)
         
-        # Store metadata
-        metadata_path = artifact_dir / f"{artifact.name}.metadata.json"
-        async with aiofiles.open(metadata_path, 'w') as f:
-            metadata = {
-                'artifact': asdict(artifact),
-                'stored_at': datetime.utcnow().isoformat(),
-                'file_path': str(file_path)
-            }
-            await f.write(json.dumps(metadata, indent=2))
+        # Optional metadata sidecar (the index is authoritative; content is not repeated here)
+        if self.metadata_sidecars:
+            metadata_path = artifact_dir / f"{artifact.name}.metadata.json"
+            async with aiofiles.open(metadata_path, 'w') as f:
+                metadata = {
+                    'artifact': self._index_row(artifact),
+                    'stored_at': datetime.utcnow().isoformat(),
+                    'file_path': str(file_path)
+                }
+                await f.write(json.dumps(metadata, indent=2))
         
         return file_path
     
+    async def _ensure_blob(self, artifact: Artifact, data: bytes):
+        """Store content once per checksum, reusing the codec of an existing blob"""
+        
+        if self.blob_store.exists(artifact.blob):
+            artifact.codec = self.compressor.detect(await self.blob_store.read_head(artifact.blob))
+            artifact.stored_size = self.blob_store.size(artifact.blob)
+        else:
+            await self._write_blob(artifact, data)
+    
+    async def _write_blob(self, artifact: Artifact, data: bytes):
+        """Compress and write an artifact's blob, recording the codec and stored size"""
+        
+        codec = self.compressor.choose_codec(artifact.type, len(data))
+        if codec != CODEC_IDENTITY and len(data) > self.compressor.chunk_size:
+            # Large artifacts are compressed chunk by chunk as they are written
+            artifact.stored_size = await self.blob_store.write(
+                artifact.blob, self.compressor.compress_stream(codec, data)
+            )
+        else:
+            codec, payload = self.compressor.compress(codec, data)
+            artifact.stored_size = await self.blob_store.write(artifact.blob, payload)
+        artifact.codec = codec
+    
+    def _artifact_file_name(self, artifact: Artifact) -> str:
+        suffix = CODEC_SUFFIXES.get(codec_family(artifact.codec), '') if artifact.blob else ''
+        return f"{artifact.name}{self._get_file_extension(artifact.type)}{suffix}"
+    
     def _get_file_extension(self, artifact_type: str) -> str:
         """Get appropriate file extension for artifact type"""
         
@@ -207,6 +667,12 @@ class ArtifactManager:
         
         return extensions.get(artifact_type, '.txt')
     
+    def get_media_type(self, artifact_type: str) -> str:
+        """MIME type for serving content of an artifact type"""
+        
+        media_type, _ = mimetypes.guess_type(f"artifact{self._get_file_extension(artifact_type)}")
+        return media_type or 'text/plain'
+    
     def _generate_artifact_id(self, name: str, execution_id: str, stage_id: str) -> str:
         """Generate unique artifact ID"""
         
@@ -215,82 +681,222 @@ class ArtifactManager:
         
         return hashlib.md5(unique_string.encode()).hexdigest()
     
-    async def get_artifact(self, artifact_id: str) -> Optional[Artifact]:
-        """Retrieve artifact by ID"""
+    async def get_artifact(self, artifact_id: str, include_content: bool = False) -> Optional[Artifact]:
+        """Retrieve artifact by ID; content is only read when ``include_content`` is set"""
         
-        if artifact_id in self.artifact_index:
-            return self.artifact_index[artifact_id]
+        record = self.artifact_index.get(artifact_id)
+        if record is None:
+            return None
         
-        return None
+        if include_content:
+            return record.to_artifact(await self.get_artifact_content(artifact_id))
+        return record.to_artifact()
     
     async def get_artifact_content(self, artifact_id: str) -> Optional[str]:
         """Get artifact content by ID"""
         
-        artifact = await self.get_artifact(artifact_id)
+        artifact = self.artifact_index.get(artifact_id)
         if not artifact:
             return None
+        self._touch(artifact_id)
+        return await self._read_content(artifact)
+    
+    async def _read_content(self, artifact: Optional[ArtifactRecord]) -> Optional[str]:
+        """Decoded content without recording an access (internal reads must not affect eviction order)"""
         
+        if artifact is None:
+            return None
+        artifact_id = artifact.id
         try:
-            # Reconstruct file path
-            file_extension = self._get_file_extension(artifact.type)
-            file_path = (self.storage_path / 'executions' / 
-                        artifact.execution_id / artifact.stage_id / 
-                        f"{artifact.name}{file_extension}")
+            if artifact.codec == CODEC_DELTA:
+                version = await self.index_store.get_version(artifact_id=artifact_id)
+                return await self._version_content(version['project'], version['name'], version['version'])
+            
+            if artifact.blob:
+                data = await self.blob_store.read(artifact.blob)
+                if artifact.codec == CODEC_IDENTITY:
+                    return data.decode('utf-8')
+                if len(data) > self.compressor.chunk_size:
+                    data = await asyncio.to_thread(self.compressor.decompress, data)
+                else:
+                    data = self.compressor.decompress(data)
+                return data.decode('utf-8')
             
+            # Artifacts stored before blobs keep their content in the execution directory
+            file_path = self._content_path(artifact)
             if file_path.exists():
                 async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
                     return await f.read()
-            else:
-                # Fallback to in-memory content
-                return artifact.content
+            return None
                 
         except Exception as e:
             self.logger.error(f"Failed to read artifact content {artifact_id}: {str(e)}")
             return None
     
-    async def list_artifacts(
+    def _content_path(self, artifact: ArtifactRecord) -> Path:
+        """File holding an artifact's stored content: its blob, or the legacy execution path"""
+        
+        if artifact.blob:
+            return self.blob_store.path_for(artifact.blob)
+        return (self.storage_path / 'executions' / artifact.execution_id / artifact.stage_id /
+                self._artifact_file_name(artifact))
+    
+    async def stream_artifact_content(
         self,
-        execution_id: Optional[str] = None,
-        stage_id: Optional[str] = None,
-        artifact_type: Optional[str] = None,
-        limit: Optional[int] = None
-    ) -> List[Artifact]:
-        """List artifacts with optional filters"""
+        artifact_id: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        decode: bool = True
+    ) -> Optional[AsyncIterator[bytes]]:
+        """Stream artifact content as bytes, optionally only the range ``[start, end)``.
         
-        artifacts = list(self.artifact_index.values())
+        Offsets are into the decompressed content; with ``decode=False`` the stored
+        (possibly compressed) bytes are streamed instead and offsets apply to them.
+        Returns None when the artifact or its content is missing.
+        """
         
-        # Apply filters
-        if execution_id:
-            artifacts = [a for a in artifacts if a.execution_id == execution_id]
+        artifact = self.artifact_index.get(artifact_id)
+        if not artifact:
+            return None
         
-        if stage_id:
-            artifacts = [a for a in artifacts if a.stage_id == stage_id]
+        if artifact.codec == CODEC_DELTA:
+            # Rebuilt from the version chain in memory
+            content = await self.get_artifact_content(artifact_id)
+            if content is None:
+                return None
+            data = content.encode('utf-8')
+            return self._iter_range(self._iter_bytes(data, self.read_chunk_size), start, end)
         
-        if artifact_type:
-            artifacts = [a for a in artifacts if a.type == artifact_type]
+        file_path = self._content_path(artifact)
+        if not file_path.exists():
+            return None
+        self._touch(artifact_id)
         
-        # Sort by creation time (newest first)
-        artifacts.sort(key=lambda x: x.created_at, reverse=True)
+        codec = artifact.codec if artifact.blob else CODEC_IDENTITY
+        if codec == CODEC_IDENTITY or not decode:
+            return self._iter_file_range(file_path, start, end)
+        return self._iter_range(
+            self.compressor.decompress_stream(codec, self._iter_file_range(file_path, 0, None)), start, end
+        )
+    
+    async def _iter_file_range(self, file_path: Path, start: int, end: Optional[int]) -> AsyncIterator[bytes]:
+        size = file_path.stat().st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
         
-        # Apply limit
-        if limit:
-            artifacts = artifacts[:limit]
+        async with aiofiles.open(file_path, 'rb') as f:
+            await f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = await f.read(min(self.read_chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+    
+    @staticmethod
+    async def _iter_bytes(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+        view = memoryview(data)
+        for offset in range(0, len(data), chunk_size):
+            yield view[offset:offset + chunk_size]
+    
+    @staticmethod
+    async def _iter_range(chunks: AsyncIterator[bytes], start: int, end: Optional[int]) -> AsyncIterator[bytes]:
+        """Cut ``[start, end)`` out of a byte stream"""
+        
+        position = 0
+        async for chunk in chunks:
+            chunk_end = position + len(chunk)
+            if chunk_end > start:
+                piece = chunk[max(0, start - position):len(chunk) if end is None else max(0, end - position)]
+                if piece:
+                    yield piece
+            position = chunk_end
+            if end is not None and position >= end:
+                break
+    
+    async def list_artifacts(
+        self,
+        execution_id: Optional[str] = None,
+        stage_id: Optional[str] = None,
+        artifact_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[Artifact]:
+        """List artifacts (metadata only), newest first, with optional filters.
+        Pass the ``artifact_cursor`` of the last artifact of a page as ``cursor`` for the next one.
+        """
         
+        artifacts = []
+        for record in self.iter_artifacts(execution_id, stage_id, artifact_type, cursor):
+            if limit and len(artifacts) >= limit:
+                break
+            artifacts.append(record.to_artifact())
         return artifacts
     
+    def iter_artifacts(
+        self,
+        execution_id: Optional[str] = None,
+        stage_id: Optional[str] = None,
+        artifact_type: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Iterator[ArtifactRecord]:
+        """Lazily yield matching records newest first, starting after ``cursor`` (keyset pagination).
+        Walks the smallest secondary index that applies, so a page costs O(page size) for
+        selective filters. Safe against artifacts being stored or deleted while iterating.
+        """
+        
+        candidates = [self._by_time]
+        for index, value in (
+            (self._by_execution, execution_id), (self._by_stage, stage_id), (self._by_type, artifact_type)
+        ):
+            if value:
+                candidates.append(index.get(value, []))
+        keys = min(candidates, key=len)
+        
+        key = self.parse_artifact_cursor(cursor) if cursor else None
+        while True:
+            # Re-seek from the last key each step rather than holding a position
+            position = bisect.bisect_left(keys, key) if key else len(keys)
+            if position == 0:
+                return
+            key = keys[position - 1]
+            record = self.artifact_index.get(key[1])
+            if record is None:
+                continue
+            if execution_id and record.execution_id != execution_id:
+                continue
+            if stage_id and record.stage_id != stage_id:
+                continue
+            if artifact_type and record.type != artifact_type:
+                continue
+            yield record
+    
+    @staticmethod
+    def artifact_cursor(artifact: Any) -> str:
+        """Opaque keyset cursor positioned at an artifact (or record)"""
+        return f"{artifact.created_at}|{artifact.id}"
+    
+    @staticmethod
+    def parse_artifact_cursor(cursor: str) -> Tuple[str, str]:
+        created_at, _, artifact_id = cursor.rpartition('|')
+        if not created_at or not artifact_id:
+            raise ValueError(f"Invalid artifact cursor: {cursor}")
+        return created_at, artifact_id
+    
     async def delete_artifact(self, artifact_id: str) -> bool:
         """Delete artifact by ID"""
         
-        artifact = await self.get_artifact(artifact_id)
+        artifact = self.artifact_index.get(artifact_id)
         if not artifact:
             return False
         
         try:
             # Delete file
-            file_extension = self._get_file_extension(artifact.type)
             file_path = (self.storage_path / 'executions' / 
                         artifact.execution_id / artifact.stage_id / 
-                        f"{artifact.name}{file_extension}")
+                        self._artifact_file_name(artifact))
             
             if file_path.exists():
                 file_path.unlink()
@@ -300,9 +906,10 @@ class ArtifactManager:
             if metadata_path.exists():
                 metadata_path.unlink()
             
-            # Remove from index
-            del self.artifact_index[artifact_id]
-            await self._save_index()
+            # Remove from index; the blob goes with its last reference
+            await self._materialize_dependents([artifact_id])
+            await self.index_store.delete(artifact_id, self.blob_store.unlink)
+            self._index_remove(artifact_id)
             
             self.logger.info(f"Deleted artifact {artifact_id}")
             return True
@@ -311,6 +918,155 @@ class ArtifactManager:
             self.logger.error(f"Failed to delete artifact {artifact_id}: {str(e)}")
             return False
     
+    async def delete_artifacts(self, artifact_ids: Iterable[str]) -> int:
+        """Delete many artifacts with a single index transaction; returns the number deleted"""
+        
+        records = [record for record in map(self.artifact_index.get, artifact_ids) if record is not None]
+        if not records:
+            return 0
+        
+        await asyncio.to_thread(self._unlink_artifact_files, records)
+        await self._materialize_dependents([record.id for record in records])
+        removed = await self.index_store.delete_many([record.id for record in records], self.blob_store.unlink)
+        for record in records:
+            self._index_remove(record.id)
+        
+        self.logger.info(f"Deleted {removed} artifacts")
+        return removed
+    
+    def _unlink_artifact_files(self, records: List[ArtifactRecord]):
+        for record in records:
+            artifact_dir = self.storage_path / 'executions' / record.execution_id / record.stage_id
+            (artifact_dir / self._artifact_file_name(record)).unlink(missing_ok=True)
+            (artifact_dir / f"{record.name}.metadata.json").unlink(missing_ok=True)
+    
+    def _assign_version(
+        self,
+        artifact: Artifact,
+        project: Optional[str],
+        metadata: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[str, str, int]]:
+        """Number a versioned artifact (synchronously, so concurrent stores get distinct versions)"""
+        
+        project = project or (metadata or {}).get('project_name')
+        if not self.versioning_enabled or not project:
+            return None
+        key = (project, artifact.name)
+        version = self._version_heads.get(key, 0) + 1
+        self._version_heads[key] = version
+        artifact.version = str(version)
+        return project, artifact.name, version
+    
+    async def _record_version(self, artifact: Artifact, data: bytes, version_key: Tuple[str, str, int]):
+        """Add a stored artifact to its version chain and delta-encode the version it supersedes"""
+        
+        project, name, version = version_key
+        try:
+            await self.index_store.put_version({
+                'project': project,
+                'name': name,
+                'version': version,
+                'artifact_id': artifact.id,
+                'checksum': artifact.checksum,
+                'size': artifact.size,
+                'created_at': artifact.created_at
+            })
+            previous = version - 1
+            if previous >= 1 and previous % self.version_snapshot_interval:
+                await self._delta_encode_version(project, name, previous, data.decode('utf-8'))
+        except Exception as e:
+            self.logger.error(f"Failed to record version {version} of {project}/{name}: {str(e)}")
+    
+    async def _delta_encode_version(self, project: str, name: str, version: int, newer_content: str):
+        """Replace a full version by a delta against the next version's content"""
+        
+        row = await self.index_store.get_version(project, name, version)
+        if row is None or row['delta'] is not None:
+            return
+        record = self.artifact_index.get(row['artifact_id'])
+        if record is None or not record.blob:
+            return
+        
+        content = await self._read_content(record)
+        if content is None:
+            return
+        raw = await asyncio.to_thread(compute_delta, newer_content, content)
+        _, delta = self.compressor.compress(self.compressor.codec if self.compressor.enabled else CODEC_IDENTITY, raw)
+        if len(delta) >= (record.stored_size or record.size):
+            return
+        
+        # The execution-directory hard link would keep the full content on disk
+        link_path = (self.storage_path / 'executions' / record.execution_id / record.stage_id /
+                     self._artifact_file_name(record))
+        await self.index_store.rebase_version(row, delta, self.blob_store.unlink)
+        link_path.unlink(missing_ok=True)
+        
+        artifact = record.to_artifact()
+        artifact.blob, artifact.codec, artifact.stored_size = None, CODEC_DELTA, len(delta)
+        self._index_add(ArtifactRecord.from_artifact(artifact), self.usage.last_access(record.id))
+    
+    async def _version_content(self, project: str, name: str, version: int) -> Optional[str]:
+        """Content of a version: the nearest newer full version with deltas applied back to it"""
+        
+        chain = await self.index_store.version_chain(project, name, version)
+        if not chain or chain[0]['version'] != version or chain[-1]['delta'] is not None:
+            return None
+        
+        content = await self._read_content(self.artifact_index.get(chain[-1]['artifact_id']))
+        if content is None:
+            return None
+        for row in reversed(chain[:-1]):
+            content = apply_delta(content, self.compressor.decompress(row['delta']))
+        
+        if hashlib.sha256(content.encode('utf-8')).hexdigest() != chain[0]['checksum']:
+            self.logger.error(f"Version {version} of {project}/{name} failed its checksum after applying deltas")
+            return None
+        return content
+    
+    async def _materialize_dependents(self, artifact_ids: List[str]):
+        """Before deleting versions, store in full any older version whose delta is based on them"""
+        
+        for row in await self.index_store.version_dependents(artifact_ids):
+            record = self.artifact_index.get(row['artifact_id'])
+            content = await self._version_content(row['project'], row['name'], row['version'])
+            if record is None or content is None:
+                continue
+            
+            artifact = record.to_artifact()
+            artifact.blob = row['checksum']
+            await self._ensure_blob(artifact, content.encode('utf-8'))
+            await self.index_store.materialize_version(row, artifact.blob, artifact.codec, artifact.stored_size)
+            self._index_add(ArtifactRecord.from_artifact(artifact), self.usage.last_access(record.id))
+    
+    async def get_artifact_version(self, project: str, name: str, version: Optional[int] = None) -> Optional[str]:
+        """Content of a version of a project's artifact (the latest by default)"""
+        
+        version = version or self._version_heads.get((project, name))
+        if not version:
+            return None
+        return await self._version_content(project, name, version)
+    
+    async def list_artifact_versions(self, project: str, name: str) -> List[Dict[str, Any]]:
+        """Versions of a project's artifact, oldest first; ``delta_size`` is None for full versions"""
+        return await self.index_store.list_versions(project, name)
+    
+    async def diff_artifact_versions(
+        self,
+        project: str,
+        name: str,
+        from_version: int,
+        to_version: Optional[int] = None,
+        context_lines: int = 3
+    ) -> Optional[str]:
+        """Unified diff between two versions (to the latest by default)"""
+        
+        to_version = to_version or self._version_heads.get((project, name))
+        old = await self.get_artifact_version(project, name, from_version)
+        new = await self.get_artifact_version(project, name, to_version)
+        if old is None or new is None:
+            return None
+        return unified_diff(old, new, f"{name}@{from_version}", f"{name}@{to_version}", context_lines)
+    
     async def store_pipeline_definition(self, pipeline_id: str, definition: Dict[str, Any]) -> bool:
         """Store pipeline definition"""
         
@@ -323,6 +1079,8 @@ class ArtifactManager:
             
             async with aiofiles.open(pipeline_path, 'w') as f:
                 await f.write(yaml.dump(definition, default_flow_style=False, indent=2))
+            # Re-stored definitions keep their original position
+            await self._index_documents({'kind': 'pipeline', 'id': pipeline_id, 'created_at': definition['stored_at']})
             
             self.logger.info(f"Stored pipeline definition: {pipeline_id}")
             return True
@@ -348,6 +1106,46 @@ class ArtifactManager:
             self.logger.error(f"Failed to load pipeline definition {pipeline_id}: {str(e)}")
             return None
     
+    async def delete_pipeline_definition(self, pipeline_id: str) -> bool:
+        """Delete pipeline definition"""
+        
+        pipeline_path = self.storage_path / 'pipelines' / f"{pipeline_id}.yaml"
+        try:
+            pipeline_path.unlink()
+        except FileNotFoundError:
+            return False
+        await self.start()
+        await self.index_store.delete_document('pipeline', pipeline_id)
+        self.logger.info(f"Deleted pipeline definition: {pipeline_id}")
+        return True
+    
+    async def list_pipeline_templates(self) -> List[Dict[str, Any]]:
+        """Load pipeline templates stored under templates/ (YAML pipeline definitions)"""
+        
+        templates = []
+        for template_path in sorted((self.storage_path / 'templates').glob('*.y*ml')):
+            template = await self.load_pipeline_template(template_path.stem)
+            if template is not None:
+                templates.append(template)
+        return templates
+    
+    async def load_pipeline_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        """Load a pipeline template by id (file stem)"""
+        
+        for suffix in ('.yaml', '.yml'):
+            template_path = self.storage_path / 'templates' / f"{template_id}{suffix}"
+            if not template_path.exists():
+                continue
+            try:
+                async with aiofiles.open(template_path, 'r') as f:
+                    template = yaml.safe_load(await f.read()) or {}
+                template['id'] = template_id
+                return template
+            except Exception as e:
+                self.logger.error(f"Failed to load pipeline template {template_id}: {str(e)}")
+                return None
+        return None
+    
     async def store_execution_result(self, execution_id: str, execution_state: Dict[str, Any]) -> bool:
         """Store execution result"""
         
@@ -363,6 +1161,7 @@ class ArtifactManager:
             
             async with aiofiles.open(execution_path, 'w') as f:
                 await f.write(json.dumps(result, indent=2, default=str))
+            await self._index_documents(self._execution_document(execution_id, execution_state))
             
             self.logger.info(f"Stored execution result: {execution_id}")
             return True
@@ -409,6 +1208,7 @@ class ArtifactManager:
             
             async with aiofiles.open(approval_path, 'w') as f:
                 await f.write(json.dumps(request, indent=2, default=str))
+            await self._index_documents(self._approval_document(request))
             
             self.logger.info(f"Stored approval request: {approval_id}")
             return approval_id
@@ -417,64 +1217,251 @@ class ArtifactManager:
             self.logger.error(f"Failed to store approval request: {str(e)}")
             raise
     
-    async def cleanup_old_artifacts(self, days: int = None) -> Dict[str, Any]:
-        """Clean up old artifacts based on retention policy"""
+    async def load_approval_request(self, approval_id: str) -> Optional[Dict[str, Any]]:
+        """Load approval request"""
+        
+        try:
+            approval_path = self.storage_path / 'metadata' / f"approval_{approval_id}.json"
+            
+            if not approval_path.exists():
+                return None
+            
+            async with aiofiles.open(approval_path, 'r') as f:
+                return json.loads(await f.read())
+                
+        except Exception as e:
+            self.logger.error(f"Failed to load approval request {approval_id}: {str(e)}")
+            return None
+    
+    async def update_approval_request(self, approval_id: str, updates: Dict[str, Any]) -> bool:
+        """Merge updates (e.g. an approval decision) into a stored approval request"""
+        
+        request = await self.load_approval_request(approval_id)
+        if request is None:
+            return False
+        
+        try:
+            approval_path = self.storage_path / 'metadata' / f"approval_{approval_id}.json"
+            request.update(updates)
+            request['updated_at'] = datetime.utcnow().isoformat()
+            
+            async with aiofiles.open(approval_path, 'w') as f:
+                await f.write(json.dumps(request, indent=2, default=str))
+            await self._index_documents(self._approval_document(request))
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to update approval request {approval_id}: {str(e)}")
+            return False
+    
+    async def list_approval_requests(
+        self, 
+        execution_id: Optional[str] = None, 
+        status: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Approval requests in (created_at, id) order, optionally filtered by execution and status.
+        
+        Filtering and ordering use the documents index; only the returned requests are read.
+        """
+        
+        documents = await self.list_documents(
+            'approval', after, -1 if limit is None else limit,
+            execution_id=execution_id or None, status=status or None
+        )
+        requests = []
+        for document in documents:
+            request = await self.load_approval_request(document['id'])
+            if request is not None:
+                requests.append(request)
+        return requests
+    
+    async def store_parked_execution(self, execution_id: str, parked_state: Dict[str, Any]) -> bool:
+        """Store the checkpoint of an execution parked on approval gates"""
+        
+        try:
+            parked_path = self.storage_path / 'executions' / f"{execution_id}_parked.json"
+            tmp_path = parked_path.with_suffix('.tmp')
+            
+            async with aiofiles.open(tmp_path, 'w') as f:
+                await f.write(json.dumps(parked_state, default=str))
+            os.replace(tmp_path, parked_path)
+            await self._index_documents(self._execution_document(execution_id, parked_state))
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to store parked execution {execution_id}: {str(e)}")
+            raise
+    
+    async def load_parked_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Load a parked execution checkpoint"""
+        
+        try:
+            parked_path = self.storage_path / 'executions' / f"{execution_id}_parked.json"
+            
+            if not parked_path.exists():
+                return None
+            
+            async with aiofiles.open(parked_path, 'r') as f:
+                return json.loads(await f.read())
+                
+        except Exception as e:
+            self.logger.error(f"Failed to load parked execution {execution_id}: {str(e)}")
+            return None
+    
+    async def delete_parked_execution(self, execution_id: str) -> bool:
+        """Remove a parked execution checkpoint"""
+        
+        parked_path = self.storage_path / 'executions' / f"{execution_id}_parked.json"
+        try:
+            parked_path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+    
+    async def cleanup_old_artifacts(self, days: int = None, collect_garbage: bool = False) -> Dict[str, Any]:
+        """Clean up old artifacts based on retention policy.
+        
+        Expired artifacts are a prefix of the time-ordered index, so no timestamps
+        are parsed. Executions whose artifacts have all expired have their directory
+        removed in one go; index rows are deleted in batches of retention_batch_size,
+        paced to retention_max_deletes_per_second. Blobs released by the deletes go
+        with them; the full sweep for orphaned blobs runs only with ``collect_garbage``.
+        """
         
         days = days or self.retention_days
-        cutoff_date = datetime.utcnow().timestamp() - (days * 24 * 3600)
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        started = time.perf_counter()
         
         cleanup_stats = {
             'artifacts_deleted': 0,
             'bytes_freed': 0,
+            'executions_dropped': 0,
             'errors': []
         }
         
-        artifacts_to_delete = []
-        
-        for artifact in self.artifact_index.values():
-            artifact_date = datetime.fromisoformat(artifact.created_at).timestamp()
-            if artifact_date < cutoff_date:
-                artifacts_to_delete.append(artifact.id)
+        async with self._retention_lock:
+            expired = self._by_time[:bisect.bisect_left(self._by_time, (cutoff,))]
+            
+            # Group by execution, oldest first
+            by_execution: Dict[str, List[str]] = {}
+            for _, artifact_id in expired:
+                record = self.artifact_index.get(artifact_id)
+                if record is not None:
+                    by_execution.setdefault(record.execution_id, []).append(artifact_id)
+            
+            dropped = set()
+            batch: List[str] = []
+            for execution_id, artifact_ids in by_execution.items():
+                keys = self._by_execution.get(execution_id)
+                if keys and keys[-1][0] < cutoff:
+                    # Nothing in this execution survives: drop its directory instead of file by file
+                    execution_dir = self.storage_path / 'executions' / execution_id
+                    try:
+                        await asyncio.to_thread(shutil.rmtree, execution_dir, ignore_errors=True)
+                        dropped.add(execution_id)
+                        cleanup_stats['executions_dropped'] += 1
+                    except Exception as e:
+                        cleanup_stats['errors'].append(f"Failed to remove {execution_dir}: {str(e)}")
+                
+                batch.extend(artifact_ids)
+                while len(batch) >= self.retention_batch_size:
+                    await self._delete_retention_batch(batch[:self.retention_batch_size], dropped, cleanup_stats)
+                    batch = batch[self.retention_batch_size:]
+            if batch:
+                await self._delete_retention_batch(batch, dropped, cleanup_stats)
         
-        for artifact_id in artifacts_to_delete:
-            try:
-                artifact = self.artifact_index[artifact_id]
-                if await self.delete_artifact(artifact_id):
-                    cleanup_stats['artifacts_deleted'] += 1
-                    cleanup_stats['bytes_freed'] += artifact.size
-            except Exception as e:
-                cleanup_stats['errors'].append(f"Failed to delete {artifact_id}: {str(e)}")
+        await self.flush_access_times()
+        if collect_garbage:
+            cleanup_stats['orphaned_blobs_removed'] = await self.collect_garbage()
+        cleanup_stats['duration_seconds'] = round(time.perf_counter() - started, 3)
         
         self.logger.info(f"Cleanup completed: {cleanup_stats['artifacts_deleted']} artifacts deleted, "
                         f"{cleanup_stats['bytes_freed']} bytes freed")
         
         return cleanup_stats
     
+    async def _delete_retention_batch(self, artifact_ids: List[str], dropped: set, cleanup_stats: Dict[str, Any]):
+        """Delete one batch of expired artifacts in a single index transaction, then pace"""
+        
+        started = time.perf_counter()
+        records = [record for record in map(self.artifact_index.get, artifact_ids) if record is not None]
+        try:
+            # Files of dropped executions went with their directory
+            await asyncio.to_thread(
+                self._unlink_artifact_files, [record for record in records if record.execution_id not in dropped]
+            )
+            await self._materialize_dependents([record.id for record in records])
+            await self.index_store.delete_many([record.id for record in records], self.blob_store.unlink)
+        except Exception as e:
+            cleanup_stats['errors'].append(f"Failed to delete batch of {len(records)} artifacts: {str(e)}")
+            return
+        
+        for record in records:
+            self._index_remove(record.id)
+            cleanup_stats['artifacts_deleted'] += 1
+            cleanup_stats['bytes_freed'] += record.size
+        
+        if self.retention_max_deletes_per_second:
+            remaining = len(records) / self.retention_max_deletes_per_second - (time.perf_counter() - started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+    
+    async def start_retention_scheduler(self):
+        """Run cleanup_old_artifacts every retention_interval_seconds, the first time one interval from now"""
+        
+        if self._retention_task is None and self.retention_interval_seconds:
+            self._retention_task = asyncio.create_task(self._retention_loop())
+    
+    async def stop_retention_scheduler(self):
+        if self._retention_task is not None:
+            self._retention_task.cancel()
+            await asyncio.gather(self._retention_task, return_exceptions=True)
+            self._retention_task = None
+    
+    async def _retention_loop(self):
+        await self.start()
+        last_gc = time.monotonic()
+        while True:
+            await asyncio.sleep(self.retention_interval_seconds)
+            collect = bool(self.gc_interval_seconds) and time.monotonic() - last_gc >= self.gc_interval_seconds
+            try:
+                await self.cleanup_old_artifacts(collect_garbage=collect)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Scheduled artifact cleanup failed: {str(e)}")
+            if collect:
+                last_gc = time.monotonic()
+    
+    async def collect_garbage(self, min_age_seconds: float = 3600) -> int:
+        """Remove blob files no artifact references (left behind by interrupted stores).
+        Blobs released by deletes are removed immediately; recent files are skipped so
+        stores still writing their blob are not raced.
+        """
+        
+        candidates = await asyncio.to_thread(lambda: list(self.blob_store.iter_blobs(min_age_seconds)))
+        removed = await self.index_store.sweep_blobs(candidates, self.blob_store.unlink)
+        if removed:
+            self.logger.info(f"Removed {removed} unreferenced blobs")
+        return removed
+    
     async def get_storage_stats(self) -> Dict[str, Any]:
-        """Get storage statistics"""
-        
-        total_artifacts = len(self.artifact_index)
-        total_size = sum(artifact.size for artifact in self.artifact_index.values())
-        
-        # Group by type
-        type_stats = {}
-        for artifact in self.artifact_index.values():
-            if artifact.type not in type_stats:
-                type_stats[artifact.type] = {'count': 0, 'size': 0}
-            type_stats[artifact.type]['count'] += 1
-            type_stats[artifact.type]['size'] += artifact.size
-        
-        # Group by execution
-        execution_stats = {}
-        for artifact in self.artifact_index.values():
-            if artifact.execution_id not in execution_stats:
-                execution_stats[artifact.execution_id] = {'count': 0, 'size': 0}
-            execution_stats[artifact.execution_id]['count'] += 1
-            execution_stats[artifact.execution_id]['size'] += artifact.size
-
+        """Get storage statistics (maintained incrementally, no scan)"""
+        
+        stats = self.usage.stats()
         return {
-            'total_artifacts': total_artifacts,
-            'total_size': total_size,
-            'by_type': type_stats,
-            'by_execution': execution_stats,
+            'total_artifacts': stats['total_artifacts'],
+            'total_size': stats['total_size'],
+            'total_stored_size': stats['total_stored_size'],
+            'compression_enabled': self.compressor.enabled,
+            'max_storage_size': self.max_storage_size,
+            'storage_quota_policy': self.quota_policy,
+            'usage_ratio': round(stats['total_stored_size'] / self.max_storage_size, 4) if self.max_storage_size else None,
+            'evicted_artifacts': self.evicted_artifacts,
+            'by_type': stats['by_type'],
+            'by_execution': stats['by_execution'],
         }
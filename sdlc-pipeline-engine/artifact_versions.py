@@ -0,0 +1,56 @@
+"""
+Artifact Versions
+Line-based reverse deltas used to store older versions of regenerated artifacts
+"""
+
+import difflib
+import json
+from typing import List, Union
+
+# Codec recorded for artifacts whose content is held as a delta against the next version
+CODEC_DELTA = 'delta'
+
+
+def compute_delta(base: str, target: str) -> bytes:
+    """Instructions rebuilding ``target`` from ``base``.
+
+    Encoded as a JSON list whose items are either ``[start, end]`` (copy those
+    lines of ``base``) or a string (insert it verbatim). Versions of a
+    generated document share most lines, so the delta scales with the change.
+    """
+
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    ops: List[Union[List[int], str]] = []
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(target_lines[j1:j2]))
+    return json.dumps(ops, separators=(',', ':')).encode('utf-8')
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """Rebuild the target of :func:`compute_delta` from ``base``"""
+
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(delta):
+        parts.append(op if isinstance(op, str) else ''.join(base_lines[op[0]:op[1]]))
+    return ''.join(parts)
+
+
+def unified_diff(
+    old: str,
+    new: str,
+    old_label: str,
+    new_label: str,
+    context_lines: int = 3
+) -> str:
+    return ''.join(difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True), old_label, new_label, n=context_lines
+    ))
+
+
+__all__ = ['CODEC_DELTA', 'compute_delta', 'apply_delta', 'unified_diff']
@@ -0,0 +1,106 @@
+"""
+Blob Store
+Content-addressed artifact content stored once per SHA-256 under objects/
+"""
+
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterable, Iterator, Union
+
+import aiofiles
+
+
+class BlobStore:
+    """Blob files sharded as ``objects/<ab>/<cd>/<sha256>``.
+
+    Blobs are immutable and written atomically; reference counts live in the
+    artifact index, which decides when a blob may be removed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.logger = logging.getLogger(__name__)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, checksum: str) -> Path:
+        return self.root / checksum[:2] / checksum[2:4] / checksum
+
+    def exists(self, checksum: str) -> bool:
+        return self.path_for(checksum).exists()
+
+    async def write(self, checksum: str, data: Union[bytes, AsyncIterable[bytes]]) -> int:
+        """Write a blob (bytes or a stream of chunks) unless it is already present.
+        Returns the stored size in bytes.
+        """
+
+        path = self.path_for(checksum)
+        if path.exists():
+            return path.stat().st_size
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{checksum}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                if isinstance(data, (bytes, bytearray, memoryview)):
+                    await f.write(data)
+                else:
+                    async for chunk in data:
+                        await f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return path.stat().st_size
+
+    async def read(self, checksum: str) -> bytes:
+        async with aiofiles.open(self.path_for(checksum), 'rb') as f:
+            return await f.read()
+
+    async def read_head(self, checksum: str, size: int = 18) -> bytes:
+        """First bytes of a blob (enough to identify its codec)"""
+        async with aiofiles.open(self.path_for(checksum), 'rb') as f:
+            return await f.read(size)
+
+    def size(self, checksum: str) -> int:
+        return self.path_for(checksum).stat().st_size
+
+    def unlink(self, checksum: str):
+        try:
+            self.path_for(checksum).unlink()
+        except FileNotFoundError:
+            pass
+
+    def link(self, checksum: str, target: Path) -> bool:
+        """Expose a blob at ``target`` as a hard link (no extra space); False if unsupported"""
+
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                target.unlink()
+            os.link(self.path_for(checksum), target)
+            return True
+        except OSError as e:
+            self.logger.debug(f"Could not link blob {checksum} to {target}: {str(e)}")
+            return False
+
+    def iter_blobs(self, min_age_seconds: float = 0.0) -> Iterator[str]:
+        """Checksums of blob files on disk, skipping ones modified within ``min_age_seconds``"""
+
+        cutoff = time.time() - min_age_seconds
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for sub_shard in shard.iterdir():
+                if not sub_shard.is_dir():
+                    continue
+                with os.scandir(sub_shard) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.') or not entry.is_file():
+                            continue
+                        if entry.stat().st_mtime <= cutoff:
+                            yield entry.name
+
+
+__all__ = ['BlobStore']
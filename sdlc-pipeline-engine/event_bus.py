@@ -0,0 +1,196 @@
+"""
+Execution Event Bus
+In-process publish/subscribe stream of pipeline execution events
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Deque, Iterable, Optional, Set
+
+# Events published by SDLCPipelineOrchestrator
+EVENT_TYPES = ('stage_started', 'stage_completed', 'execution_status', 'approval_required')
+
+# Wakes a consumer blocked on an empty queue when its subscription closes
+_CLOSED = object()
+
+
+class EventSubscription:
+    """Bounded queue of events for one consumer; iterate with ``async for``.
+
+    Use as a context manager (or call :meth:`close`) to unsubscribe.
+    """
+
+    def __init__(
+        self,
+        bus: 'ExecutionEventBus',
+        execution_id: Optional[str],
+        event_types: Optional[Iterable[str]],
+        max_queue_size: int,
+        overflow: str
+    ):
+        self.bus = bus
+        self.execution_id = execution_id
+        self.event_types = frozenset(event_types) if event_types else None
+        self.overflow = overflow
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        # Events discarded because this consumer fell behind
+        self.dropped = 0
+        self.closed = False
+        # 'block' overflow: events waiting for queue space, delivered in order by _drain
+        self._backlog: Optional[Deque[Dict[str, Any]]] = None
+        self._drain_task: Optional[asyncio.Task] = None
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return self.event_types is None or event['event'] in self.event_types
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """Next event, or None once the subscription is closed"""
+
+        if self.closed and self.queue.empty():
+            return None
+        event = await self.queue.get()
+        return None if event is _CLOSED else event
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.bus._unsubscribe(self)
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSED)
+
+    def _offer(self, event: Dict[str, Any], timeout: float):
+        """Queue an event without ever making the publisher wait"""
+
+        if self.closed:
+            return
+        if self._backlog is None and not self.queue.full():
+            self.queue.put_nowait(event)
+            return
+
+        # 'block': hold events for a slow consumer for up to ``timeout`` each, off the publisher's path
+        if self.overflow == 'block' and timeout > 0:
+            if self._backlog is None:
+                self._backlog = deque()
+                self._drain_task = asyncio.create_task(self._drain(timeout))
+            if len(self._backlog) >= self.queue.maxsize:
+                self._backlog.popleft()
+                self.dropped += 1
+            self._backlog.append(event)
+            return
+
+        self._put_dropping_oldest(event)
+
+    async def _drain(self, timeout: float):
+        try:
+            while self._backlog and not self.closed:
+                event = self._backlog[0]
+                try:
+                    await asyncio.wait_for(self.queue.put(event), timeout=timeout)
+                except asyncio.TimeoutError:
+                    self._put_dropping_oldest(event)
+                if self._backlog and self._backlog[0] is event:
+                    self._backlog.popleft()
+        finally:
+            self._backlog = None
+            self._drain_task = None
+
+    def _put_dropping_oldest(self, event: Dict[str, Any]):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    def __enter__(self) -> 'EventSubscription':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __aiter__(self) -> 'EventSubscription':
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class ExecutionEventBus:
+    """Fans execution events out to subscribers filtered by execution id and event type"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+        self.max_queue_size = config.get('max_queue_size', 1000)
+        # Publishers never wait on subscribers. 'drop_oldest': a full queue drops its oldest
+        # event; 'block': overflow is held for up to publish_timeout_seconds per event for the
+        # consumer to catch up, then the oldest event is dropped
+        self.overflow = config.get('overflow', 'drop_oldest')
+        self.publish_timeout_seconds = config.get('publish_timeout_seconds', 1.0)
+
+        # execution_id (None = all executions) -> subscriptions
+        self._subscriptions: Dict[Optional[str], Set[EventSubscription]] = {}
+
+    def subscribe(
+        self,
+        execution_id: Optional[str] = None,
+        event_types: Optional[Iterable[str]] = None,
+        max_queue_size: Optional[int] = None,
+        overflow: Optional[str] = None
+    ) -> EventSubscription:
+        """Subscribe to events of one execution (or all executions when execution_id is None)"""
+
+        subscription = EventSubscription(
+            self,
+            execution_id,
+            event_types,
+            max_queue_size or self.max_queue_size,
+            overflow or self.overflow
+        )
+        self._subscriptions.setdefault(execution_id, set()).add(subscription)
+        return subscription
+
+    async def publish(self, event_type: str, execution_id: str, **data: Any):
+        """Deliver an event to every matching subscriber without waiting for any of them"""
+
+        targets = [
+            subscription
+            for key in (execution_id, None)
+            for subscription in self._subscriptions.get(key, ())
+        ]
+        if not targets:
+            return
+
+        event = {
+            'event': event_type,
+            'execution_id': execution_id,
+            'timestamp': datetime.utcnow().isoformat(),
+            **data
+        }
+
+        for subscription in targets:
+            if subscription.matches(event):
+                subscription._offer(event, self.publish_timeout_seconds)
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def _unsubscribe(self, subscription: EventSubscription):
+        subscriptions = self._subscriptions.get(subscription.execution_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.execution_id]
+
+
+__all__ = ['ExecutionEventBus', 'EventSubscription', 'EVENT_TYPES']
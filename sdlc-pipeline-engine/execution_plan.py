@@ -0,0 +1,159 @@
+"""
+Execution Plan
+Precompiled view of a pipeline definition shared by all its executions
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+# Keys added by ArtifactManager.store_pipeline_definition that do not change the pipeline
+_STORAGE_KEYS = ('id', 'stored_at')
+
+
+def hash_pipeline_definition(pipeline_def: Dict[str, Any]) -> str:
+    """Content hash of a pipeline definition, ignoring storage metadata"""
+
+    content = {k: v for k, v in pipeline_def.items() if k not in _STORAGE_KEYS}
+    encoded = json.dumps(content, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def build_execution_levels(stages: Sequence[Any]) -> List[List[Any]]:
+    """Group stages into dependency levels (Kahn's algorithm, O(stages + edges)).
+    Stages within a level keep their definition order.
+    """
+
+    index = {stage.stage_id: i for i, stage in enumerate(stages)}
+    remaining = [0] * len(stages)
+    dependents: List[List[int]] = [[] for _ in stages]
+
+    for i, stage in enumerate(stages):
+        for dep in set(stage.dependencies):
+            if dep not in index:
+                raise ValueError(f"Invalid dependency: {dep}")
+            remaining[i] += 1
+            dependents[index[dep]].append(i)
+
+    levels: List[List[Any]] = []
+    current = [i for i, count in enumerate(remaining) if count == 0]
+    scheduled = 0
+
+    while current:
+        levels.append([stages[i] for i in current])
+        scheduled += len(current)
+        following = []
+        for i in current:
+            for j in dependents[i]:
+                remaining[j] -= 1
+                if remaining[j] == 0:
+                    following.append(j)
+        current = sorted(following)
+
+    if scheduled < len(stages):
+        raise ValueError("Circular dependency detected in pipeline stages")
+
+    return levels
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Compiled pipeline: stage objects, dependency indexes and execution levels.
+
+    The plan's fields cannot be reassigned, but ``definition`` and the stage
+    objects are shared with every execution of the plan rather than copied;
+    callers must treat them as read-only.
+    """
+
+    content_hash: str
+    definition: Dict[str, Any]
+    stages: Tuple[Any, ...]
+    stage_index: Mapping[str, int]
+    dependency_index: Tuple[Tuple[int, ...], ...]
+    dependents: Mapping[str, Tuple[str, ...]]
+    levels: Tuple[Tuple[Any, ...], ...]
+
+    @property
+    def version(self) -> str:
+        return self.definition.get("version", "1.0")
+
+    def stage(self, stage_id: str) -> Any:
+        return self.stages[self.stage_index[stage_id]]
+
+    def critical_path(self, durations: Mapping[str, float]) -> Dict[str, Any]:
+        """Longest dependency chain by stage duration, plus per-stage slack.
+
+        Slack is how long a stage could have taken longer without delaying the
+        pipeline; stages on the critical path have zero slack. Stages missing
+        from ``durations`` (not run) count as zero.
+        """
+
+        order = [self.stage_index[stage.stage_id] for level in self.levels for stage in level]
+        duration = [float(durations.get(stage.stage_id) or 0.0) for stage in self.stages]
+        earliest_finish = [0.0] * len(self.stages)
+
+        for i in order:
+            deps = self.dependency_index[i]
+            start = max((earliest_finish[d] for d in deps), default=0.0)
+            earliest_finish[i] = start + duration[i]
+
+        total = max(earliest_finish, default=0.0)
+        latest_finish = [total] * len(self.stages)
+        for i in reversed(order):
+            for dependent in self.dependents[self.stages[i].stage_id]:
+                j = self.stage_index[dependent]
+                latest_finish[i] = min(latest_finish[i], latest_finish[j] - duration[j])
+
+        path: List[str] = []
+        if order:
+            current = max(order, key=lambda i: earliest_finish[i])
+            while current is not None:
+                path.append(self.stages[current].stage_id)
+                start = earliest_finish[current] - duration[current]
+                current = next(
+                    (d for d in self.dependency_index[current] if abs(earliest_finish[d] - start) < 1e-9),
+                    None
+                )
+            path.reverse()
+
+        return {
+            'stages': path,
+            'duration': round(total, 6),
+            'slack': {
+                stage.stage_id: round(max(0.0, latest_finish[i] - earliest_finish[i]), 6)
+                for i, stage in enumerate(self.stages)
+            }
+        }
+
+    @classmethod
+    def compile(cls, pipeline_def: Dict[str, Any], stages: Sequence[Any], content_hash: str = None) -> 'ExecutionPlan':
+        """Build a plan from already constructed stage objects"""
+
+        stages = tuple(stages)
+        levels = tuple(tuple(level) for level in build_execution_levels(stages))
+        stage_index = {stage.stage_id: i for i, stage in enumerate(stages)}
+
+        dependency_index = tuple(
+            tuple(stage_index[dep] for dep in stage.dependencies)
+            for stage in stages
+        )
+
+        dependents: Dict[str, List[str]] = {stage.stage_id: [] for stage in stages}
+        for stage in stages:
+            for dep in dict.fromkeys(stage.dependencies):
+                dependents[dep].append(stage.stage_id)
+
+        return cls(
+            content_hash=content_hash or hash_pipeline_definition(pipeline_def),
+            definition=pipeline_def,
+            stages=stages,
+            stage_index=MappingProxyType(stage_index),
+            dependency_index=dependency_index,
+            dependents=MappingProxyType({k: tuple(v) for k, v in dependents.items()}),
+            levels=levels
+        )
+
+
+__all__ = ['ExecutionPlan', 'build_execution_levels', 'hash_pipeline_definition']
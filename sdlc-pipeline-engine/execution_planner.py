@@ -0,0 +1,282 @@
+"""
+Execution Planner
+Per-stage usage history and dry-run estimates of tokens, cost, duration and provider quota use
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import aiofiles
+
+# Aggregated per stage; means are derived from these sums and 'samples'
+_STAT_FIELDS = ('stage_seconds', 'provider_seconds', 'provider_calls', 'input_tokens', 'output_tokens')
+
+
+class StageStatistics:
+    """Running usage totals per (pipeline, stage), persisted to a JSON file.
+
+    Fed from each finished stage's timings (see stage_profiler); read by
+    ExecutionPlanner to predict future runs. Totals are updated in memory and
+    written once ``flush_batch`` records have accumulated or
+    ``flush_interval_seconds`` after the first unwritten one, whichever is
+    sooner; :meth:`close` writes what is left.
+    """
+
+    def __init__(self, path: Path, flush_batch: int = 64, flush_interval_seconds: float = 30.0):
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+        self.flush_batch = max(1, flush_batch)
+        self.flush_interval_seconds = flush_interval_seconds
+        # pipeline_id -> stage_id -> totals
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        # Records not yet written, the pending timed flush, and ordering of file writes
+        self._dirty = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    async def record(self, pipeline_id: str, stage_id: str, execution_time: float, timings: Dict[str, Any]):
+        """Add one finished stage attempt to the history"""
+
+        counters = timings.get('counters', {})
+        sample = {
+            'stage_seconds': execution_time or 0.0,
+            'provider_seconds': timings.get('phases', {}).get('provider_call', 0.0),
+            'provider_calls': counters.get('provider_calls', 0),
+            'input_tokens': counters.get('input_tokens', 0),
+            'output_tokens': counters.get('output_tokens', 0)
+        }
+
+        async with self._lock:
+            await self._ensure_loaded()
+            totals = self._stats.setdefault(pipeline_id, {}).setdefault(
+                stage_id, {'samples': 0, **{field: 0 for field in _STAT_FIELDS}}
+            )
+            totals['samples'] += 1
+            for field in _STAT_FIELDS:
+                totals[field] += sample[field]
+            self._dirty += 1
+
+        if self._dirty >= self.flush_batch:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def get(self, pipeline_id: str, stage_id: str) -> Optional[Dict[str, float]]:
+        """Per-run means for a stage, or None without history"""
+
+        async with self._lock:
+            await self._ensure_loaded()
+            totals = self._stats.get(pipeline_id, {}).get(stage_id)
+        if not totals or not totals['samples']:
+            return None
+        samples = totals['samples']
+        return {'samples': samples, **{field: totals[field] / samples for field in _STAT_FIELDS}}
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            async with aiofiles.open(self.path, 'r') as f:
+                self._stats = json.loads(await f.read())
+        except Exception as e:
+            self.logger.error(f"Failed to load stage statistics from {self.path}: {str(e)}")
+
+    async def flush(self):
+        """Write the totals if records were added since the last write"""
+
+        async with self._write_lock:
+            async with self._lock:
+                if not self._dirty:
+                    return
+                payload = json.dumps(self._stats)
+                self._dirty = 0
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_suffix('.tmp')
+            async with aiofiles.open(tmp_file, 'w') as f:
+                await f.write(payload)
+            os.replace(tmp_file, self.path)
+
+    async def close(self):
+        """Cancel the timed flush and write outstanding totals"""
+
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval_seconds)
+        try:
+            await self.flush()
+        except Exception as e:
+            self.logger.error(f"Failed to write stage statistics to {self.path}: {str(e)}")
+
+
+class ExecutionPlanner:
+    """Turns rendered prompt sizes and stage history into run estimates.
+
+    Token counts are estimated locally (``chars_per_token``); without history a
+    stage is assumed to produce ``default_output_tokens`` per call at
+    ``default_tokens_per_second``. ``pricing`` is keyed by model name with
+    ``input_per_1k_tokens``/``output_per_1k_tokens``; ``quotas`` by model or
+    provider name with ``requests_per_minute``/``tokens_per_minute``.
+    """
+
+    def __init__(self, config: Dict[str, Any], statistics: StageStatistics):
+        self.config = config
+        self.statistics = statistics
+
+        self.chars_per_token = config.get('chars_per_token', 4.0)
+        self.default_output_tokens = config.get('default_output_tokens', 1000)
+        self.default_tokens_per_second = config.get('default_tokens_per_second', 50.0)
+        self.pricing = config.get('pricing', {})
+        self.quotas = config.get('quotas', {})
+
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text or '') / self.chars_per_token)
+
+    async def estimate_stage(
+        self,
+        pipeline_id: str,
+        stage_id: str,
+        prompt_tokens: List[int],
+        upstream_tokens: int,
+        provider: str,
+        model: str,
+        max_tokens: int,
+        parallelism: int = 1,
+        reduce_call: bool = False
+    ) -> Dict[str, Any]:
+        """Estimate one stage from the token size of each prompt it will send"""
+
+        history = await self.statistics.get(pipeline_id, stage_id)
+        calls = len(prompt_tokens)
+
+        if history and history['provider_calls']:
+            output_per_call = history['output_tokens'] / history['provider_calls']
+            seconds_per_call = history['provider_seconds'] / history['provider_calls']
+            overhead = max(0.0, history['stage_seconds'] - history['provider_seconds'])
+        else:
+            output_per_call = min(max_tokens, self.default_output_tokens)
+            seconds_per_call = output_per_call / self.default_tokens_per_second
+            overhead = 0.0
+
+        input_tokens = sum(prompt_tokens) + upstream_tokens * calls
+        output_tokens = output_per_call * calls
+        waves = math.ceil(calls / max(1, parallelism)) if calls else 0
+
+        if reduce_call:
+            # The reduce prompt carries the item outputs
+            input_tokens += output_tokens
+            output_tokens += output_per_call
+            calls += 1
+            waves += 1
+
+        return {
+            'stage_id': stage_id,
+            'provider': provider,
+            'model': model,
+            'provider_calls': calls,
+            'input_tokens': int(input_tokens),
+            'output_tokens': int(round(output_tokens)),
+            'duration_seconds': round(waves * seconds_per_call + overhead, 3),
+            'cost': self.cost(model, input_tokens, output_tokens),
+            'history_samples': history['samples'] if history else 0
+        }
+
+    def cost(self, model: str, input_tokens: float, output_tokens: float) -> Optional[float]:
+        prices = self.pricing.get(model)
+        if not prices:
+            return None
+        return round(
+            input_tokens / 1000 * prices.get('input_per_1k_tokens', 0.0)
+            + output_tokens / 1000 * prices.get('output_per_1k_tokens', 0.0),
+            6
+        )
+
+    def summarize(
+        self,
+        stage_estimates: Dict[str, Dict[str, Any]],
+        critical_path: Dict[str, Any],
+        executions: int = 1,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Totals for ``executions`` runs, wall-clock time and projected quota use"""
+
+        executions = max(1, executions)
+        concurrency = max(1, min(max_concurrency or executions, executions))
+        run_seconds = critical_path['duration']
+        wall_clock = math.ceil(executions / concurrency) * run_seconds
+
+        costs = [estimate['cost'] for estimate in stage_estimates.values()]
+        per_execution = {
+            'provider_calls': sum(e['provider_calls'] for e in stage_estimates.values()),
+            'input_tokens': sum(e['input_tokens'] for e in stage_estimates.values()),
+            'output_tokens': sum(e['output_tokens'] for e in stage_estimates.values()),
+            'cost': round(sum(c for c in costs if c is not None), 6),
+            'duration_seconds': run_seconds
+        }
+
+        # Usage per model; rates assume `concurrency` executions overlapping for a full run
+        by_model: Dict[str, Dict[str, Any]] = {}
+        for estimate in stage_estimates.values():
+            if not estimate['provider_calls']:
+                continue
+            usage = by_model.setdefault(estimate['model'], {
+                'provider': estimate['provider'], 'requests': 0, 'tokens': 0
+            })
+            usage['requests'] += estimate['provider_calls'] * executions
+            usage['tokens'] += (estimate['input_tokens'] + estimate['output_tokens']) * executions
+
+        quota = {}
+        minutes = max(wall_clock / 60.0, 1e-9)
+        for model, usage in by_model.items():
+            limits = self.quotas.get(model) or self.quotas.get(usage['provider']) or {}
+            entry = {
+                **usage,
+                'requests_per_minute': round(usage['requests'] / minutes, 2),
+                'tokens_per_minute': round(usage['tokens'] / minutes, 2)
+            }
+            # Shortest run that stays within each configured limit
+            floors = []
+            for metric, total in (('requests_per_minute', usage['requests']), ('tokens_per_minute', usage['tokens'])):
+                limit = limits.get(metric)
+                if limit:
+                    entry[f"{metric}_limit"] = limit
+                    floors.append(total / limit * 60.0)
+            if floors:
+                entry['min_duration_seconds'] = round(max(floors), 3)
+                entry['within_quota'] = max(floors) <= wall_clock
+            quota[model] = entry
+
+        return {
+            'per_execution': per_execution,
+            'executions': executions,
+            'max_concurrency': concurrency,
+            'total': {
+                'provider_calls': per_execution['provider_calls'] * executions,
+                'input_tokens': per_execution['input_tokens'] * executions,
+                'output_tokens': per_execution['output_tokens'] * executions,
+                'cost': round(per_execution['cost'] * executions, 6),
+                'unpriced_models': sorted({e['model'] for e in stage_estimates.values() if e['cost'] is None and e['provider_calls']})
+            },
+            'estimated_wall_clock_seconds': round(max(
+                [wall_clock] + [entry.get('min_duration_seconds', 0.0) for entry in quota.values()]
+            ), 3),
+            'quota': quota
+        }
+
+
+__all__ = ['StageStatistics', 'ExecutionPlanner']
@@ -0,0 +1,324 @@
+"""
+Prompt Catalog
+Indexes externalized prompt files from the sdlc-pipeline repository in memory
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Map StageType values to their directory in the sdlc-pipeline repository
+STAGE_DIRECTORIES = {
+    'planning': '1-planning',
+    'requirements': '2-requirements',
+    'design': '3-design',
+    'implementation': '4-implementation',
+    'testing': '5-testing',
+    'deployment': '6-deployment',
+    'maintenance': '7-maintenance',
+}
+
+PROMPT_EXTENSIONS = ('.md', '.txt', '.yaml', '.yml')
+
+
+class PromptCatalog:
+    """In-memory catalog of prompt files keyed by logical, stage-qualified and relative keys.
+
+    The catalog scans ``{base_dir}/*/prompts`` once and keeps file contents in memory.
+    Changes on disk are picked up by a periodic mtime check so that lookups stay a
+    single dictionary access instead of a series of filesystem probes. Inside a running
+    event loop the periodic rescan runs on a worker thread while lookups keep serving
+    the previous contents.
+    """
+
+    def __init__(self, base_dir: Optional[str], refresh_interval_seconds: float = 30.0):
+        self.logger = logging.getLogger(__name__)
+        self.base_dir = Path(base_dir).resolve() if base_dir else None
+        self.refresh_interval_seconds = refresh_interval_seconds
+
+        # path -> (mtime_ns, size, content)
+        self._files: Dict[Path, Tuple[int, int, str]] = {}
+        # lookup key -> path
+        self._keys: Dict[str, Path] = {}
+        # Files outside the catalog resolved on demand (absolute or engine-relative specs)
+        self._external: Dict[str, Path] = {}
+        self._last_refresh = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Incremented whenever the catalog contents change
+        self.generation = 0
+
+        self.refresh()
+
+    def resolve(self, prompt_spec: str, stage_type: str) -> str:
+        """Return prompt content for a spec, raising if it does not name a known prompt file"""
+
+        if not prompt_spec:
+            raise ValueError("Empty prompt_spec")
+
+        spec = prompt_spec.strip()
+        if spec.lower().startswith("file:"):
+            spec = spec[5:].strip()
+
+        self._maybe_refresh()
+
+        stage_dir = STAGE_DIRECTORIES.get(stage_type, stage_type)
+        normalized = spec.replace('\\', '/')
+        for key in (f"{stage_dir}:{normalized}", normalized):
+            path = self._keys.get(key)
+            if path is not None:
+                return self._files[path][2]
+
+        path = self._external.get(spec)
+        if path is not None and path in self._files:
+            return self._files[path][2]
+
+        # Absolute paths and paths relative to the engine directory are not part of the
+        # scanned tree; probe them once and keep them under the same mtime refresh.
+        candidate = self._find_external(spec)
+        if candidate is not None:
+            self._files[candidate] = self._read_file(candidate)
+            self._external[spec] = candidate
+            return self._files[candidate][2]
+
+        raise FileNotFoundError(f"No prompt file found for spec '{prompt_spec}'")
+
+    def handle(self, prompt_spec: str, stage_type: str) -> 'PromptHandle':
+        """Return a reusable handle for a stage prompt spec"""
+        return PromptHandle(self, prompt_spec, stage_type)
+
+    def refresh(self):
+        """Rescan prompt directories, re-reading only files whose mtime or size changed"""
+
+        self._last_refresh = time.monotonic()
+        self._apply_scan(self._scan(dict(self._files), list(self._external.values())))
+
+    async def refresh_async(self):
+        """Like refresh(), with the rescan and file reads on a worker thread"""
+
+        self._last_refresh = time.monotonic()
+        files = await asyncio.to_thread(self._scan, dict(self._files), list(self._external.values()))
+        self._apply_scan(files)
+
+    def _scan(
+        self,
+        files: Dict[Path, Tuple[int, int, str]],
+        external: List[Path]
+    ) -> Optional[Dict[Path, Tuple[int, int, str]]]:
+        """Return the updated file table, or None when nothing changed (touches only its arguments)"""
+
+        seen: Dict[Path, Tuple[int, int]] = {}
+
+        if self.base_dir and self.base_dir.is_dir():
+            for stage_entry in self._scandir(self.base_dir):
+                if not stage_entry.is_dir():
+                    continue
+                prompts_dir = Path(stage_entry.path) / 'prompts'
+                if prompts_dir.is_dir():
+                    self._collect_files(prompts_dir, seen)
+
+        for path in external:
+            try:
+                stat = path.stat()
+                seen[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+
+        changed = False
+        for path in list(files):
+            if path not in seen:
+                del files[path]
+                changed = True
+
+        for path, (mtime_ns, size) in seen.items():
+            cached = files.get(path)
+            if cached is None or cached[0] != mtime_ns or cached[1] != size:
+                files[path] = self._read_file(path)
+                changed = True
+
+        return files if changed else None
+
+    def _apply_scan(self, files: Optional[Dict[Path, Tuple[int, int, str]]]):
+        if files is None:
+            return
+        self._files = files
+        self.generation += 1
+        self._rebuild_keys()
+        self._external = {spec: path for spec, path in self._external.items() if path in self._files}
+        self.logger.debug(f"Prompt catalog refreshed: {len(self._files)} files")
+
+    def _maybe_refresh(self):
+        if self.refresh_interval_seconds is None or self.refresh_interval_seconds < 0:
+            return
+        if self._refresh_task is not None or time.monotonic() - self._last_refresh < self.refresh_interval_seconds:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.refresh()
+            return
+
+        # Keep the event loop free of directory scans; lookups see the new contents once it lands
+        self._last_refresh = time.monotonic()
+        self._refresh_task = loop.create_task(self.refresh_async())
+        self._refresh_task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task):
+        self._refresh_task = None
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning(f"Prompt catalog refresh failed: {task.exception()}")
+
+    def _collect_files(self, directory: Path, seen: Dict[Path, Tuple[int, int]]):
+        for entry in self._scandir(directory):
+            if entry.is_dir():
+                self._collect_files(Path(entry.path), seen)
+            elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in PROMPT_EXTENSIONS:
+                stat = entry.stat()
+                seen[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+
+    def _scandir(self, directory: Path) -> List[os.DirEntry]:
+        try:
+            with os.scandir(directory) as it:
+                return sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            self.logger.warning(f"Failed to scan prompt directory {directory}: {e}")
+            return []
+
+    def _read_file(self, path: Path) -> Tuple[int, int, str]:
+        try:
+            content = path.read_text(encoding='utf-8')
+        except UnicodeDecodeError:
+            content = path.read_text()
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size, content)
+
+    def _rebuild_keys(self):
+        """Rebuild the lookup table for all scanned files"""
+
+        keys: Dict[str, Path] = {}
+        if not self.base_dir:
+            self._keys = keys
+            return
+
+        # Register .md before .txt/.yaml so that logical keys prefer markdown prompts,
+        # matching the previous candidate order.
+        def sort_key(p: Path):
+            suffix = p.suffix.lower()
+            return (PROMPT_EXTENSIONS.index(suffix) if suffix in PROMPT_EXTENSIONS else len(PROMPT_EXTENSIONS), str(p))
+
+        for path in sorted(self._files, key=sort_key):
+            try:
+                relative = path.relative_to(self.base_dir)
+            except ValueError:
+                continue
+            parts = relative.parts
+            if len(parts) < 3 or parts[1] != 'prompts':
+                continue
+
+            stage_dir = parts[0]
+            in_prompts = Path(*parts[2:]).as_posix()
+            logical = in_prompts[: -len(path.suffix)] if path.suffix else in_prompts
+
+            for key in (
+                relative.as_posix(),
+                f"{stage_dir}/{in_prompts}",
+                f"{stage_dir}/{logical}",
+                f"{stage_dir}:{in_prompts}",
+                f"{stage_dir}:{logical}",
+            ):
+                keys.setdefault(key, path)
+
+        self._keys = keys
+
+    def _find_external(self, spec: str) -> Optional[Path]:
+        p = Path(spec)
+        if '\n' in spec or p.suffix.lower() not in PROMPT_EXTENSIONS:
+            return None
+        if p.is_absolute():
+            candidates = [p]
+        else:
+            candidates = [self.base_dir / p] if self.base_dir else []
+            candidates.append(Path(__file__).resolve().parent / p)
+        for candidate in candidates:
+            candidate = candidate.resolve()
+            if candidate.is_file():
+                return candidate
+        return None
+
+
+class PromptHandle:
+    """Resolved prompt reference that caches its compiled Jinja template.
+
+    The handle re-resolves only when the catalog generation changes, so repeated
+    executions of a stage reuse one template object.
+    """
+
+    __slots__ = (
+        'catalog', 'prompt_spec', 'stage_type',
+        '_generation', '_content', '_template', '_variables', '_error'
+    )
+
+    def __init__(self, catalog: PromptCatalog, prompt_spec: str, stage_type: str):
+        self.catalog = catalog
+        self.prompt_spec = prompt_spec or ""
+        self.stage_type = stage_type
+        self._generation = -1
+        self._content: Optional[str] = None
+        self._template: Any = None
+        self._variables: Optional[FrozenSet[str]] = None
+        self._error: Optional[Exception] = None
+
+    @property
+    def content(self) -> str:
+        """Prompt content; falls back to the spec itself as an inline template"""
+        self._ensure_resolved()
+        return self._content
+
+    @property
+    def resolution_error(self) -> Optional[Exception]:
+        """Error raised while resolving the spec as a prompt file, if any"""
+        self._ensure_resolved()
+        return self._error
+
+    def template(self):
+        """Compiled Jinja template for the prompt content"""
+        self._ensure_resolved()
+        if self._template is None:
+            import jinja2
+            self._template = jinja2.Template(self._content)
+        return self._template
+
+    @property
+    def variables(self) -> FrozenSet[str]:
+        """Top-level variables the template references (jinja2.meta static analysis)"""
+        template = self.template()
+        if self._variables is None:
+            from jinja2 import meta
+            ast = template.environment.parse(self._content)
+            self._variables = frozenset(meta.find_undeclared_variables(ast))
+        return self._variables
+
+    def _ensure_resolved(self):
+        self.catalog._maybe_refresh()
+        if self._generation == self.catalog.generation:
+            return
+
+        try:
+            content = self.catalog.resolve(self.prompt_spec, self.stage_type)
+            error = None
+        except Exception as e:
+            content = self.prompt_spec
+            error = e
+
+        self._generation = self.catalog.generation
+        self._error = error
+        if content is not self._content:
+            self._content = content
+            self._template = None
+            self._variables = None
+
+
+__all__ = ['PromptCatalog', 'PromptHandle', 'STAGE_DIRECTORIES']
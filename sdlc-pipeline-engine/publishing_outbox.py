@@ -0,0 +1,202 @@
+"""
+Publishing Outbox
+Durable write-behind queue for publishing stage artifacts to external repositories
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Awaitable, Callable, Optional, Set
+
+import aiofiles
+
+
+class PublishingOutbox:
+    """Persists publishing jobs to disk and works them off in the background with retries.
+
+    Jobs are JSON files under ``{path}/pending``; a job is removed once its handler
+    succeeds and moved to ``{path}/failed`` after its last attempt. Pending jobs left
+    behind by a previous process are picked up again by :meth:`start`.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        path: Path,
+        handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+        on_failed: Optional[Callable[[Dict[str, Any], Exception], Awaitable[None]]] = None
+    ):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+        self.path = Path(path)
+        self.pending_path = self.path / 'pending'
+        self.failed_path = self.path / 'failed'
+
+        self.handler = handler
+        self.on_failed = on_failed
+
+        self.workers = config.get('workers', 4)
+        self.max_attempts = config.get('max_attempts', 5)
+        self.retry_delay_seconds = config.get('retry_delay_seconds', 5)
+        self.backoff_multiplier = config.get('backoff_multiplier', 2.0)
+        self.max_delay_seconds = config.get('max_delay_seconds', 300)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks = []
+        self._outstanding: Set[str] = set()
+        self._idle: Optional[asyncio.Event] = None
+        self._started = False
+
+    async def start(self):
+        """Start workers and requeue jobs persisted by a previous run"""
+
+        if self._started:
+            return
+        self._started = True
+
+        self.pending_path.mkdir(parents=True, exist_ok=True)
+        self.failed_path.mkdir(parents=True, exist_ok=True)
+
+        self._queue = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+        recovered = 0
+        for job_file in sorted(self.pending_path.glob('*.json')):
+            try:
+                async with aiofiles.open(job_file, 'r') as f:
+                    job = json.loads(await f.read())
+                self._track(job)
+                self._queue.put_nowait(job)
+                recovered += 1
+            except Exception as e:
+                self.logger.error(f"Failed to recover outbox job {job_file.name}: {str(e)}")
+
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+        if recovered:
+            self.logger.info(f"Recovered {recovered} pending publishing jobs")
+
+    async def enqueue(self, payload: Dict[str, Any]) -> str:
+        """Persist a publishing job and schedule it; returns the job id"""
+
+        await self.start()
+
+        job = {
+            'job_id': str(uuid.uuid4()),
+            'created_at': datetime.utcnow().isoformat(),
+            'attempts': 0,
+            'next_attempt_at': 0.0,
+            'last_error': None,
+            **payload
+        }
+
+        await self._persist(job)
+        self._track(job)
+        self._queue.put_nowait(job)
+        return job['job_id']
+
+    async def join(self):
+        """Wait until every outstanding job has succeeded or failed permanently"""
+
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def stop(self):
+        """Stop workers; persisted jobs resume on the next start"""
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._started = False
+
+    @property
+    def outstanding_count(self) -> int:
+        return len(self._outstanding)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Outbox worker error for job {job.get('job_id')}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job: Dict[str, Any]):
+        # Recovered jobs may still be backing off
+        wait = job.get('next_attempt_at', 0.0) - time.time()
+        if wait > 0:
+            asyncio.get_running_loop().call_later(wait, self._queue.put_nowait, job)
+            return
+
+        job['attempts'] += 1
+        try:
+            await self.handler(job)
+        except Exception as e:
+            job['last_error'] = str(e)
+            if job['attempts'] >= self.max_attempts:
+                self.logger.error(
+                    f"Publishing job {job['job_id']} failed after {job['attempts']} attempts: {str(e)}"
+                )
+                await self._move_to_failed(job)
+                self._untrack(job)
+                if self.on_failed:
+                    await self.on_failed(job, e)
+                return
+
+            delay = min(
+                self.retry_delay_seconds * (self.backoff_multiplier ** (job['attempts'] - 1)),
+                self.max_delay_seconds
+            )
+            job['next_attempt_at'] = time.time() + delay
+            await self._persist(job)
+            self.logger.warning(
+                f"Publishing job {job['job_id']} attempt {job['attempts']} failed: {str(e)}; retrying in {delay:.0f}s"
+            )
+            asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, job)
+            return
+
+        self._remove(job)
+        self._untrack(job)
+
+    async def _persist(self, job: Dict[str, Any]):
+        job_file = self.pending_path / f"{job['job_id']}.json"
+        tmp_file = job_file.with_suffix('.tmp')
+        async with aiofiles.open(tmp_file, 'w') as f:
+            await f.write(json.dumps(job, default=str))
+        os.replace(tmp_file, job_file)
+
+    async def _move_to_failed(self, job: Dict[str, Any]):
+        failed_file = self.failed_path / f"{job['job_id']}.json"
+        async with aiofiles.open(failed_file, 'w') as f:
+            await f.write(json.dumps(job, indent=2, default=str))
+        self._remove(job)
+
+    def _remove(self, job: Dict[str, Any]):
+        try:
+            (self.pending_path / f"{job['job_id']}.json").unlink()
+        except FileNotFoundError:
+            pass
+
+    def _track(self, job: Dict[str, Any]):
+        self._outstanding.add(job['job_id'])
+        self._idle.clear()
+
+    def _untrack(self, job: Dict[str, Any]):
+        self._outstanding.discard(job['job_id'])
+        if not self._outstanding:
+            self._idle.set()
+
+
+__all__ = ['PublishingOutbox']
@@ -14,6 +14,7 @@ from typing import Dict, Any
 
 # Import orchestrator from package
 from sdlc_pipeline_engine.pipeline_orchestrator import SDLCPipelineOrchestrator
+from sdlc_pipeline_engine.api_server import PipelineAPIServer
 
 def setup_logging(level: str = "INFO"):
     """Setup logging configuration"""
@@ -124,6 +125,10 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
                 'client_secret': os.getenv('SHAREPOINT_CLIENT_SECRET')
             }
         },
+        'api_config': {
+            'host': os.getenv('API_HOST', '0.0.0.0'),
+            'port': int(os.getenv('API_PORT', 8000))
+        },
         'workflow_config': {
             'max_concurrent_nodes': int(os.getenv('MAX_CONCURRENT_NODES', 10)),
             'default_timeout_seconds': int(os.getenv('DEFAULT_TIMEOUT', 1800)),
@@ -165,6 +170,7 @@ async def main():
     logger = logging.getLogger(__name__)
     logger.info("Starting SDLC Pipeline Engine")
     
+    orchestrator = None
     try:
         # Load configuration
         # Prefer config.yml by default; fall back to config.yaml if needed
@@ -176,6 +182,7 @@ async def main():
         
         # Create orchestrator
         orchestrator = SDLCPipelineOrchestrator(config)
+        await orchestrator.start()
         
         # Validate AI configuration
         logger.info("Validating AI configuration...")
@@ -215,24 +222,33 @@ async def main():
             execution_id = await orchestrator.execute_pipeline(pipeline_id, user_inputs)
             logger.info(f"Started pipeline execution: {execution_id}")
             
-            # Monitor execution
-            while True:
-                status = await orchestrator.get_execution_status(execution_id)
-                logger.info(f"Execution Status: {status['status']}, Progress: {status['progress']:.1f}%")
-                
-                if status['status'] in ['completed', 'failed', 'cancelled']:
-                    break
-                
-                await asyncio.sleep(10)
+            # Monitor execution via pushed events instead of polling
+            status = None
+            with orchestrator.event_bus.subscribe(execution_id) as events:
+                async for event in events:
+                    if event['event'] == 'stage_completed':
+                        logger.info(f"Stage {event['stage_id']}: {event['status']}")
+                    elif event['event'] == 'approval_required':
+                        logger.info(f"Stage {event['stage_id']} awaiting approval {event['approval_id']}")
+                    elif event['event'] == 'execution_status':
+                        status = event['status']
+                        progress = event.get('progress')
+                        if progress is not None:
+                            logger.info(f"Execution Status: {status}, Progress: {progress:.1f}%")
+                        else:
+                            logger.info(f"Execution Status: {status}")
+                        
+                        if status in ['completed', 'failed', 'cancelled']:
+                            break
             
-            logger.info(f"Pipeline execution completed with status: {status['status']}")
+            logger.info(f"Pipeline execution completed with status: {status}")
         
         else:
             logger.info("No pipeline file specified. Engine ready for API requests.")
             
-            # Keep the engine running for API requests
-            while True:
-                await asyncio.sleep(60)
+            # Serve the UI's REST and websocket API until shut down
+            api_server = PipelineAPIServer(orchestrator, config.get('api_config', {}))
+            await api_server.serve_forever()
     
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
@@ -240,6 +256,8 @@ async def main():
         logger.error(f"Engine error: {str(e)}", exc_info=True)
         sys.exit(1)
     finally:
+        if orchestrator is not None:
+            await orchestrator.stop()
         logger.info("SDLC Pipeline Engine stopped")
 
 if __name__ == "__main__":
@@ -8,17 +8,32 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Set, AsyncIterator, Tuple
+import hashlib
+from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
 from pathlib import Path
+from types import SimpleNamespace
 import os
+import time
 
-from sdlc_pipeline_engine.ai_processor import AIPromptProcessor
+import aiofiles
+
+from sdlc_pipeline_engine.ai_processor import AIPromptProcessor, ProviderAPIError
 from sdlc_pipeline_engine.artifact_manager import ArtifactManager
 from sdlc_pipeline_engine.repository_connectors import RepositoryConnectorFactory
 from sdlc_pipeline_engine.validation_engine import ValidationEngine
+from sdlc_pipeline_engine.prompt_catalog import PromptCatalog
+from sdlc_pipeline_engine.transformation_sandbox import TransformationSandbox
+from sdlc_pipeline_engine.execution_plan import ExecutionPlan, build_execution_levels, hash_pipeline_definition
+from sdlc_pipeline_engine.publishing_outbox import PublishingOutbox
+from sdlc_pipeline_engine.event_bus import ExecutionEventBus
+from sdlc_pipeline_engine.execution_planner import StageStatistics, ExecutionPlanner
+from sdlc_pipeline_engine.admission_control import AdmissionController, AdmissionRejectedError
+from sdlc_pipeline_engine.stage_profiler import (
+    StageProfile, stage_profile, profile_phase, current_profile, build_chrome_trace, build_otlp_trace
+)
 
 class StageType(Enum):
     PLANNING = "planning"
@@ -29,6 +44,12 @@ class StageType(Enum):
     DEPLOYMENT = "deployment"
     MAINTENANCE = "maintenance"
 
+class StageTimeoutError(Exception):
+    """Raised when a stage does not finish within its timeout_minutes deadline"""
+
+# Stage failures that retrying cannot fix (validation, approval and configuration errors)
+NON_RETRYABLE_ERRORS = (ValueError, TypeError, KeyError)
+
 class ExecutionStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -36,6 +57,8 @@ class ExecutionStatus(Enum):
     FAILED = "failed"
     PAUSED = "paused"
     CANCELLED = "cancelled"
+    AWAITING_APPROVAL = "awaiting_approval"
+    QUEUED = "queued"
 
 @dataclass
 class PipelineContext:
@@ -45,10 +68,19 @@ class PipelineContext:
     stage_outputs: Dict[str, Any]
     metadata: Dict[str, Any]
     user_inputs: Dict[str, Any]
-    
+
 class StageDefinition:
     """Defines a single stage in the SDLC pipeline"""
     
+    __slots__ = (
+        "stage_id", "stage_type", "name", "description",
+        "ai_config", "prompt_template", "model_settings",
+        "validation_rules", "quality_gates", "repository_configs", "max_parallel_publishing",
+        "dependencies", "parallel_execution", "timeout_minutes", "retry_policy",
+        "approval_required", "reviewers", "fan_out",
+        "prompt_handle", "reduce_prompt_handle", "parsed_validation_rules"
+    )
+    
     def __init__(self, stage_config: Dict[str, Any]):
         self.stage_id = stage_config["id"]
         self.stage_type = StageType(stage_config["type"])
@@ -66,6 +98,8 @@ class StageDefinition:
         
         # Repository Configuration
         self.repository_configs = stage_config.get("repositories", [])
+        # Repositories published to concurrently (None = all at once)
+        self.max_parallel_publishing = stage_config.get("max_parallel_publishing")
         
         # Workflow Configuration
         self.dependencies = stage_config.get("dependencies", [])
@@ -73,9 +107,17 @@ class StageDefinition:
         self.timeout_minutes = stage_config.get("timeout_minutes", 30)
         self.retry_policy = stage_config.get("retry_policy", {"max_retries": 3})
         
+        # Map/fan-out Configuration: run the prompt once per item, optionally reduce
+        self.fan_out = stage_config.get("fan_out")
+        
         # Human-in-the-loop Configuration
         self.approval_required = stage_config.get("approval_required", False)
         self.reviewers = stage_config.get("reviewers", [])
+        
+        # Filled in when the stage is compiled into an ExecutionPlan
+        self.prompt_handle = None
+        self.reduce_prompt_handle = None
+        self.parsed_validation_rules = None
 
 class SDLCPipelineOrchestrator:
     """Main orchestrator for SDLC pipeline execution"""
@@ -89,10 +131,102 @@ class SDLCPipelineOrchestrator:
         self.artifact_manager = ArtifactManager(config.get("artifact_config", {}))
         self.validation_engine = ValidationEngine(config.get("validation_config", {}))
         self.repository_factory = RepositoryConnectorFactory(config.get("repository_config", {}))
+        self.prompt_catalog = PromptCatalog(
+            config.get("prompts_base_dir"),
+            refresh_interval_seconds=config.get("prompt_catalog", {}).get("refresh_interval_seconds", 30)
+        )
+        self.transformation_sandbox = TransformationSandbox(config.get("transformation_config", {}))
+        # Push-based stream of stage and execution events (see event_bus.EVENT_TYPES)
+        self.event_bus = ExecutionEventBus(config.get("event_bus_config", {}))
+        
+        # Optional per-execution trace files (Chrome trace or OTLP/JSON) built from stage timings
+        profiling_config = config.get("profiling_config", {})
+        self.trace_dir = Path(profiling_config["trace_dir"]) if profiling_config.get("trace_dir") else None
+        self.trace_format = profiling_config.get("trace_format", "chrome")
+        
+        # Per-stage usage history used by plan_execution
+        planner_config = config.get("planner_config", {})
+        self.stage_statistics = StageStatistics(
+            Path(planner_config.get(
+                "statistics_path", self.artifact_manager.storage_path / "telemetry" / "stage_statistics.json"
+            )),
+            flush_batch=planner_config.get("statistics_flush_batch", 64),
+            flush_interval_seconds=planner_config.get("statistics_flush_interval_seconds", 30)
+        )
+        self.execution_planner = ExecutionPlanner(planner_config, self.stage_statistics)
+        
+        # Repository publishing runs write-behind from a durable outbox
+        publishing_config = config.get("publishing_config", {})
+        self.publishing_outbox = PublishingOutbox(
+            publishing_config,
+            Path(publishing_config.get("outbox_path", self.artifact_manager.storage_path / "outbox")),
+            handler=self._publish_outbox_job,
+            on_failed=self._on_publish_job_failed
+        )
+        self.repository_timeout_seconds = publishing_config.get("repository_timeout_seconds", 120)
+        
+        # Bounded concurrency for execute_pipeline with a durable overflow queue
+        admission_config = config.get("admission_config", {})
+        self.admission = AdmissionController(
+            admission_config,
+            Path(admission_config.get("queue_path", self.artifact_manager.storage_path / "admission"))
+        )
+        
+        # Background work begun by start() and ended by stop()
+        self._started = False
+        self._recovery_task: Optional[asyncio.Task] = None
         
         # Pipeline state
         self.active_executions: Dict[str, Dict] = {}
+        # In-flight stage tasks and pause gates per execution (set = running)
+        self._stage_tasks: Dict[str, Set[asyncio.Task]] = {}
+        self._pause_gates: Dict[str, asyncio.Event] = {}
+        
+        # Compiled execution plans by pipeline id; pipelines with equal content share a plan
+        self._plans: Dict[str, ExecutionPlan] = {}
+        self._plans_by_hash: Dict[str, ExecutionPlan] = {}
         
+        # Shared in-flight AI calls per batch, keyed by prompt + model settings: [task, waiters]
+        self._batch_prompt_calls: Dict[str, Dict[str, List[Any]]] = {}
+        
+        # Serializes read-modify-write of parked executions (approval decisions, publishing status)
+        self._parked_lock = asyncio.Lock()
+        
+    async def start(self):
+        """Start background work: load the artifact index, requeue pending publishing
+        jobs, restore queued executions and run the retention scheduler if enabled
+        """
+        
+        if self._started:
+            return
+        self._started = True
+        
+        await self.artifact_manager.start()
+        # Requeue jobs left pending by a previous run
+        await self.publishing_outbox.start()
+        await self._wait_for_admission_recovery()
+        # Periodic expiry of artifacts older than retention_days, if artifact_config.retention_interval_seconds is set
+        await self.artifact_manager.start_retention_scheduler()
+        self.logger.info("Started pipeline orchestrator")
+    
+    async def stop(self):
+        """Stop background work; pending publishing jobs and queued executions resume on the next start"""
+        
+        if not self._started:
+            return
+        self._started = False
+        
+        if self._recovery_task is not None:
+            self._recovery_task.cancel()
+            await asyncio.gather(self._recovery_task, return_exceptions=True)
+            self._recovery_task = None
+        await self.artifact_manager.stop_retention_scheduler()
+        await self.publishing_outbox.stop()
+        await self.stage_statistics.close()
+        await self.artifact_manager.flush_access_times()
+        self.transformation_sandbox.shutdown()
+        self.logger.info("Stopped pipeline orchestrator")
+    
     async def create_pipeline(self, pipeline_definition: Dict[str, Any]) -> str:
         """Create a new pipeline from definition"""
         pipeline_id = str(uuid.uuid4())
@@ -100,97 +234,382 @@ class SDLCPipelineOrchestrator:
         # Validate pipeline definition
         await self._validate_pipeline_definition(pipeline_definition)
         
+        # Compile transformation scripts once so executions reuse the code objects
+        self._precompile_transformation_scripts(pipeline_definition)
+        
+        # Compile the execution plan once; executions reuse it
+        plan = self._compile_execution_plan(pipeline_definition)
+        
         # Store pipeline definition
         await self.artifact_manager.store_pipeline_definition(
             pipeline_id, pipeline_definition
         )
+        self._cache_plan(pipeline_id, plan)
         
         self.logger.info(f"Created pipeline {pipeline_id}")
         return pipeline_id
     
+    async def update_pipeline(self, pipeline_id: str, pipeline_definition: Dict[str, Any]):
+        """Replace a pipeline definition; running and parked executions keep the plan they started with"""
+        
+        if await self.artifact_manager.load_pipeline_definition(pipeline_id) is None:
+            raise ValueError(f"Pipeline not found: {pipeline_id}")
+        
+        await self._validate_pipeline_definition(pipeline_definition)
+        self._precompile_transformation_scripts(pipeline_definition)
+        plan = self._compile_execution_plan(pipeline_definition)
+        
+        await self.artifact_manager.store_pipeline_definition(pipeline_id, pipeline_definition)
+        self._cache_plan(pipeline_id, plan)
+        
+        self.logger.info(f"Updated pipeline {pipeline_id}")
+    
+    async def delete_pipeline(self, pipeline_id: str) -> bool:
+        """Delete a pipeline definition"""
+        
+        self._evict_plan(pipeline_id)
+        deleted = await self.artifact_manager.delete_pipeline_definition(pipeline_id)
+        if deleted:
+            self.logger.info(f"Deleted pipeline {pipeline_id}")
+        return deleted
+    
     async def execute_pipeline(
         self, 
         pipeline_id: str, 
         user_inputs: Dict[str, Any],
         execution_options: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Execute a pipeline with given inputs"""
-        execution_id = str(uuid.uuid4())
+        """Execute a pipeline with given inputs.
+        
+        Starts immediately while fewer than ``max_active_executions`` run; otherwise
+        the execution is queued (status ``queued``) and started as slots free up.
+        Raises AdmissionRejectedError, carrying an estimated wait, when the queue is full.
+        """
         
         try:
-            # Load pipeline definition
-            pipeline_def = await self.artifact_manager.load_pipeline_definition(pipeline_id)
+            # New executions queue behind those restored from a previous run
+            await self._wait_for_admission_recovery()
             
-            # Initialize execution context
-            context = PipelineContext(
-                project_id=pipeline_id,
-                execution_id=execution_id,
-                stage_outputs={},
-                metadata={
-                    "start_time": datetime.utcnow().isoformat(),
-                    "pipeline_version": pipeline_def.get("version", "1.0"),
-                    "execution_options": execution_options or {}
-                },
-                user_inputs=user_inputs
-            )
+            # Get compiled plan (loads the definition only on a cache miss)
+            plan = await self._get_execution_plan(pipeline_id)
             
-            # Store execution state
-            self.active_executions[execution_id] = {
-                "status": ExecutionStatus.PENDING,
-                "context": context,
-                "pipeline_def": pipeline_def,
-                "current_stage": None
-            }
+            execution_id = await self._create_execution(plan, pipeline_id, user_inputs, execution_options)
             
-            # Start pipeline execution
-            asyncio.create_task(self._execute_pipeline_async(execution_id))
+            if self.admission.has_capacity():
+                # Start pipeline execution
+                self.admission.admit(execution_id)
+                asyncio.create_task(self._execute_pipeline_async(execution_id))
+                self.logger.info(f"Started pipeline execution {execution_id}")
+                return execution_id
+            
+            execution_state = self.active_executions[execution_id]
+            execution_state["status"] = ExecutionStatus.QUEUED
+            try:
+                position = await self.admission.enqueue(execution_id, pipeline_id, user_inputs, execution_options)
+            except AdmissionRejectedError:
+                self.active_executions.pop(execution_id, None)
+                self._pause_gates.pop(execution_id, None)
+                raise
             
-            self.logger.info(f"Started pipeline execution {execution_id}")
+            self.logger.info(f"Queued pipeline execution {execution_id} at position {position}")
+            await self._publish_execution_status(execution_id, execution_state)
             return execution_id
             
+        except AdmissionRejectedError as e:
+            self.logger.warning(f"Rejected execution of pipeline {pipeline_id}: {str(e)}")
+            raise
         except Exception as e:
             self.logger.error(f"Failed to start pipeline execution: {str(e)}")
             raise
     
+    async def execute_pipeline_batch(
+        self, 
+        pipeline_id: str, 
+        inputs_list: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute one pipeline over many input sets, yielding an event per finished execution.
+        
+        The plan is compiled once and executions are drained by a fixed pool of
+        workers (``max_concurrency``). Each execution still takes an admission slot,
+        waiting behind queued executions when ``max_active_executions`` are running.
+        Identical rendered prompts in flight at the same time are sent to the AI
+        provider once.
+        
+        Options:
+        - max_concurrency: number of executions running at once (default 4)
+        - execution_options: passed to every execution
+        - deduplicate_prompts: share identical AI calls across the batch (default True)
+        """
+        
+        options = options or {}
+        await self._wait_for_admission_recovery()
+        plan = await self._get_execution_plan(pipeline_id)
+        batch_id = str(uuid.uuid4())
+        max_concurrency = max(1, int(options.get("max_concurrency", 4)))
+        
+        execution_options = dict(options.get("execution_options") or {})
+        execution_options["batch_id"] = batch_id
+        if options.get("deduplicate_prompts", True):
+            self._batch_prompt_calls[batch_id] = {}
+        
+        work: asyncio.Queue = asyncio.Queue()
+        for index, user_inputs in enumerate(inputs_list):
+            work.put_nowait((index, user_inputs))
+        events: asyncio.Queue = asyncio.Queue()
+        
+        async def worker():
+            while True:
+                try:
+                    index, user_inputs = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                execution_id = None
+                try:
+                    execution_id = await self._create_execution(plan, pipeline_id, user_inputs, execution_options)
+                    try:
+                        await self.admission.wait_for_slot(execution_id)
+                    except asyncio.CancelledError:
+                        self.active_executions.pop(execution_id, None)
+                        self._pause_gates.pop(execution_id, None)
+                        raise
+                    await self._execute_pipeline_async(execution_id)
+                    status = await self.get_execution_status(execution_id)
+                    await events.put({"event": "execution_finished", "index": index, **status})
+                except Exception as e:
+                    self.logger.error(f"Batch {batch_id} item {index} failed: {str(e)}")
+                    await events.put({
+                        "event": "execution_finished",
+                        "index": index,
+                        "execution_id": execution_id,
+                        "status": ExecutionStatus.FAILED.value,
+                        "error": str(e)
+                    })
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrency, len(inputs_list)))]
+        self.logger.info(f"Started batch {batch_id}: {len(inputs_list)} executions of pipeline {pipeline_id}")
+        
+        try:
+            for _ in range(len(inputs_list)):
+                yield await events.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._batch_prompt_calls.pop(batch_id, None)
+    
+    async def plan_execution(
+        self, 
+        pipeline_id: str, 
+        user_inputs: Dict[str, Any],
+        executions: int = 1,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Dry run: render every stage prompt without calling providers and estimate
+        tokens, cost, critical-path duration and provider quota use.
+        
+        Upstream outputs are not available, so their predicted size is added to the
+        prompts that reference them. Output tokens and latency come from the stage
+        history recorded by previous executions (configured defaults without it).
+        Time spent waiting for approvals is not included. ``executions`` and
+        ``max_concurrency`` scale the totals for a batch.
+        """
+        
+        plan = await self._get_execution_plan(pipeline_id)
+        context = PipelineContext(
+            project_id=pipeline_id,
+            execution_id="dry-run",
+            stage_outputs={},
+            metadata={"execution_options": {}, "dry_run": True},
+            user_inputs=user_inputs
+        )
+        
+        stage_estimates: Dict[str, Dict[str, Any]] = {}
+        for level in plan.levels:
+            for stage in level:
+                stage_estimates[stage.stage_id] = await self._plan_stage(stage, context, stage_estimates)
+                context.stage_outputs[stage.stage_id] = {"status": "planned", "outputs": {"generated_content": ""}}
+        
+        critical_path = plan.critical_path({
+            stage_id: estimate["duration_seconds"] for stage_id, estimate in stage_estimates.items()
+        })
+        
+        return {
+            "pipeline_id": pipeline_id,
+            "stages": list(stage_estimates.values()),
+            "critical_path": critical_path,
+            **self.execution_planner.summarize(stage_estimates, critical_path, executions, max_concurrency)
+        }
+    
+    async def _plan_stage(
+        self, 
+        stage: StageDefinition, 
+        context: PipelineContext, 
+        stage_estimates: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Render a stage's prompts for a dry run and estimate it"""
+        
+        planner = self.execution_planner
+        inputs = await self._prepare_stage_inputs(stage, context)
+        model_config = self.ai_processor._parse_model_config(stage.model_settings or {})
+        
+        # Predicted upstream content replaces the empty placeholders rendered below
+        upstream_tokens = sum(
+            stage_estimates[dependency]["output_tokens"]
+            for dependency in stage.dependencies
+            if f"{dependency}_output" in inputs and dependency in stage_estimates
+        )
+        
+        render_error = None
+        prompt_inputs = [inputs]
+        parallelism = 1
+        if stage.fan_out:
+            parallelism = max(1, int(stage.fan_out.get("max_parallelism", 5)))
+            item_variable = stage.fan_out.get("item_variable", "item")
+            try:
+                items = self._resolve_fan_out_items(stage.fan_out.get("items"), context)
+            except ValueError:
+                # Items come from an upstream output; assume as many as last time
+                history = await self.stage_statistics.get(context.project_id, stage.stage_id)
+                count = max(1, round(history["provider_calls"]) - (1 if stage.reduce_prompt_handle else 0)) if history else 1
+                items = [None] * count
+            prompt_inputs = [
+                self._fan_out_item_inputs(inputs, item_variable, index, item) for index, item in enumerate(items)
+            ]
+        
+        prompt_tokens = []
+        for item_inputs in prompt_inputs:
+            try:
+                prompt = await self._build_stage_prompt(stage, item_inputs)
+            except Exception as e:
+                render_error = render_error or str(e)
+                prompt = ""
+            prompt_tokens.append(planner.estimate_tokens(prompt))
+        
+        estimate = await planner.estimate_stage(
+            context.project_id,
+            stage.stage_id,
+            prompt_tokens,
+            upstream_tokens,
+            model_config.provider.value,
+            model_config.model_name,
+            model_config.max_tokens,
+            parallelism=parallelism,
+            reduce_call=bool(stage.fan_out) and stage.reduce_prompt_handle is not None
+        )
+        estimate["approval_required"] = stage.approval_required
+        if render_error:
+            estimate["render_error"] = render_error
+        return estimate
+    
+    async def _create_execution(
+        self, 
+        plan: ExecutionPlan, 
+        pipeline_id: str, 
+        user_inputs: Dict[str, Any],
+        execution_options: Optional[Dict[str, Any]] = None,
+        execution_id: Optional[str] = None,
+        start_time: Optional[str] = None
+    ) -> str:
+        """Register a new pending execution of a compiled plan"""
+        execution_id = execution_id or str(uuid.uuid4())
+        
+        # Initialize execution context
+        context = PipelineContext(
+            project_id=pipeline_id,
+            execution_id=execution_id,
+            stage_outputs={},
+            metadata={
+                "start_time": start_time or datetime.utcnow().isoformat(),
+                "pipeline_version": plan.version,
+                "execution_options": execution_options or {}
+            },
+            user_inputs=user_inputs
+        )
+        
+        self._register_execution(plan, context)
+        await self.artifact_manager.index_execution(
+            execution_id, pipeline_id, context.metadata["start_time"], ExecutionStatus.PENDING.value
+        )
+        return execution_id
+    
+    def _register_execution(self, plan: ExecutionPlan, context: PipelineContext):
+        """Add an execution to active_executions with an open pause gate"""
+        execution_id = context.execution_id
+        
+        # Store execution state
+        self.active_executions[execution_id] = {
+            "status": ExecutionStatus.PENDING,
+            "context": context,
+            "pipeline_def": plan.definition,
+            "plan": plan,
+            "current_stage": None
+        }
+        
+        pause_gate = asyncio.Event()
+        pause_gate.set()
+        self._pause_gates[execution_id] = pause_gate
+    
     async def _execute_pipeline_async(self, execution_id: str):
         """Async pipeline execution logic"""
         execution_state = self.active_executions[execution_id]
         context = execution_state["context"]
-        pipeline_def = execution_state["pipeline_def"]
+        plan = execution_state["plan"]
         
         try:
-            execution_state["status"] = ExecutionStatus.RUNNING
-            
-            # Build execution graph
-            stages = [StageDefinition(stage_config) for stage_config in pipeline_def["stages"]]
-            execution_graph = self._build_execution_graph(stages)
+            # Cancelled while waiting for an admission slot: settled below without running
+            if execution_state["status"] != ExecutionStatus.CANCELLED:
+                execution_state["status"] = ExecutionStatus.RUNNING
+                await self._publish_execution_status(execution_id, execution_state)
             
-            # Execute stages according to dependency graph
-            for stage_batch in execution_graph:
-                if execution_state["status"] != ExecutionStatus.RUNNING:
-                    break
-                
-                # Execute stages in parallel if possible
-                if len(stage_batch) > 1:
-                    tasks = [self._execute_stage(stage, context) for stage in stage_batch]
+            # Execute stages according to the plan's precomputed dependency levels
+            for stage_batch in plan.levels:
+                while True:
+                    # Wait while paused; cancellation also releases the gate
+                    if execution_state["status"] == ExecutionStatus.PAUSED:
+                        await self._pause_gates[execution_id].wait()
+                    if execution_state["status"] != ExecutionStatus.RUNNING:
+                        break
+                    
+                    # Stages interrupted by a pause are re-run once resumed
+                    pending = [
+                        stage for stage in stage_batch
+                        if context.stage_outputs.get(stage.stage_id, {}).get("status")
+                        not in ("completed", "awaiting_approval")
+                    ]
+                    if not pending:
+                        break
+                    
+                    # Execute stages in parallel; each stage runs as its own cancellable task
+                    tasks = [self._run_stage(stage, context) for stage in pending]
                     results = await asyncio.gather(*tasks, return_exceptions=True)
                     
-                    # Check for failures
-                    for i, result in enumerate(results):
+                    # Check for failures (cancelled stages are not failures)
+                    for stage, result in zip(pending, results):
                         if isinstance(result, Exception):
-                            stage_id = stage_batch[i].stage_id
-                            self.logger.error(f"Stage {stage_id} failed: {str(result)}")
+                            self.logger.error(f"Stage {stage.stage_id} failed: {str(result)}")
                             execution_state["status"] = ExecutionStatus.FAILED
                             return
-                else:
-                    # Single stage execution
-                    stage = stage_batch[0]
-                    try:
-                        await self._execute_stage(stage, context)
-                    except Exception as e:
-                        self.logger.error(f"Stage {stage.stage_id} failed: {str(e)}")
-                        execution_state["status"] = ExecutionStatus.FAILED
-                        return
+                    
+                    # Park the execution once the level is waiting only on approvals
+                    if execution_state["status"] != ExecutionStatus.CANCELLED and any(
+                        context.stage_outputs.get(stage.stage_id, {}).get("status") == "awaiting_approval"
+                        for stage in stage_batch
+                    ):
+                        execution_state["status"] = ExecutionStatus.AWAITING_APPROVAL
+                        break
+                
+                if execution_state["status"] != ExecutionStatus.RUNNING:
+                    break
+            
+            if execution_state["status"] == ExecutionStatus.AWAITING_APPROVAL:
+                await self._park_execution(execution_id)
+                return
+            
+            if execution_state["status"] == ExecutionStatus.CANCELLED:
+                context.metadata["end_time"] = datetime.utcnow().isoformat()
+                self.logger.info(f"Pipeline execution {execution_id} cancelled")
+                return
             
             # Mark execution as completed
             execution_state["status"] = ExecutionStatus.COMPLETED
@@ -203,81 +622,322 @@ class SDLCPipelineOrchestrator:
             execution_state["status"] = ExecutionStatus.FAILED
         
         finally:
-            # Store final execution state
-            await self.artifact_manager.store_execution_result(execution_id, execution_state)
+            # A decision that landed before parking has already resumed the execution;
+            # the resumed run owns the admission slot and publishes its own status
+            if self.active_executions.get(execution_id, execution_state) is execution_state:
+                self._stage_tasks.pop(execution_id, None)
+                self._pause_gates.pop(execution_id, None)
+                
+                # Hand the slot to the next queued execution
+                self.admission.release(execution_id)
+                self._start_admitted_executions()
+                
+                # Store final execution state (parked executions are persisted by _park_execution)
+                if execution_state["status"] != ExecutionStatus.AWAITING_APPROVAL:
+                    context.metadata["critical_path"] = plan.critical_path({
+                        stage_id: output.get("execution_time")
+                        for stage_id, output in context.stage_outputs.items()
+                    })
+                    await self._store_execution_state(execution_id, execution_state)
+                    if self.trace_dir is not None:
+                        await self._write_execution_trace(execution_id, context)
+                await self._publish_execution_status(execution_id, execution_state)
     
-    async def _execute_stage(self, stage: StageDefinition, context: PipelineContext):
-        """Execute a single pipeline stage"""
-        stage_start_time = datetime.utcnow()
+    async def _write_execution_trace(self, execution_id: str, context: PipelineContext):
+        """Write the execution's stage and phase spans to the configured trace directory"""
+        try:
+            if self.trace_format == "otlp":
+                trace = build_otlp_trace(execution_id, context.stage_outputs)
+            else:
+                trace = build_chrome_trace(execution_id, context.stage_outputs)
+            
+            self.trace_dir.mkdir(parents=True, exist_ok=True)
+            trace_file = self.trace_dir / f"{execution_id}.{self.trace_format}.json"
+            async with aiofiles.open(trace_file, 'w') as f:
+                await f.write(json.dumps(trace))
+            self.logger.debug(f"Wrote {self.trace_format} trace for {execution_id} to {trace_file}")
+        except Exception as e:
+            self.logger.warning(f"Failed to write trace for execution {execution_id}: {str(e)}")
+    
+    def _start_admitted_executions(self):
+        """Start queued executions that the admission controller has slots for"""
+        for entry in self.admission.admit_next():
+            execution_id = entry["execution_id"]
+            if self.active_executions.get(execution_id, {}).get("status") != ExecutionStatus.QUEUED:
+                self.admission.release(execution_id)
+                continue
+            asyncio.create_task(self._execute_pipeline_async(execution_id))
+            self.logger.info(f"Started queued pipeline execution {execution_id}")
+    
+    async def _wait_for_admission_recovery(self):
+        """Restore the admission queue once, starting it if start() has not"""
+        if self._recovery_task is None:
+            self._recovery_task = asyncio.create_task(self._recover_admission_queue())
+        await asyncio.shield(self._recovery_task)
+    
+    async def _recover_admission_queue(self):
+        """Re-register executions queued before a restart and start those that fit"""
+        for entry in await self.admission.recover():
+            execution_id = entry["execution_id"]
+            try:
+                plan = await self._get_execution_plan(entry["pipeline_id"])
+            except Exception as e:
+                self.logger.error(f"Dropping queued execution {execution_id}: {str(e)}")
+                self.admission.remove(execution_id)
+                continue
+            await self._create_execution(
+                plan,
+                entry["pipeline_id"],
+                entry["user_inputs"],
+                entry["execution_options"],
+                execution_id=execution_id,
+                start_time=entry["enqueued_at"]
+            )
+            self.active_executions[execution_id]["status"] = ExecutionStatus.QUEUED
+        self._start_admitted_executions()
+    
+    async def _publish_execution_status(self, execution_id: str, execution_state: Dict[str, Any]):
+        """Publish an execution_status event for the execution's current state"""
+        await self.event_bus.publish(
+            "execution_status",
+            execution_id,
+            pipeline_id=execution_state["context"].project_id,
+            status=execution_state["status"].value,
+            current_stage=execution_state.get("current_stage"),
+            progress=self._calculate_progress(execution_state) if "pipeline_def" in execution_state else None
+        )
+    
+    async def _store_execution_state(self, execution_id: str, execution_state: Dict[str, Any]):
+        """Persist execution state (the compiled plan is shared, not persisted)"""
+        snapshot = {k: v for k, v in execution_state.items() if k != "plan"}
+        snapshot["status"] = execution_state["status"].value
+        snapshot["context"] = asdict(execution_state["context"])
+        if "plan" in execution_state:
+            snapshot["total_stages"] = len(execution_state["plan"].stages)
+        await self.artifact_manager.store_execution_result(execution_id, snapshot)
+    
+    async def _run_stage(self, stage: StageDefinition, context: PipelineContext):
+        """Run a stage as a tracked task so pause/cancel can interrupt in-flight calls"""
+        task = asyncio.create_task(self._execute_stage_with_policy(stage, context))
+        stage_tasks = self._stage_tasks.setdefault(context.execution_id, set())
+        stage_tasks.add(task)
+        try:
+            return await task
+        finally:
+            stage_tasks.discard(task)
+    
+    async def _execute_stage_with_policy(self, stage: StageDefinition, context: PipelineContext):
+        """Execute a stage within its deadline, retrying retryable failures per its retry policy"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + stage.timeout_minutes * 60
+        policy = stage.retry_policy or {}
+        max_retries = int(policy.get("max_retries", 0))
+        attempt = 0
         
+        while True:
+            attempt += 1
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                await asyncio.wait_for(self._execute_stage(stage, context), timeout=remaining)
+                context.stage_outputs[stage.stage_id]["attempts"] = attempt
+                return
+            except asyncio.TimeoutError:
+                error = StageTimeoutError(
+                    f"Stage {stage.stage_id} exceeded its timeout of {stage.timeout_minutes} minutes"
+                )
+                context.stage_outputs[stage.stage_id] = {
+                    "status": "failed",
+                    "error": str(error),
+                    "execution_time": loop.time() - started,
+                    "attempts": attempt
+                }
+                raise error
+            except Exception as e:
+                context.stage_outputs[stage.stage_id]["attempts"] = attempt
+                if attempt > max_retries or not self._is_retryable_error(e, policy):
+                    raise
+                
+                delay = self._retry_delay(policy, attempt)
+                if loop.time() + delay >= deadline:
+                    raise
+                
+                self.logger.warning(
+                    f"Stage {stage.stage_id} attempt {attempt} failed: {str(e)}; retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+    
+    def _is_retryable_error(self, error: Exception, policy: Dict[str, Any]) -> bool:
+        """Check whether a stage failure should be retried.
+        Provider auth and request errors (4xx) are always final. A policy may list
+        exception class names in ``retry_on``; otherwise validation, approval and
+        configuration errors (ValueError/TypeError/KeyError) are final, and provider
+        errors are only retried with ``retry_provider_errors`` since the provider
+        client has already retried them.
+        """
+        if isinstance(error, ProviderAPIError) and not error.retryable:
+            return False
+        retry_on = policy.get("retry_on")
+        if retry_on:
+            names = {cls.__name__ for cls in type(error).__mro__}
+            return any(name in names for name in retry_on)
+        if isinstance(error, ProviderAPIError):
+            return bool(policy.get("retry_provider_errors", False))
+        return not isinstance(error, NON_RETRYABLE_ERRORS)
+    
+    def _retry_delay(self, policy: Dict[str, Any], attempt: int) -> float:
+        """Exponential backoff delay before the given retry attempt"""
+        base_delay = float(policy.get("retry_delay_seconds", 5))
+        multiplier = float(policy.get("backoff_multiplier", 2.0))
+        max_delay = float(policy.get("max_delay_seconds", 300))
+        return min(base_delay * (multiplier ** (attempt - 1)), max_delay)
+    
+    async def _execute_stage(self, stage: StageDefinition, context: PipelineContext):
+        """Execute a single pipeline stage, recording per-phase timings"""
+        with stage_profile(StageProfile(record_spans=self.trace_dir is not None)) as profile:
+            await self._execute_profiled_stage(stage, context, profile)
+    
+    async def _execute_profiled_stage(self, stage: StageDefinition, context: PipelineContext, profile: StageProfile):
         try:
             self.logger.info(f"Starting stage {stage.stage_id}: {stage.name}")
             
             # Update context with current stage
             self.active_executions[context.execution_id]["current_stage"] = stage.stage_id
+            await self.event_bus.publish(
+                "stage_started", context.execution_id, stage_id=stage.stage_id, stage_name=stage.name
+            )
             
             # Prepare stage inputs
-            stage_inputs = await self._prepare_stage_inputs(stage, context)
+            with profile_phase("input_preparation"):
+                stage_inputs = await self._prepare_stage_inputs(stage, context)
             
-            # Execute AI processing
-            ai_outputs = await self._execute_ai_processing(stage, stage_inputs, context)
+            # Execute AI processing (once per item for fan-out stages)
+            if stage.fan_out:
+                ai_outputs = await self._execute_fan_out(stage, stage_inputs, context)
+            else:
+                ai_outputs = await self._execute_ai_processing(stage, stage_inputs, context)
             
             # Validate outputs
-            validation_results = await self._validate_stage_outputs(stage, ai_outputs)
+            with profile_phase("validation"):
+                validation_results = await self._validate_stage_outputs(stage, ai_outputs)
             if not validation_results["passed"]:
                 raise ValueError(f"Stage validation failed: {validation_results['errors']}")
             
-            # Handle approval gates
+            # Handle approval gates: the stage waits for a decision without holding a task
             if stage.approval_required:
-                approval_result = await self._handle_approval_gate(stage, ai_outputs, context)
-                if not approval_result["approved"]:
-                    raise ValueError(f"Stage approval rejected: {approval_result['reason']}")
+                with profile_phase("approval_request"):
+                    approval_id = await self._handle_approval_gate(stage, ai_outputs, context)
+                context.stage_outputs[stage.stage_id] = {
+                    "outputs": ai_outputs,
+                    "validation": validation_results,
+                    "approval_id": approval_id,
+                    "execution_time": profile.finish(),
+                    "timings": profile.to_dict(),
+                    "status": "awaiting_approval"
+                }
+                await self._record_stage_statistics(stage, context)
+                self.logger.info(f"Stage {stage.stage_id} awaiting approval {approval_id}")
+                await self._publish_stage_completed(stage, context)
+                return
             
-            # Store artifacts in external repositories
-            repository_results = await self._store_stage_artifacts(stage, ai_outputs, context)
+            # Queue artifacts for publishing; the stage does not wait for the repositories
+            with profile_phase("publishing_enqueue"):
+                repository_results = await self._enqueue_stage_publishing(stage, ai_outputs, context)
             
             # Update context with stage outputs
             context.stage_outputs[stage.stage_id] = {
                 "outputs": ai_outputs,
                 "validation": validation_results,
                 "repositories": repository_results,
-                "execution_time": (datetime.utcnow() - stage_start_time).total_seconds(),
+                "execution_time": profile.finish(),
+                "timings": profile.to_dict(),
                 "status": "completed"
             }
+            await self._record_stage_statistics(stage, context)
             
             self.logger.info(f"Completed stage {stage.stage_id}")
+            await self._publish_stage_completed(stage, context)
             
         except Exception as e:
             # Store error information
             context.stage_outputs[stage.stage_id] = {
                 "status": "failed",
                 "error": str(e),
-                "execution_time": (datetime.utcnow() - stage_start_time).total_seconds()
+                "execution_time": profile.finish(),
+                "timings": profile.to_dict()
             }
+            await self._publish_stage_completed(stage, context)
             raise
     
+    async def _record_stage_statistics(self, stage: StageDefinition, context: PipelineContext):
+        """Add a successful stage's timings and token counts to the planning history"""
+        stage_output = context.stage_outputs[stage.stage_id]
+        try:
+            await self.stage_statistics.record(
+                context.project_id, stage.stage_id, stage_output["execution_time"], stage_output["timings"]
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to record statistics for stage {stage.stage_id}: {str(e)}")
+    
+    async def _publish_stage_completed(self, stage: StageDefinition, context: PipelineContext):
+        """Publish a stage_completed event carrying the stage's final status"""
+        stage_output = context.stage_outputs[stage.stage_id]
+        await self.event_bus.publish(
+            "stage_completed",
+            context.execution_id,
+            stage_id=stage.stage_id,
+            stage_name=stage.name,
+            status=stage_output["status"],
+            execution_time=stage_output.get("execution_time"),
+            error=stage_output.get("error")
+        )
+    
     async def _prepare_stage_inputs(
         self, 
         stage: StageDefinition, 
         context: PipelineContext
     ) -> Dict[str, Any]:
-        """Prepare inputs for a stage from context and dependencies"""
-        stage_inputs = {
-            "stage_type": stage.stage_type.value,
-            "user_inputs": context.user_inputs,
-            "project_metadata": context.metadata
-        }
+        """Prepare inputs for a stage from context and dependencies.
+        Only variables the stage template references are built; upstream outputs
+        are passed by reference, not copied.
+        """
+        if stage.prompt_handle is None:
+            stage.prompt_handle = self.prompt_catalog.handle(stage.prompt_template, stage.stage_type.value)
+        
+        try:
+            referenced = stage.prompt_handle.variables
+            if stage.reduce_prompt_handle is not None:
+                referenced = referenced | stage.reduce_prompt_handle.variables
+        except Exception:
+            # Template errors surface when the prompt is rendered
+            referenced = None
+        
+        def is_referenced(name: str) -> bool:
+            return referenced is None or name in referenced
+        
+        stage_inputs = {}
+        if is_referenced("stage_type"):
+            stage_inputs["stage_type"] = stage.stage_type.value
+        if is_referenced("user_inputs"):
+            stage_inputs["user_inputs"] = context.user_inputs
+        if is_referenced("project_metadata"):
+            stage_inputs["project_metadata"] = context.metadata
         
         # Add outputs from dependent stages
         for dependency in stage.dependencies:
             if dependency in context.stage_outputs:
-                dep_output = context.stage_outputs[dependency]
-                stage_inputs[f"{dependency}_output"] = dep_output["outputs"]
+                key = f"{dependency}_output"
+                if is_referenced(key):
+                    stage_inputs[key] = context.stage_outputs[dependency].get("outputs", {})
             else:
                 self.logger.warning(f"Missing dependency {dependency} for stage {stage.stage_id}")
         
         # Add stage-specific configurations
-        stage_inputs.update(stage.ai_config.get("additional_inputs", {}))
+        for key, value in stage.ai_config.get("additional_inputs", {}).items():
+            if is_referenced(key):
+                stage_inputs[key] = value
         
         return stage_inputs
     
@@ -293,13 +953,209 @@ class SDLCPipelineOrchestrator:
         prompt = await self._build_stage_prompt(stage, inputs)
         
         # Execute AI processing
-        ai_result = await self.ai_processor.process_prompt(
-            prompt=prompt,
-            model_config=stage.model_settings,
-            context=context
-        )
+        return await self._process_prompt(prompt, stage.model_settings, context)
+    
+    async def _process_prompt(
+        self, 
+        prompt: str, 
+        model_settings: Dict[str, Any], 
+        context: PipelineContext
+    ) -> Dict[str, Any]:
+        """Send a prompt to the AI processor, sharing identical calls within a batch"""
+        
+        started = time.perf_counter()
+        result = await self._dispatch_prompt(prompt, model_settings, context)
+        self._record_provider_usage(started, prompt, result)
+        return result
+    
+    def _record_provider_usage(self, started: float, prompt: str, result: Dict[str, Any]):
+        """Split the wait for a prompt into provider call time and queueing, and count tokens.
+        The provider's reported processing_time is the call; anything beyond it
+        (waiting on a shared batch call, client-side scheduling) is queueing.
+        Providers report total tokens, so the input share is estimated locally.
+        """
+        profile = current_profile()
+        if profile is None:
+            return
+        
+        input_tokens = self.execution_planner.estimate_tokens(prompt)
+        tokens_used = result.get("model_info", {}).get("tokens_used") or 0
+        if tokens_used > input_tokens:
+            output_tokens = tokens_used - input_tokens
+        else:
+            output_tokens = self.execution_planner.estimate_tokens(result.get("generated_content", ""))
+        profile.count("provider_calls")
+        profile.count("input_tokens", input_tokens)
+        profile.count("output_tokens", output_tokens)
+        
+        elapsed = time.perf_counter() - started
+        reported = result.get("model_info", {}).get("processing_time")
+        call_time = min(float(reported), elapsed) if isinstance(reported, (int, float)) else elapsed
+        queued = elapsed - call_time
+        if queued > 0:
+            profile.add("provider_queueing", queued, started)
+        profile.add("provider_call", call_time, started + queued)
+    
+    async def _dispatch_prompt(
+        self, 
+        prompt: str, 
+        model_settings: Dict[str, Any], 
+        context: PipelineContext
+    ) -> Dict[str, Any]:
+        batch_id = context.metadata.get("execution_options", {}).get("batch_id")
+        calls = self._batch_prompt_calls.get(batch_id) if batch_id else None
+        if calls is None:
+            return await self.ai_processor.process_prompt(
+                prompt=prompt,
+                model_config=model_settings,
+                context=context
+            )
+        
+        key = hashlib.sha256(
+            (json.dumps(model_settings, sort_keys=True, default=str) + "\0" + prompt).encode("utf-8")
+        ).hexdigest()
+        entry = calls.get(key)
+        if entry is None:
+            task = asyncio.create_task(self.ai_processor.process_prompt(
+                prompt=prompt,
+                model_config=model_settings,
+                context=context
+            ))
+            entry = calls[key] = [task, 0]
+        else:
+            self.logger.debug(f"Reusing AI call for identical prompt in batch {batch_id}")
+        
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # Shielded so one cancelled execution does not cancel the call for the others
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Let a retry issue a fresh call instead of replaying the failure
+            if calls.get(key) is entry:
+                del calls[key]
+            raise
+        finally:
+            entry[1] -= 1
+            # Every waiter has its result (or gave up): drop the entry and any orphaned call
+            if entry[1] == 0:
+                if calls.get(key) is entry:
+                    del calls[key]
+                if not task.done():
+                    task.cancel()
+        
+        return dict(result)
+    
+    async def _execute_fan_out(
+        self, 
+        stage: StageDefinition, 
+        inputs: Dict[str, Any], 
+        context: PipelineContext
+    ) -> Dict[str, Any]:
+        """Run the stage prompt once per fan-out item with bounded parallelism.
+        Item failures are isolated; an optional reduce prompt merges the results.
+        """
+        
+        fan_out = stage.fan_out
+        items = self._resolve_fan_out_items(fan_out.get("items"), context)
+        item_variable = fan_out.get("item_variable", "item")
+        semaphore = asyncio.Semaphore(max(1, int(fan_out.get("max_parallelism", 5))))
+        
+        async def run_item(index: int, item: Any) -> Dict[str, Any]:
+            item_inputs = self._fan_out_item_inputs(inputs, item_variable, index, item)
+            
+            async with semaphore:
+                try:
+                    result = await self._execute_ai_processing(stage, item_inputs, context)
+                except Exception as e:
+                    self.logger.error(f"Stage {stage.stage_id} item {index} failed: {str(e)}")
+                    return {"index": index, "item": item, "status": "failed", "error": str(e)}
+            
+            return {
+                "index": index,
+                "item": item,
+                "status": "completed",
+                "generated_content": result.get("generated_content", ""),
+                "model_info": result.get("model_info", {})
+            }
+        
+        item_results = await asyncio.gather(*(run_item(i, item) for i, item in enumerate(items)))
+        succeeded = [r for r in item_results if r["status"] == "completed"]
+        failed_count = len(item_results) - len(succeeded)
+        
+        if items and not succeeded:
+            raise RuntimeError(f"All {len(items)} fan-out items failed for stage {stage.stage_id}")
+        if failed_count and fan_out.get("fail_on_item_error", False):
+            raise RuntimeError(f"{failed_count} of {len(items)} fan-out items failed for stage {stage.stage_id}")
+        
+        outputs = {
+            "items": item_results,
+            "item_count": len(item_results),
+            "failed_count": failed_count
+        }
+        
+        if stage.reduce_prompt_handle is not None:
+            reduce_inputs = dict(inputs)
+            reduce_inputs["results"] = succeeded
+            with profile_phase("prompt_rendering"):
+                prompt = stage.reduce_prompt_handle.template().render(**reduce_inputs)
+            reduce_result = await self._process_prompt(prompt, stage.model_settings, context)
+            outputs["generated_content"] = reduce_result.get("generated_content", "")
+            outputs["model_info"] = reduce_result.get("model_info", {})
+            outputs["metadata"] = reduce_result.get("metadata", {})
+        else:
+            outputs["generated_content"] = "\n\n".join(r["generated_content"] for r in succeeded)
+        
+        return outputs
+    
+    def _fan_out_item_inputs(self, inputs: Dict[str, Any], item_variable: str, index: int, item: Any) -> Dict[str, Any]:
+        """Stage inputs for one fan-out item; dict items also expose their keys"""
+        item_inputs = dict(inputs)
+        item_inputs[item_variable] = item
+        item_inputs["item_index"] = index
+        if isinstance(item, dict):
+            for key, value in item.items():
+                item_inputs.setdefault(key, value)
+        return item_inputs
+    
+    def _resolve_fan_out_items(self, items_spec: Any, context: PipelineContext) -> List[Any]:
+        """Resolve fan-out items from a literal list or a dotted path such as
+        ``user_inputs.bounded_contexts`` or ``design_output.generated_content``.
+        String values are parsed as JSON or YAML.
+        """
+        
+        if isinstance(items_spec, list):
+            return items_spec
+        if not isinstance(items_spec, str) or not items_spec:
+            raise ValueError("fan_out.items must be a list or a dotted path")
+        
+        root, *path = items_spec.split(".")
+        if root == "user_inputs":
+            value = context.user_inputs
+        else:
+            stage_id = root[:-len("_output")] if root.endswith("_output") else root
+            if stage_id not in context.stage_outputs:
+                raise ValueError(f"fan_out.items refers to unknown source: {root}")
+            value = context.stage_outputs[stage_id].get("outputs", {})
+        
+        for key in path:
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                raise ValueError(f"fan_out.items path not found: {items_spec}")
         
-        return ai_result
+        if isinstance(value, str):
+            import yaml
+            try:
+                value = json.loads(value)
+            except ValueError:
+                value = yaml.safe_load(value)
+        
+        if not isinstance(value, list):
+            raise ValueError(f"fan_out.items did not resolve to a list: {items_spec}")
+        return value
     
     async def _build_stage_prompt(
         self, 
@@ -315,92 +1171,20 @@ class SDLCPipelineOrchestrator:
         Falls back to treating stage.prompt_template as inline Jinja template.
         """
         
-        prompt_spec = stage.prompt_template or ""
-        base_dir = self.config.get('prompts_base_dir')
-        try:
-            content = self._resolve_prompt_content(prompt_spec, stage, base_dir)
-        except Exception as e:
-            self.logger.warning(f"Prompt resolution failed for stage {stage.stage_id}: {e}. Using inline content if provided.")
-            content = prompt_spec
+        if stage.prompt_handle is None:
+            stage.prompt_handle = self.prompt_catalog.handle(stage.prompt_template, stage.stage_type.value)
+        
+        handle = stage.prompt_handle
+        with profile_phase("prompt_resolution"):
+            if handle.resolution_error is not None:
+                self.logger.warning(f"Prompt resolution failed for stage {stage.stage_id}: {handle.resolution_error}. Using inline content if provided.")
+            template = handle.template()
         
         # Replace placeholders with actual values
-        import jinja2
-        template = jinja2.Template(content)
-        rendered_prompt = template.render(**inputs)
+        with profile_phase("prompt_rendering"):
+            rendered_prompt = template.render(**inputs)
         
         return rendered_prompt
-
-    def _resolve_prompt_content(self, prompt_spec: str, stage: StageDefinition, base_dir: Optional[str]) -> str:
-        """Resolve prompt content from file system if prompt_spec indicates a file or key.
-        If resolution fails or no spec, raises Exception.
-        """
-        # If no spec, raise
-        if not prompt_spec:
-            raise ValueError("Empty prompt_spec")
-        
-        # Normalize
-        spec = prompt_spec.strip()
-        # If starts with file: prefix
-        if spec.lower().startswith("file:"):
-            spec = spec[5:].strip()
-        
-        # Determine candidate paths
-        candidates: List[Path] = []
-        # Absolute path
-        p = Path(spec)
-        if p.is_absolute():
-            candidates.append(p)
-        
-        # If looks like relative file path (has extension)
-        if p.suffix.lower() in {'.md', '.txt', '.yaml', '.yml'}:
-            if not p.is_absolute():
-                if base_dir:
-                    candidates.append(Path(base_dir) / p)
-                candidates.append((Path(__file__).resolve().parent / p).resolve())
-        else:
-            # Treat as logical key, possibly including stage folder
-            # Map StageType to directory prefix
-            stage_dir_map = {
-                'planning': '1-planning',
-                'requirements': '2-requirements',
-                'design': '3-design',
-                'implementation': '4-implementation',
-                'testing': '5-testing',
-                'deployment': '6-deployment',
-                'maintenance': '7-maintenance',
-            }
-            stage_dir = stage_dir_map.get(stage.stage_type.value, stage.stage_type.value)
-            # If the spec already includes a slash, try as-is under prompts_base_dir
-            if '/' in spec or '\\' in spec:
-                if base_dir:
-                    candidates.append(Path(base_dir) / spec)
-            else:
-                # Build common paths under sdlc-pipeline
-                for ext in ['.md', '.txt']:
-                    if base_dir:
-                        candidates.append(Path(base_dir) / stage_dir / 'prompts' / f"{spec}{ext}")
-                        candidates.append(Path(base_dir) / stage_dir / 'prompts' / spec)
-        
-        # Also try full qualified under base_dir if provided
-        if base_dir:
-            candidates.append(Path(base_dir) / spec)
-        
-        # Filter unique and existing
-        tried = []
-        for c in candidates:
-            c = c.resolve()
-            if c in tried:
-                continue
-            tried.append(c)
-            if c.exists() and c.is_file():
-                try:
-                    return c.read_text(encoding='utf-8')
-                except Exception as e:
-                    # Try without encoding fallback
-                    return c.read_text()
-        
-        # If nothing matched, raise
-        raise FileNotFoundError(f"No prompt file found for spec '{prompt_spec}'. Tried: {', '.join(str(t) for t in tried)}")
     
     async def _validate_stage_outputs(
         self, 
@@ -414,7 +1198,7 @@ class SDLCPipelineOrchestrator:
         
         validation_result = await self.validation_engine.validate(
             outputs=outputs,
-            rules=stage.validation_rules,
+            rules=stage.parsed_validation_rules if stage.parsed_validation_rules is not None else stage.validation_rules,
             quality_gates=stage.quality_gates
         )
         
@@ -433,8 +1217,12 @@ class SDLCPipelineOrchestrator:
         stage: StageDefinition, 
         outputs: Dict[str, Any], 
         context: PipelineContext
-    ) -> Dict[str, Any]:
-        """Handle human approval gates"""
+    ) -> str:
+        """Create a human approval request and return its id.
+        
+        The execution is parked once its current level settles and resumes when
+        approve_request or reject_request records a decision.
+        """
         
         # Create approval request
         approval_request = {
@@ -442,6 +1230,7 @@ class SDLCPipelineOrchestrator:
             "stage_name": stage.name,
             "outputs": outputs,
             "reviewers": stage.reviewers,
+            "status": "pending",
             "created_at": datetime.utcnow().isoformat()
         }
         
@@ -450,57 +1239,342 @@ class SDLCPipelineOrchestrator:
             context.execution_id, approval_request
         )
         
-        # For now, simulate approval (in real implementation, this would wait for human input)
-        # This could integrate with Slack, email, or web UI for approvals
-        approval_result = {
-            "approved": True,  # This would come from actual approval system
-            "approver": "system",
-            "approved_at": datetime.utcnow().isoformat(),
-            "comments": "Auto-approved for demo"
+        await self.event_bus.publish(
+            "approval_required",
+            context.execution_id,
+            approval_id=approval_id,
+            stage_id=stage.stage_id,
+            stage_name=stage.name,
+            reviewers=stage.reviewers
+        )
+        return approval_id
+    
+    async def _park_execution(self, execution_id: str):
+        """Checkpoint an execution waiting on approvals to disk and release it from memory"""
+        
+        execution_state = self.active_executions[execution_id]
+        context = execution_state["context"]
+        plan = execution_state["plan"]
+        
+        pending_approvals = {
+            output["approval_id"]: stage_id
+            for stage_id, output in context.stage_outputs.items()
+            if output.get("status") == "awaiting_approval"
+        }
+        
+        parked = {
+            "execution_id": execution_id,
+            "pipeline_id": context.project_id,
+            # Resumed against the definition it started with, even if the pipeline changes meanwhile
+            "pipeline_def": plan.definition,
+            "status": ExecutionStatus.AWAITING_APPROVAL.value,
+            "total_stages": len(plan.stages),
+            "pending_approvals": pending_approvals,
+            "context": asdict(context),
+            "parked_at": datetime.utcnow().isoformat()
         }
         
-        return approval_result
+        async with self._parked_lock:
+            await self.artifact_manager.store_parked_execution(execution_id, parked)
+            self.active_executions.pop(execution_id, None)
+            self.logger.info(
+                f"Parked execution {execution_id} awaiting {len(pending_approvals)} approval(s)"
+            )
+            
+            # Decisions may have arrived while the rest of the level was running
+            await self._apply_approval_decisions(execution_id)
     
-    async def _store_stage_artifacts(
+    async def approve_request(
+        self, 
+        approval_id: str, 
+        approver: str = "unknown", 
+        comments: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Approve a pending stage approval request, resuming the execution when nothing else is pending"""
+        return await self._decide_approval(approval_id, True, approver, comments)
+    
+    async def reject_request(
+        self, 
+        approval_id: str, 
+        approver: str = "unknown", 
+        comments: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Reject a pending stage approval request, failing the execution"""
+        return await self._decide_approval(approval_id, False, approver, comments)
+    
+    async def list_approval_requests(
+        self, 
+        execution_id: Optional[str] = None, 
+        status: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """List stored approval requests in (created_at, approval id) order"""
+        return await self.artifact_manager.list_approval_requests(execution_id, status, after, limit)
+    
+    async def _decide_approval(
+        self, 
+        approval_id: str, 
+        approved: bool, 
+        approver: str, 
+        comments: Optional[str]
+    ) -> Dict[str, Any]:
+        """Record an approval decision and apply it to the parked execution"""
+        
+        async with self._parked_lock:
+            request = await self.artifact_manager.load_approval_request(approval_id)
+            if request is None:
+                raise ValueError(f"Approval request {approval_id} not found")
+            if request.get("status", "pending") != "pending":
+                raise ValueError(f"Approval request {approval_id} is already {request['status']}")
+            
+            decision = {
+                "status": "approved" if approved else "rejected",
+                "approver": approver,
+                "approved_at": datetime.utcnow().isoformat(),
+                "comments": comments
+            }
+            await self.artifact_manager.update_approval_request(approval_id, decision)
+            
+            # Executions still finishing their level pick the decision up when they park
+            await self._apply_approval_decisions(request["execution_id"])
+        
+        return {**request, **decision}
+    
+    async def _apply_approval_decisions(self, execution_id: str):
+        """Apply recorded decisions to a parked execution, failing or resuming it (caller holds _parked_lock)"""
+        
+        parked = await self.artifact_manager.load_parked_execution(execution_id)
+        if parked is None:
+            return
+        
+        decided = []
+        for approval_id, stage_id in parked["pending_approvals"].items():
+            request = await self.artifact_manager.load_approval_request(approval_id)
+            if request is not None and request.get("status", "pending") != "pending":
+                decided.append((approval_id, stage_id, request))
+        if not decided:
+            return
+        
+        context = PipelineContext(**parked["context"])
+        plan = None
+        
+        for approval_id, stage_id, request in decided:
+            parked["pending_approvals"].pop(approval_id)
+            stage_output = context.stage_outputs[stage_id]
+            stage_output["approval"] = {
+                key: request.get(key) for key in ("status", "approver", "approved_at", "comments")
+            }
+            if "timings" in stage_output and request.get("created_at") and request.get("approved_at"):
+                # Spans a park (and possibly a restart), so measured on the wall clock
+                stage_output["timings"]["phases"]["approval_wait"] = round((
+                    datetime.fromisoformat(request["approved_at"]) - datetime.fromisoformat(request["created_at"])
+                ).total_seconds(), 6)
+            
+            if request["status"] != "approved":
+                stage_output["status"] = "failed"
+                stage_output["error"] = f"Stage approval rejected: {request.get('comments') or 'no reason given'}"
+                context.metadata["end_time"] = datetime.utcnow().isoformat()
+                failed_state = {
+                    "status": ExecutionStatus.FAILED,
+                    "context": context,
+                    "current_stage": stage_id,
+                    "total_stages": parked["total_stages"]
+                }
+                await self._store_execution_state(execution_id, failed_state)
+                await self.artifact_manager.delete_parked_execution(execution_id)
+                await self._publish_execution_status(execution_id, failed_state)
+                self.logger.info(f"Approval {approval_id} rejected; execution {execution_id} failed")
+                return
+            
+            if plan is None:
+                plan = self._compile_execution_plan(parked["pipeline_def"])
+            
+            stage_output["status"] = "completed"
+            stage_output["repositories"] = await self._enqueue_stage_publishing(
+                plan.stage(stage_id), stage_output["outputs"], context
+            )
+        
+        if parked["pending_approvals"]:
+            parked["context"] = asdict(context)
+            await self.artifact_manager.store_parked_execution(execution_id, parked)
+            return
+        
+        # Nothing else pending: rehydrate and continue with the next stages
+        await self.artifact_manager.delete_parked_execution(execution_id)
+        self._register_execution(plan, context)
+        # Already-admitted work resumes without queueing behind new executions
+        self.admission.admit(execution_id)
+        asyncio.create_task(self._execute_pipeline_async(execution_id))
+        self.logger.info(f"Resumed execution {execution_id} after approval")
+    
+    async def _enqueue_stage_publishing(
         self, 
         stage: StageDefinition, 
         outputs: Dict[str, Any], 
         context: PipelineContext
     ) -> Dict[str, Any]:
-        """Store stage artifacts in external repositories"""
+        """Queue stage artifacts for background publishing and return the pending status map"""
         
-        repository_results = {}
+        if not stage.repository_configs:
+            return {}
         
-        for repo_config in stage.repository_configs:
-            try:
-                # Get repository connector
-                connector = self.repository_factory.get_connector(repo_config["type"])
-                
-                # Prepare artifacts for storage
-                artifacts = await self._prepare_artifacts_for_storage(
-                    outputs, repo_config, context
-                )
-                
-                # Store artifacts
-                storage_result = await connector.store_artifacts(
-                    artifacts=artifacts,
-                    config=repo_config,
-                    context=context
-                )
-                
-                repository_results[repo_config["name"]] = storage_result
-                
-                self.logger.info(
-                    f"Stored artifacts in {repo_config['type']}: {repo_config['name']}"
-                )
-                
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to store artifacts in {repo_config['name']}: {str(e)}"
-                )
-                repository_results[repo_config["name"]] = {"error": str(e)}
+        job_id = await self.publishing_outbox.enqueue({
+            "execution_id": context.execution_id,
+            "project_id": context.project_id,
+            "stage_id": stage.stage_id,
+            "repository_configs": stage.repository_configs,
+            "max_parallel_publishing": stage.max_parallel_publishing,
+            "outputs": outputs
+        })
+        
+        return {
+            repo_config["name"]: {"status": "pending", "job_id": job_id}
+            for repo_config in stage.repository_configs
+        }
+    
+    async def _publish_outbox_job(self, job: Dict[str, Any]):
+        """Outbox handler: publish to the job's remaining repositories, raising to retry failures"""
+        
+        execution_state = self.active_executions.get(job["execution_id"])
+        if execution_state is not None:
+            context = execution_state["context"]
+        else:
+            # Recovered after a restart; connectors only need the identifiers
+            context = SimpleNamespace(execution_id=job["execution_id"], project_id=job["project_id"])
+        
+        repository_results = await self._store_stage_artifacts(
+            job["repository_configs"], job["outputs"], context, job.get("max_parallel_publishing")
+        )
+        
+        failed = [c for c in job["repository_configs"] if "error" in repository_results[c["name"]]]
+        statuses = {}
+        for name, result in repository_results.items():
+            if "error" in result:
+                statuses[name] = {**result, "status": "retrying", "attempts": job["attempts"]}
+            else:
+                statuses[name] = {**result, "status": "published", "attempts": job["attempts"]}
+        await self._record_publish_status(job, statuses)
+        
+        if failed:
+            # Retry only the repositories that have not been published yet
+            job["repository_configs"] = failed
+            job["errors"] = {c["name"]: repository_results[c["name"]]["error"] for c in failed}
+            raise RuntimeError(
+                f"Publishing failed for {', '.join(c['name'] for c in failed)}"
+            )
+    
+    async def _on_publish_job_failed(self, job: Dict[str, Any], error: Exception):
+        """Record repositories that could not be published after the last attempt"""
+        await self._record_publish_status(job, {
+            repo_config["name"]: {
+                "error": job.get("errors", {}).get(repo_config["name"], str(error)),
+                "status": "failed",
+                "attempts": job["attempts"]
+            }
+            for repo_config in job["repository_configs"]
+        })
+    
+    async def _record_publish_status(self, job: Dict[str, Any], statuses: Dict[str, Dict[str, Any]]):
+        """Update stage_outputs[...]['repositories'] for a publishing job"""
+        
+        execution_state = self.active_executions.get(job["execution_id"])
+        if execution_state is None:
+            if not await self._record_parked_publish_status(job, statuses):
+                summary = ", ".join(f"{name}={entry['status']}" for name, entry in statuses.items())
+                self.logger.info(f"Publishing status for {job['execution_id']}/{job['stage_id']}: {summary}")
+            return
+        
+        stage_output = execution_state["context"].stage_outputs.get(job["stage_id"])
+        if stage_output is None:
+            return
+        stage_output.setdefault("repositories", {}).update(statuses)
+        
+        # Finished executions were already persisted; refresh the stored result
+        if execution_state["status"] in (
+            ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED
+        ):
+            await self._store_execution_state(job["execution_id"], execution_state)
+    
+    async def _record_parked_publish_status(self, job: Dict[str, Any], statuses: Dict[str, Dict[str, Any]]) -> bool:
+        """Update publishing status inside a parked execution's checkpoint"""
+        
+        async with self._parked_lock:
+            execution_state = self.active_executions.get(job["execution_id"])
+            if execution_state is not None:
+                # Resumed while waiting for the lock
+                execution_state["context"].stage_outputs.get(job["stage_id"], {}).setdefault(
+                    "repositories", {}
+                ).update(statuses)
+                return True
+            
+            parked = await self.artifact_manager.load_parked_execution(job["execution_id"])
+            if parked is None:
+                return False
+            stage_output = parked["context"]["stage_outputs"].get(job["stage_id"])
+            if stage_output is None:
+                return False
+            stage_output.setdefault("repositories", {}).update(statuses)
+            await self.artifact_manager.store_parked_execution(job["execution_id"], parked)
+            return True
+    
+    async def _store_stage_artifacts(
+        self, 
+        repository_configs: List[Dict[str, Any]], 
+        outputs: Dict[str, Any], 
+        context: PipelineContext,
+        max_parallelism: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Store stage artifacts in external repositories concurrently"""
+        
+        semaphore = asyncio.Semaphore(max_parallelism or len(repository_configs) or 1)
+        
+        async def store(repo_config: Dict[str, Any]) -> Dict[str, Any]:
+            timeout = repo_config.get("timeout_seconds", self.repository_timeout_seconds)
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    # Get repository connector
+                    connector = self.repository_factory.get_connector(repo_config["type"])
+                    
+                    # Prepare artifacts for storage
+                    artifacts = await self._prepare_artifacts_for_storage(
+                        outputs, repo_config, context
+                    )
+                    
+                    # Store artifacts, bounded by the repository's timeout
+                    storage_result = await asyncio.wait_for(
+                        connector.store_artifacts(
+                            artifacts=artifacts,
+                            config=repo_config,
+                            context=context
+                        ),
+                        timeout=timeout
+                    )
+                    
+                    self.logger.info(
+                        f"Stored artifacts in {repo_config['type']}: {repo_config['name']}"
+                    )
+                    return {**storage_result, "duration_seconds": round(time.perf_counter() - started, 6)}
+                    
+                except asyncio.TimeoutError:
+                    self.logger.error(
+                        f"Timed out storing artifacts in {repo_config['name']} after {timeout}s"
+                    )
+                    return {"error": f"Timed out after {timeout}s"}
+                    
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to store artifacts in {repo_config['name']}: {str(e)}"
+                    )
+                    return {"error": str(e)}
+        
+        results = await asyncio.gather(*(store(repo_config) for repo_config in repository_configs))
         
-        return repository_results
+        return {
+            repo_config["name"]: result
+            for repo_config, result in zip(repository_configs, results)
+        }
     
     async def _prepare_artifacts_for_storage(
         self, 
@@ -551,17 +1625,9 @@ class SDLCPipelineOrchestrator:
         script_content = script_config.get("script", "")
         
         if script_type == "python":
-            # Execute Python transformation
+            # Execute Python transformation in the sandboxed worker pool
             try:
-                # Create safe execution environment
-                exec_globals = {
-                    "artifact": artifact,
-                    "json": json,
-                    "datetime": datetime
-                }
-                
-                exec(script_content, exec_globals)
-                return exec_globals["artifact"]
+                return await self.transformation_sandbox.run(artifact, script_content)
                 
             except Exception as e:
                 self.logger.error(f"Transformation script failed: {str(e)}")
@@ -569,32 +1635,74 @@ class SDLCPipelineOrchestrator:
         
         return artifact
     
+    def _precompile_transformation_scripts(self, pipeline_def: Dict[str, Any]):
+        """Compile Python transformation scripts referenced by a pipeline definition"""
+        
+        for stage_config in pipeline_def.get("stages", []):
+            for repo_config in stage_config.get("repositories", []):
+                for mapping in repo_config.get("artifact_mappings", []):
+                    script_config = mapping.get("transformation_script")
+                    if not script_config or script_config.get("type", "python") != "python":
+                        continue
+                    try:
+                        self.transformation_sandbox.compile(script_config.get("script", ""))
+                    except SyntaxError as e:
+                        self.logger.warning(
+                            f"Transformation script in stage {stage_config.get('id')} does not compile: {str(e)}"
+                        )
+    
     def _build_execution_graph(self, stages: List[StageDefinition]) -> List[List[StageDefinition]]:
         """Build execution graph based on dependencies"""
+        return build_execution_levels(stages)
+    
+    def _compile_execution_plan(self, pipeline_def: Dict[str, Any]) -> ExecutionPlan:
+        """Compile a pipeline definition into a plan, reusing a cached plan with equal content"""
+        
+        content_hash = hash_pipeline_definition(pipeline_def)
+        plan = self._plans_by_hash.get(content_hash)
+        if plan is not None:
+            return plan
+        
+        stages = [StageDefinition(stage_config) for stage_config in pipeline_def["stages"]]
+        for stage in stages:
+            stage.prompt_handle = self.prompt_catalog.handle(stage.prompt_template, stage.stage_type.value)
+            if stage.fan_out and stage.fan_out.get("reduce_prompt"):
+                stage.reduce_prompt_handle = self.prompt_catalog.handle(
+                    stage.fan_out["reduce_prompt"], stage.stage_type.value
+                )
+            try:
+                stage.parsed_validation_rules = self.validation_engine.parse_rules(stage.validation_rules)
+            except Exception as e:
+                # Leave raw rules in place; the error surfaces when the stage is validated
+                self.logger.warning(f"Could not pre-parse validation rules for stage {stage.stage_id}: {str(e)}")
         
-        # Simple topological sort implementation
-        # In production, use more sophisticated dependency resolution
-        
-        executed = set()
-        execution_order = []
-        
-        while len(executed) < len(stages):
-            ready_stages = []
-            
-            for stage in stages:
-                if stage.stage_id not in executed:
-                    # Check if all dependencies are satisfied
-                    deps_satisfied = all(dep in executed for dep in stage.dependencies)
-                    if deps_satisfied:
-                        ready_stages.append(stage)
-            
-            if not ready_stages:
-                raise ValueError("Circular dependency detected in pipeline stages")
-            
-            execution_order.append(ready_stages)
-            executed.update(stage.stage_id for stage in ready_stages)
+        return ExecutionPlan.compile(pipeline_def, stages, content_hash)
+    
+    def _cache_plan(self, pipeline_id: str, plan: ExecutionPlan):
+        """Make ``plan`` the pipeline's cached plan, dropping the one it replaces"""
+        self._evict_plan(pipeline_id)
+        self._plans[pipeline_id] = plan
+        self._plans_by_hash[plan.content_hash] = plan
+    
+    def _evict_plan(self, pipeline_id: str):
+        """Drop a pipeline's cached plan; its content entry goes once no pipeline uses it"""
+        plan = self._plans.pop(pipeline_id, None)
+        if plan is not None and not any(
+            other.content_hash == plan.content_hash for other in self._plans.values()
+        ):
+            self._plans_by_hash.pop(plan.content_hash, None)
+    
+    async def _get_execution_plan(self, pipeline_id: str) -> ExecutionPlan:
+        """Return the cached plan for a pipeline, compiling it from storage on a miss"""
         
-        return execution_order
+        plan = self._plans.get(pipeline_id)
+        if plan is None:
+            pipeline_def = await self.artifact_manager.load_pipeline_definition(pipeline_id)
+            if pipeline_def is None:
+                raise ValueError(f"Pipeline not found: {pipeline_id}")
+            plan = self._compile_execution_plan(pipeline_def)
+            self._cache_plan(pipeline_id, plan)
+        return plan
     
     async def _validate_pipeline_definition(self, pipeline_def: Dict[str, Any]):
         """Validate pipeline definition structure and dependencies"""
@@ -615,6 +1723,10 @@ class SDLCPipelineOrchestrator:
                 raise ValueError(f"Duplicate stage ID: {stage_id}")
             
             stage_ids.add(stage_id)
+            
+            fan_out = stage_config.get("fan_out")
+            if fan_out is not None and (not isinstance(fan_out, dict) or "items" not in fan_out):
+                raise ValueError(f"Stage {stage_id} fan_out requires an 'items' source")
         
         # Validate dependencies
         for stage_config in pipeline_def["stages"]:
@@ -626,19 +1738,141 @@ class SDLCPipelineOrchestrator:
         """Get current status of pipeline execution"""
         
         if execution_id not in self.active_executions:
+            parked = await self.artifact_manager.load_parked_execution(execution_id)
+            if parked is not None:
+                stage_outputs = parked["context"]["stage_outputs"]
+                total_stages = parked["total_stages"]
+                return {
+                    "execution_id": execution_id,
+                    "status": parked["status"],
+                    "current_stage": None,
+                    "completed_stages": list(stage_outputs.keys()),
+                    "start_time": parked["context"]["metadata"].get("start_time"),
+                    "progress": (len(stage_outputs) / total_stages) * 100 if total_stages > 0 else 0,
+                    "pending_approvals": list(parked["pending_approvals"].keys())
+                }
+            
             # Try to load from persistent storage
             return await self.artifact_manager.load_execution_result(execution_id)
         
         execution_state = self.active_executions[execution_id]
         
-        return {
+        status = {
             "execution_id": execution_id,
             "status": execution_state["status"].value,
             "current_stage": execution_state.get("current_stage"),
             "completed_stages": list(execution_state["context"].stage_outputs.keys()),
             "start_time": execution_state["context"].metadata.get("start_time"),
-            "progress": self._calculate_progress(execution_state)
+            "progress": self._calculate_progress(execution_state),
+            "queue": self.admission.stats()
+        }
+        position = self.admission.position(execution_id)
+        if position is not None:
+            status["queue_position"] = position
+            status["estimated_wait_seconds"] = self.admission.estimated_wait(position)
+        return status
+    
+    async def get_execution_details(self, execution_id: str, include_outputs: bool = True) -> Optional[Dict[str, Any]]:
+        """Full execution document (inputs, stage outputs, timing) for active, parked or stored executions"""
+        
+        execution_state = self.active_executions.get(execution_id)
+        if execution_state is not None:
+            context = execution_state["context"]
+            return self._execution_document(
+                execution_id,
+                execution_state["status"].value,
+                {
+                    "project_id": context.project_id,
+                    "stage_outputs": context.stage_outputs,
+                    "metadata": context.metadata,
+                    "user_inputs": context.user_inputs
+                },
+                execution_state.get("current_stage"),
+                len(execution_state["plan"].stages),
+                include_outputs
+            )
+        
+        parked = await self.artifact_manager.load_parked_execution(execution_id)
+        if parked is not None:
+            return self._execution_document(
+                execution_id, parked["status"], parked["context"], None, parked["total_stages"], include_outputs
+            )
+        
+        stored = await self.artifact_manager.load_execution_result(execution_id)
+        if stored is None:
+            return None
+        state = stored.get("execution_state", {})
+        # Results written before contexts were serialized as dicts only carry a repr
+        context = state.get("context")
+        if not isinstance(context, dict):
+            context = {"project_id": None, "stage_outputs": {}, "metadata": {}, "user_inputs": {}}
+        total_stages = state.get("total_stages") or len(state.get("pipeline_def", {}).get("stages", []))
+        status = str(state.get("status", "")).split(".")[-1].lower()
+        return self._execution_document(
+            execution_id, status, context, state.get("current_stage"), total_stages, include_outputs
+        )
+    
+    def _execution_document(
+        self, 
+        execution_id: str, 
+        status: str, 
+        context: Dict[str, Any], 
+        current_stage: Optional[str], 
+        total_stages: int,
+        include_outputs: bool
+    ) -> Dict[str, Any]:
+        stage_outputs = context.get("stage_outputs", {})
+        metadata = context.get("metadata", {})
+        
+        document = {
+            "execution_id": execution_id,
+            "pipeline_id": context.get("project_id"),
+            "status": status,
+            "current_stage": current_stage,
+            "completed_stages": [
+                stage_id for stage_id, output in stage_outputs.items() if output.get("status") == "completed"
+            ],
+            "start_time": metadata.get("start_time"),
+            "end_time": metadata.get("end_time"),
+            "progress": (len(stage_outputs) / total_stages) * 100 if total_stages else 0,
+            "user_inputs": context.get("user_inputs", {}),
+            "error_message": next(
+                (output.get("error") for output in stage_outputs.values() if output.get("status") == "failed"),
+                None
+            )
         }
+        if include_outputs:
+            document["stage_outputs"] = stage_outputs
+            # Set once the execution finishes
+            document["critical_path"] = metadata.get("critical_path")
+        return document
+    
+    async def list_executions(
+        self, 
+        pipeline_id: Optional[str] = None, 
+        after: Optional[Tuple[str, str]] = None, 
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Execution summaries ordered by (start_time, execution id), starting after the given key.
+        
+        Executions are indexed when created, so a page reads only its own rows.
+        """
+        
+        summaries = []
+        while len(summaries) < limit:
+            wanted = limit - len(summaries)
+            documents = await self.artifact_manager.list_documents(
+                "execution", after, wanted, pipeline_id=pipeline_id or None
+            )
+            for document in documents:
+                # Rows of executions dropped before they stored anything have no details
+                summary = await self.get_execution_details(document["id"], include_outputs=False)
+                if summary is not None:
+                    summaries.append(summary)
+            if len(documents) < wanted:
+                break
+            after = (documents[-1]["created_at"], documents[-1]["id"])
+        return summaries
     
     def _calculate_progress(self, execution_state: Dict[str, Any]) -> float:
         """Calculate execution progress percentage"""
@@ -648,10 +1882,16 @@ class SDLCPipelineOrchestrator:
         return (completed_stages / total_stages) * 100 if total_stages > 0 else 0
     
     async def pause_execution(self, execution_id: str):
-        """Pause pipeline execution"""
+        """Pause pipeline execution, interrupting in-flight stages"""
         if execution_id in self.active_executions:
-            self.active_executions[execution_id]["status"] = ExecutionStatus.PAUSED
+            execution_state = self.active_executions[execution_id]
+            if execution_state["status"] != ExecutionStatus.RUNNING:
+                return
+            execution_state["status"] = ExecutionStatus.PAUSED
+            self._pause_gates[execution_id].clear()
+            self._cancel_stage_tasks(execution_id)
             self.logger.info(f"Paused execution {execution_id}")
+            await self._publish_execution_status(execution_id, execution_state)
     
     async def resume_execution(self, execution_id: str):
         """Resume paused pipeline execution"""
@@ -659,13 +1899,55 @@ class SDLCPipelineOrchestrator:
             execution_state = self.active_executions[execution_id]
             if execution_state["status"] == ExecutionStatus.PAUSED:
                 execution_state["status"] = ExecutionStatus.RUNNING
+                self._pause_gates[execution_id].set()
                 self.logger.info(f"Resumed execution {execution_id}")
+                await self._publish_execution_status(execution_id, execution_state)
     
     async def cancel_execution(self, execution_id: str):
-        """Cancel pipeline execution"""
+        """Cancel pipeline execution, including in-flight provider and connector calls"""
+        if execution_id not in self.active_executions:
+            # Parked executions have no tasks; settle them on disk
+            async with self._parked_lock:
+                parked = await self.artifact_manager.load_parked_execution(execution_id)
+                if parked is not None:
+                    context = PipelineContext(**parked["context"])
+                    context.metadata["end_time"] = datetime.utcnow().isoformat()
+                    cancelled_state = {
+                        "status": ExecutionStatus.CANCELLED,
+                        "context": context,
+                        "current_stage": None,
+                        "total_stages": parked["total_stages"]
+                    }
+                    await self._store_execution_state(execution_id, cancelled_state)
+                    await self.artifact_manager.delete_parked_execution(execution_id)
+                    await self._publish_execution_status(execution_id, cancelled_state)
+                    self.logger.info(f"Cancelled parked execution {execution_id}")
+            return
+        
+        execution_state = self.active_executions[execution_id]
+        if execution_state["status"] == ExecutionStatus.QUEUED:
+            # Never started: drop it from the queue and settle it here
+            self.admission.remove(execution_id)
+            execution_state["status"] = ExecutionStatus.CANCELLED
+            execution_state["context"].metadata["end_time"] = datetime.utcnow().isoformat()
+            self.active_executions.pop(execution_id, None)
+            self._pause_gates.pop(execution_id, None)
+            await self._store_execution_state(execution_id, execution_state)
+            await self._publish_execution_status(execution_id, execution_state)
+            self.logger.info(f"Cancelled queued execution {execution_id}")
+            return
+        
         if execution_id in self.active_executions:
             self.active_executions[execution_id]["status"] = ExecutionStatus.CANCELLED
+            self._cancel_stage_tasks(execution_id)
+            if execution_id in self._pause_gates:
+                self._pause_gates[execution_id].set()
             self.logger.info(f"Cancelled execution {execution_id}")
+    
+    def _cancel_stage_tasks(self, execution_id: str):
+        """Cancel all in-flight stage tasks of an execution"""
+        for task in list(self._stage_tasks.get(execution_id, ())):
+            task.cancel()
 
 # Example usage
 if __name__ == "__main__":
@@ -681,6 +1963,7 @@ if __name__ == "__main__":
         
         # Create orchestrator
         orchestrator = SDLCPipelineOrchestrator(config)
+        await orchestrator.start()
         
         # Load pipeline definition
         with open("pipeline/definitions/full-sdlc-pipeline.yaml", "r") as f:
@@ -702,14 +1985,12 @@ if __name__ == "__main__":
         
         print(f"Started pipeline execution: {execution_id}")
         
-        # Monitor execution
-        while True:
-            status = await orchestrator.get_execution_status(execution_id)
-            print(f"Status: {status['status']}, Progress: {status['progress']}%")
-            
-            if status['status'] in ['completed', 'failed', 'cancelled']:
-                break
-            
-            await asyncio.sleep(5)
+        # Monitor execution via pushed status events
+        with orchestrator.event_bus.subscribe(execution_id, event_types=["execution_status"]) as events:
+            async for event in events:
+                print(f"Status: {event['status']}, Progress: {event['progress']}%")
+                
+                if event['status'] in ['completed', 'failed', 'cancelled']:
+                    break
     
     asyncio.run(main())
@@ -8,6 +8,20 @@ __all__ = [
     "repository_connectors",
     "workflow_engine",
     "validation_engine",
+    "prompt_catalog",
+    "transformation_sandbox",
+    "execution_plan",
+    "publishing_outbox",
+    "event_bus",
+    "api_server",
+    "stage_profiler",
+    "admission_control",
+    "execution_planner",
+    "artifact_index",
+    "blob_store",
+    "artifact_compression",
+    "storage_quota",
+    "artifact_versions",
 ]
 
 __version__ = "0.1.0"
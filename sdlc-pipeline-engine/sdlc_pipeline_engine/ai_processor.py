@@ -8,6 +8,6 @@ ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
 if ENGINE_ROOT not in sys.path:
     sys.path.insert(0, ENGINE_ROOT)
 
-from ai_prompt_processors import AIPromptProcessor  # noqa: E402
+from ai_prompt_processors import AIPromptProcessor, ProviderAPIError  # noqa: E402
 
-__all__ = ["AIPromptProcessor"]
+__all__ = ["AIPromptProcessor", "ProviderAPIError"]
@@ -0,0 +1,12 @@
+# Adapter module to expose PipelineAPIServer under package namespace
+import os
+import sys
+
+# Ensure engine root (where api_server.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from api_server import PipelineAPIServer, encode_cursor, decode_cursor, decode_keyset_cursor  # noqa: E402
+
+__all__ = ["PipelineAPIServer", "encode_cursor", "decode_cursor", "decode_keyset_cursor"]
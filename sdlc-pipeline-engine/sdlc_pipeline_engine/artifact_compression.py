@@ -0,0 +1,26 @@
+# Adapter module to expose ArtifactCompressor under package namespace
+import os
+import sys
+
+# Ensure engine root (where artifact_compression.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from artifact_compression import (  # noqa: E402
+    ArtifactCompressor,
+    codec_family,
+    CODEC_IDENTITY,
+    CODEC_GZIP,
+    CODEC_ZSTD,
+    CODEC_SUFFIXES,
+)
+
+__all__ = [
+    "ArtifactCompressor",
+    "codec_family",
+    "CODEC_IDENTITY",
+    "CODEC_GZIP",
+    "CODEC_ZSTD",
+    "CODEC_SUFFIXES",
+]
@@ -0,0 +1,12 @@
+# Adapter module to expose ArtifactIndexStore under package namespace
+import os
+import sys
+
+# Ensure engine root (where artifact_index.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from artifact_index import ArtifactIndexStore, ARTIFACT_COLUMNS, DOCUMENT_COLUMNS  # noqa: E402
+
+__all__ = ["ArtifactIndexStore", "ARTIFACT_COLUMNS", "DOCUMENT_COLUMNS"]
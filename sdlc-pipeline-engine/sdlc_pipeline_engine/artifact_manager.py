@@ -7,6 +7,6 @@ ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
 if ENGINE_ROOT not in sys.path:
     sys.path.insert(0, ENGINE_ROOT)
 
-from artifact_manager import ArtifactManager  # noqa: E402
+from artifact_manager import Artifact, ArtifactManager, ArtifactRecord  # noqa: E402
 
-__all__ = ["ArtifactManager"]
+__all__ = ["Artifact", "ArtifactManager", "ArtifactRecord"]
@@ -0,0 +1,12 @@
+# Adapter module to expose artifact version deltas under package namespace
+import os
+import sys
+
+# Ensure engine root (where artifact_versions.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from artifact_versions import CODEC_DELTA, compute_delta, apply_delta, unified_diff  # noqa: E402
+
+__all__ = ["CODEC_DELTA", "compute_delta", "apply_delta", "unified_diff"]
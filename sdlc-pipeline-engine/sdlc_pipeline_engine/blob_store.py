@@ -0,0 +1,12 @@
+# Adapter module to expose BlobStore under package namespace
+import os
+import sys
+
+# Ensure engine root (where blob_store.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from blob_store import BlobStore  # noqa: E402
+
+__all__ = ["BlobStore"]
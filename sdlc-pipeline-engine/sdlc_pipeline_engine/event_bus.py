@@ -0,0 +1,12 @@
+# Adapter module to expose ExecutionEventBus under package namespace
+import os
+import sys
+
+# Ensure engine root (where event_bus.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from event_bus import ExecutionEventBus, EventSubscription, EVENT_TYPES  # noqa: E402
+
+__all__ = ["ExecutionEventBus", "EventSubscription", "EVENT_TYPES"]
@@ -0,0 +1,12 @@
+# Adapter module to expose ExecutionPlan under package namespace
+import os
+import sys
+
+# Ensure engine root (where execution_plan.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from execution_plan import ExecutionPlan, build_execution_levels, hash_pipeline_definition  # noqa: E402
+
+__all__ = ["ExecutionPlan", "build_execution_levels", "hash_pipeline_definition"]
@@ -0,0 +1,12 @@
+# Adapter module to expose the execution planner under package namespace
+import os
+import sys
+
+# Ensure engine root (where execution_planner.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from execution_planner import StageStatistics, ExecutionPlanner  # noqa: E402
+
+__all__ = ["StageStatistics", "ExecutionPlanner"]
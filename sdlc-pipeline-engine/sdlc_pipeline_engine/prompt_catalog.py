@@ -0,0 +1,12 @@
+# Adapter module to expose PromptCatalog under package namespace
+import os
+import sys
+
+# Ensure engine root (where prompt_catalog.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from prompt_catalog import PromptCatalog, PromptHandle, STAGE_DIRECTORIES  # noqa: E402
+
+__all__ = ["PromptCatalog", "PromptHandle", "STAGE_DIRECTORIES"]
@@ -0,0 +1,12 @@
+# Adapter module to expose PublishingOutbox under package namespace
+import os
+import sys
+
+# Ensure engine root (where publishing_outbox.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from publishing_outbox import PublishingOutbox  # noqa: E402
+
+__all__ = ["PublishingOutbox"]
@@ -0,0 +1,17 @@
+# Adapter module to expose stage profiling helpers under package namespace
+import os
+import sys
+
+# Ensure engine root (where stage_profiler.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from stage_profiler import (  # noqa: E402
+    StageProfile, stage_profile, profile_phase, current_profile, build_chrome_trace, build_otlp_trace
+)
+
+__all__ = [
+    "StageProfile", "stage_profile", "profile_phase", "current_profile",
+    "build_chrome_trace", "build_otlp_trace",
+]
@@ -0,0 +1,28 @@
+# Adapter module to expose StorageUsage under package namespace
+import os
+import sys
+
+# Ensure engine root (where storage_quota.py resides) is importable
+ENGINE_ROOT = os.path.dirname(os.path.dirname(__file__))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from storage_quota import (  # noqa: E402
+    StorageUsage,
+    StorageQuotaExceededError,
+    created_at_epoch,
+    QUOTA_POLICIES,
+    QUOTA_POLICY_REJECT,
+    QUOTA_POLICY_EVICT_LRU,
+    QUOTA_POLICY_EVICT_OLDEST_EXECUTION,
+)
+
+__all__ = [
+    "StorageUsage",
+    "StorageQuotaExceededError",
+    "created_at_epoch",
+    "QUOTA_POLICIES",
+    "QUOTA_POLICY_REJECT",
+    "QUOTA_POLICY_EVICT_LRU",
+    "QUOTA_POLICY_EVICT_OLDEST_EXECUTION",
+]
@@ -0,0 +1,188 @@
+"""
+Stage Profiler
+Per-phase stage timing on monotonic clocks and trace file export
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator, List, Optional
+
+# Profile of the stage running in the current task (inherited by tasks it spawns)
+_current_profile: ContextVar[Optional['StageProfile']] = ContextVar('stage_profile', default=None)
+
+
+class StageProfile:
+    """Accumulates time spent per phase of one stage attempt.
+
+    Durations come from ``time.perf_counter``; ``started_at`` is wall-clock time only
+    used to place spans in a trace. Phases of concurrent fan-out items are summed.
+    """
+
+    __slots__ = ('started_at', '_start', '_end', 'phases', 'counters', 'spans', 'record_spans')
+
+    def __init__(self, record_spans: bool = False):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        # Provider usage (calls, estimated input/output tokens) feeding execution planning
+        self.counters: Dict[str, int] = {}
+        # (phase, offset from stage start, duration) for trace export
+        self.spans: List[tuple] = []
+        self.record_spans = record_spans
+
+    def add(self, phase: str, duration: float, start: Optional[float] = None):
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+        if self.record_spans and start is not None:
+            self.spans.append((phase, start - self._start, duration))
+
+    def count(self, counter: str, value: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def finish(self) -> float:
+        if self._end is None:
+            self._end = time.perf_counter()
+        return self.elapsed
+
+    @property
+    def elapsed(self) -> float:
+        return (self._end if self._end is not None else time.perf_counter()) - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        timings = {
+            'started_at': self.started_at,
+            'total': round(self.elapsed, 6),
+            'phases': {phase: round(duration, 6) for phase, duration in self.phases.items()}
+        }
+        if self.counters:
+            timings['counters'] = dict(self.counters)
+        if self.record_spans:
+            timings['spans'] = [
+                {'phase': phase, 'offset': round(offset, 6), 'duration': round(duration, 6)}
+                for phase, offset, duration in self.spans
+            ]
+        return timings
+
+
+@contextmanager
+def stage_profile(profile: StageProfile) -> Iterator[StageProfile]:
+    """Make a profile current for the enclosed stage execution"""
+
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        profile.finish()
+        _current_profile.reset(token)
+
+
+@contextmanager
+def profile_phase(phase: str) -> Iterator[None]:
+    """Time a phase of the current stage; a no-op outside a stage"""
+
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(phase, time.perf_counter() - start, start)
+
+
+def current_profile() -> Optional[StageProfile]:
+    return _current_profile.get()
+
+
+def build_chrome_trace(execution_id: str, stage_outputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Chrome trace event format (chrome://tracing, Perfetto); one thread per stage"""
+
+    events = [{
+        'name': 'process_name', 'ph': 'M', 'pid': 1,
+        'args': {'name': f"execution {execution_id}"}
+    }]
+
+    for tid, (stage_id, output) in enumerate(stage_outputs.items(), start=1):
+        timings = output.get('timings')
+        if not timings:
+            continue
+        start_us = timings['started_at'] * 1e6
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': stage_id}})
+        events.append({
+            'name': stage_id, 'cat': 'stage', 'ph': 'X', 'pid': 1, 'tid': tid,
+            'ts': start_us, 'dur': timings['total'] * 1e6,
+            'args': {'status': output.get('status'), 'phases': timings['phases']}
+        })
+        for span in timings.get('spans', []):
+            events.append({
+                'name': span['phase'], 'cat': 'phase', 'ph': 'X', 'pid': 1, 'tid': tid,
+                'ts': start_us + span['offset'] * 1e6, 'dur': span['duration'] * 1e6
+            })
+
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def build_otlp_trace(execution_id: str, stage_outputs: Dict[str, Any]) -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest with one span per stage and child spans per phase"""
+
+    trace_id = execution_id.replace('-', '')[:32].ljust(32, '0')
+    spans = []
+
+    def span_id(n: int) -> str:
+        return f"{n:016x}"
+
+    def attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, float):
+            return {'key': key, 'value': {'doubleValue': value}}
+        return {'key': key, 'value': {'stringValue': str(value)}}
+
+    next_id = 1
+    for stage_id, output in stage_outputs.items():
+        timings = output.get('timings')
+        if not timings:
+            continue
+        start_ns = int(timings['started_at'] * 1e9)
+        stage_span = span_id(next_id)
+        next_id += 1
+        spans.append({
+            'traceId': trace_id,
+            'spanId': stage_span,
+            'name': f"stage {stage_id}",
+            'kind': 1,
+            'startTimeUnixNano': str(start_ns),
+            'endTimeUnixNano': str(start_ns + int(timings['total'] * 1e9)),
+            'attributes': [attribute('stage.id', stage_id), attribute('stage.status', output.get('status'))] + [
+                attribute(f"phase.{phase}.seconds", float(duration)) for phase, duration in timings['phases'].items()
+            ]
+        })
+        for span in timings.get('spans', []):
+            span_start = start_ns + int(span['offset'] * 1e9)
+            spans.append({
+                'traceId': trace_id,
+                'spanId': span_id(next_id),
+                'parentSpanId': stage_span,
+                'name': span['phase'],
+                'kind': 1,
+                'startTimeUnixNano': str(span_start),
+                'endTimeUnixNano': str(span_start + int(span['duration'] * 1e9)),
+                'attributes': []
+            })
+            next_id += 1
+
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': [
+                attribute('service.name', 'sdlc-pipeline-engine'),
+                attribute('execution.id', execution_id)
+            ]},
+            'scopeSpans': [{'scope': {'name': 'sdlc_orchestrator'}, 'spans': spans}]
+        }]
+    }
+
+
+__all__ = [
+    'StageProfile', 'stage_profile', 'profile_phase', 'current_profile',
+    'build_chrome_trace', 'build_otlp_trace'
+]
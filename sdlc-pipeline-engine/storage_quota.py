@@ -0,0 +1,160 @@
+"""
+Storage Quota
+Incrementally maintained artifact storage counters and least-recently-accessed tracking
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+QUOTA_POLICY_REJECT = 'reject'
+QUOTA_POLICY_EVICT_LRU = 'evict_lru'
+QUOTA_POLICY_EVICT_OLDEST_EXECUTION = 'evict_oldest_execution'
+QUOTA_POLICIES = (QUOTA_POLICY_REJECT, QUOTA_POLICY_EVICT_LRU, QUOTA_POLICY_EVICT_OLDEST_EXECUTION)
+
+
+class StorageQuotaExceededError(RuntimeError):
+    """Raised when an artifact does not fit within max_storage_size"""
+
+    def __init__(self, message: str, required_bytes: int, available_bytes: int):
+        super().__init__(message)
+        self.required_bytes = required_bytes
+        self.available_bytes = available_bytes
+
+
+def created_at_epoch(created_at: str) -> float:
+    """Epoch seconds of an artifact ``created_at`` (naive UTC ISO timestamp)"""
+    return datetime.fromisoformat(created_at).replace(tzinfo=timezone.utc).timestamp()
+
+
+class StorageUsage:
+    """Storage totals updated on every index change, so reading them is O(1).
+
+    ``stored_bytes`` is what the artifacts occupy on disk: each blob counts
+    once, at its compressed size, however many artifacts reference it.
+    Access recency is an ordered map (least recently used first); accesses
+    are also queued for a batched write to the index (see take_pending_access).
+    """
+
+    def __init__(self):
+        self.total_artifacts = 0
+        self.total_size = 0
+        self.stored_bytes = 0
+        self.by_type: Dict[str, Dict[str, int]] = {}
+        self.by_execution: Dict[str, Dict[str, int]] = {}
+
+        # blob -> [references, stored size]
+        self._blobs: Dict[str, List[int]] = {}
+        # artifact_id -> last access (epoch seconds), least recent first
+        self._access: 'OrderedDict[str, float]' = OrderedDict()
+        self._pending_access: Dict[str, float] = {}
+
+    def add(self, record: Any, accessed_at: Optional[float] = None):
+        self.total_artifacts += 1
+        self.total_size += record.size
+        for group, key in ((self.by_type, record.type), (self.by_execution, record.execution_id)):
+            entry = group.setdefault(key, {'count': 0, 'size': 0})
+            entry['count'] += 1
+            entry['size'] += record.size
+
+        stored_size = record.stored_size if record.stored_size is not None else record.size
+        if record.blob:
+            blob = self._blobs.get(record.blob)
+            if blob is None:
+                self._blobs[record.blob] = [1, stored_size]
+                self.stored_bytes += stored_size
+            else:
+                blob[0] += 1
+        else:
+            self.stored_bytes += stored_size
+
+        self._access[record.id] = accessed_at if accessed_at is not None else created_at_epoch(record.created_at)
+        self._access.move_to_end(record.id)
+
+    def remove(self, record: Any):
+        self.total_artifacts -= 1
+        self.total_size -= record.size
+        for group, key in ((self.by_type, record.type), (self.by_execution, record.execution_id)):
+            entry = group.get(key)
+            if entry is None:
+                continue
+            entry['count'] -= 1
+            entry['size'] -= record.size
+            if entry['count'] <= 0:
+                del group[key]
+
+        if record.blob:
+            blob = self._blobs.get(record.blob)
+            if blob is not None:
+                blob[0] -= 1
+                if blob[0] <= 0:
+                    self.stored_bytes -= blob[1]
+                    del self._blobs[record.blob]
+        else:
+            self.stored_bytes -= record.stored_size if record.stored_size is not None else record.size
+
+        self._access.pop(record.id, None)
+        self._pending_access.pop(record.id, None)
+
+    def holds_blob(self, blob: str) -> bool:
+        return blob in self._blobs
+
+    def sort_access(self):
+        """Re-establish recency order after a bulk load"""
+        self._access = OrderedDict(sorted(self._access.items(), key=lambda item: item[1]))
+
+    def touch(self, artifact_id: str, now: float) -> int:
+        """Record an access; returns the number of accesses waiting to be persisted"""
+        if artifact_id in self._access:
+            self._access[artifact_id] = now
+            self._access.move_to_end(artifact_id)
+            self._pending_access[artifact_id] = now
+        return len(self._pending_access)
+
+    def take_pending_access(self) -> Dict[str, float]:
+        pending, self._pending_access = self._pending_access, {}
+        return pending
+
+    def last_access(self, artifact_id: str) -> Optional[float]:
+        return self._access.get(artifact_id)
+
+    def least_recently_used(self, accessed_before: float) -> Iterator[Tuple[str, float]]:
+        """Artifacts not accessed since ``accessed_before``, least recent first.
+        Consume synchronously; recording accesses while iterating is not allowed.
+        """
+        for artifact_id, accessed_at in self._access.items():
+            if accessed_at >= accessed_before:
+                return
+            yield artifact_id, accessed_at
+
+    def bytes_freed_by(self, records: Iterable[Any]) -> int:
+        """Stored bytes released if all of ``records`` were deleted"""
+        released: Dict[str, int] = {}
+        return sum(self.release(record, released) for record in records)
+
+    def release(self, record: Any, released: Dict[str, int]) -> int:
+        """Stored bytes freed by deleting ``record`` in addition to the ones counted in ``released``
+        (blob -> references already released, updated in place)
+        """
+        if not record.blob:
+            return record.stored_size if record.stored_size is not None else record.size
+        blob = self._blobs.get(record.blob)
+        if blob is None:
+            return 0
+        released[record.blob] = released.get(record.blob, 0) + 1
+        return blob[1] if released[record.blob] == blob[0] else 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'total_artifacts': self.total_artifacts,
+            'total_size': self.total_size,
+            'total_stored_size': self.stored_bytes,
+            'by_type': {key: dict(value) for key, value in self.by_type.items()},
+            'by_execution': {key: dict(value) for key, value in self.by_execution.items()}
+        }
+
+
+__all__ = [
+    'StorageUsage', 'StorageQuotaExceededError', 'created_at_epoch', 'QUOTA_POLICIES',
+    'QUOTA_POLICY_REJECT', 'QUOTA_POLICY_EVICT_LRU', 'QUOTA_POLICY_EVICT_OLDEST_EXECUTION'
+]
@@ -0,0 +1,98 @@
+"""
+Test configuration
+Makes the engine root importable and provides an orchestrator wired to a scripted AI processor
+"""
+
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+ENGINE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ENGINE_ROOT not in sys.path:
+    sys.path.insert(0, ENGINE_ROOT)
+
+from sdlc_pipeline_engine.ai_processor import AIPromptProcessor  # noqa: E402
+from sdlc_pipeline_engine.pipeline_orchestrator import SDLCPipelineOrchestrator  # noqa: E402
+
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+
+class FakeAIProcessor(AIPromptProcessor):
+    """Answers prompts locally; ``failures`` are raised (in order) before any answer"""
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__({})
+        self.delay = delay
+        self.failures: List[Exception] = []
+        self.prompts: List[str] = []
+        self.active = 0
+        self.peak_active = 0
+
+    async def process_prompt(self, prompt: str, model_config: Any, context: Any) -> Dict[str, Any]:
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.failures:
+                raise self.failures.pop(0)
+            return {
+                'generated_content': f"generated: {prompt}",
+                'model_info': {'tokens_used': 10, 'processing_time': self.delay},
+                'metadata': {}
+            }
+        finally:
+            self.active -= 1
+
+
+def make_stage(stage_id: str, **overrides: Any) -> Dict[str, Any]:
+    """Planning stage with an inline prompt, no retries and no validation rules"""
+    stage = {
+        'id': stage_id,
+        'type': 'planning',
+        'name': stage_id.title(),
+        'prompt_template': f"{stage_id} for {{{{ user_inputs.topic }}}}",
+        'retry_policy': {}
+    }
+    stage.update(overrides)
+    return stage
+
+
+def make_pipeline(*stages: Dict[str, Any], name: str = 'test-pipeline') -> Dict[str, Any]:
+    return {'name': name, 'version': '1.0', 'stages': list(stages) or [make_stage('plan')]}
+
+
+async def wait_for_execution(
+    orchestrator: SDLCPipelineOrchestrator,
+    execution_id: str,
+    statuses: tuple = TERMINAL_STATUSES,
+    timeout: float = 10.0
+) -> Dict[str, Any]:
+    """Poll until the execution reaches one of ``statuses`` and return its details"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        details = await orchestrator.get_execution_details(execution_id)
+        if details is not None and details['status'] in statuses:
+            return details
+        if loop.time() > deadline:
+            raise AssertionError(f"Execution {execution_id} stuck in {details and details['status']}")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def make_orchestrator(tmp_path):
+    """Factory for orchestrators storing under tmp_path; extra config sections are merged in"""
+
+    def factory(ai: Optional[FakeAIProcessor] = None, **config: Any) -> SDLCPipelineOrchestrator:
+        config.setdefault('artifact_config', {})
+        config['artifact_config'].setdefault('storage_path', str(tmp_path / 'artifacts'))
+        orchestrator = SDLCPipelineOrchestrator(config)
+        orchestrator.ai_processor = ai or FakeAIProcessor()
+        return orchestrator
+
+    return factory
@@ -0,0 +1,119 @@
+"""
+Admission control tests
+Queue order and positions, fast rejection and recovery of queued executions
+"""
+
+import asyncio
+
+import pytest
+from conftest import FakeAIProcessor, make_pipeline, wait_for_execution
+
+from sdlc_pipeline_engine.admission_control import AdmissionController, AdmissionRejectedError
+
+
+def test_fifo_queue_positions_shift_as_entries_leave(tmp_path):
+    async def scenario():
+        admission = AdmissionController({'max_active_executions': 1}, tmp_path)
+        admission.admit('running')
+        for execution_id in ('a', 'b', 'c'):
+            await admission.enqueue(execution_id, 'pipeline', {})
+
+        assert [admission.position(e) for e in ('a', 'b', 'c')] == [0, 1, 2]
+        assert admission.remove('b')
+        assert admission.position('c') == 1
+        assert not (tmp_path / 'b.json').exists()
+
+        assert admission.admit_next() == []
+        admission.release('running')
+        assert [entry['execution_id'] for entry in admission.admit_next()] == ['a']
+        assert admission.position('c') == 0
+        assert sorted(p.name for p in tmp_path.glob('*.json')) == ['c.json']
+
+    asyncio.run(scenario())
+
+
+def test_priority_queue_orders_by_priority_then_arrival(tmp_path):
+    async def scenario():
+        admission = AdmissionController({'max_active_executions': 1, 'queue_policy': 'priority'}, tmp_path)
+        admission.admit('running')
+        await admission.enqueue('low', 'pipeline', {})
+        await admission.enqueue('high', 'pipeline', {}, {'priority': 5})
+        await admission.enqueue('high-later', 'pipeline', {}, {'priority': 5})
+
+        assert [admission.position(e) for e in ('high', 'high-later', 'low')] == [0, 1, 2]
+
+        restarted = AdmissionController({'max_active_executions': 1, 'queue_policy': 'priority'}, tmp_path)
+        recovered = await restarted.recover()
+        assert [entry['execution_id'] for entry in recovered] == ['high', 'high-later', 'low']
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_with_an_estimated_wait(tmp_path):
+    async def scenario():
+        admission = AdmissionController(
+            {'max_active_executions': 2, 'max_queued_executions': 3, 'default_execution_seconds': 60}, tmp_path
+        )
+        for execution_id in ('r1', 'r2'):
+            admission.admit(execution_id)
+        for execution_id in ('q1', 'q2', 'q3'):
+            await admission.enqueue(execution_id, 'pipeline', {})
+
+        with pytest.raises(AdmissionRejectedError) as rejected:
+            await admission.enqueue('q4', 'pipeline', {})
+
+        assert rejected.value.queue_depth == 3
+        # Position 3 with two slots starts after two rounds of 60s runs
+        assert rejected.value.estimated_wait_seconds == 120
+        assert admission.stats()['rejected'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_executions_beyond_capacity_are_queued_then_rejected(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(
+            ai=FakeAIProcessor(delay=0.1),
+            admission_config={'max_active_executions': 1, 'max_queued_executions': 1}
+        )
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline())
+
+        first = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'a'})
+        second = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'b'})
+        with pytest.raises(AdmissionRejectedError):
+            await orchestrator.execute_pipeline(pipeline_id, {'topic': 'c'})
+
+        status = await orchestrator.get_execution_status(second)
+        assert status['status'] == 'queued'
+        assert status['queue_position'] == 0
+        assert status['queue']['active'] == 1
+        assert status['estimated_wait_seconds'] > 0
+
+        for execution_id in (first, second):
+            assert (await wait_for_execution(orchestrator, execution_id))['status'] == 'completed'
+        assert orchestrator.ai_processor.peak_active == 1
+
+    asyncio.run(scenario())
+
+
+def test_recovered_executions_start_before_new_ones(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(
+            ai=FakeAIProcessor(delay=0.1), admission_config={'max_active_executions': 1}
+        )
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline())
+        # Left queued by a previous run
+        await orchestrator.admission.enqueue('queued-before-restart', pipeline_id, {'topic': 'old'})
+
+        restarted = make_orchestrator(
+            ai=FakeAIProcessor(delay=0.1), admission_config={'max_active_executions': 1}
+        )
+        new = await restarted.execute_pipeline(pipeline_id, {'topic': 'new'})
+
+        assert (await restarted.get_execution_status(new))['queue_position'] == 0
+        await wait_for_execution(restarted, 'queued-before-restart')
+        await wait_for_execution(restarted, new)
+        assert restarted.ai_processor.prompts == ['plan for old', 'plan for new']
+        assert not list(restarted.admission.path.glob('*.json'))
+
+    asyncio.run(scenario())
@@ -0,0 +1,155 @@
+"""
+API server tests
+Keyset pagination, conditional GET, CORS on errors and the Socket.IO websocket
+"""
+
+import asyncio
+import json
+
+from aiohttp.test_utils import TestClient, TestServer
+from conftest import make_pipeline, make_stage, wait_for_execution
+
+from sdlc_pipeline_engine.api_server import PipelineAPIServer
+
+ORIGIN = {'Origin': 'http://ui.example'}
+
+
+async def api_client(orchestrator, **config):
+    server = PipelineAPIServer(orchestrator, {'websocket_coalesce_ms': 0, **config})
+    client = TestClient(TestServer(server.build_app()))
+    await client.start_server()
+    return server, client
+
+
+async def collect_pages(client, path, key, limit, cursor=None):
+    items, pages = [], 0
+    while True:
+        params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+        response = await client.get(path, params=params)
+        assert response.status == 200
+        body = await response.json()
+        items.extend(body[key])
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            return items, pages
+
+
+def test_pipeline_pages_are_stable_while_pipelines_are_added(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        _, client = await api_client(orchestrator)
+        created = [await orchestrator.create_pipeline(make_pipeline(name=f"p{i}")) for i in range(5)]
+
+        response = await client.get('/api/pipelines', params={'limit': 2})
+        first = await response.json()
+        # A pipeline created mid-listing sorts after the rows already paged
+        created.append(await orchestrator.create_pipeline(make_pipeline(name='late')))
+        rest, _ = await collect_pages(client, '/api/pipelines', 'pipelines', 2, first['next_cursor'])
+
+        assert [p['id'] for p in first['pipelines'] + rest] == created
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_execution_pages_cover_every_execution_once(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        _, client = await api_client(orchestrator)
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline())
+        execution_ids = []
+        for topic in 'abcde':
+            execution_ids.append(await orchestrator.execute_pipeline(pipeline_id, {'topic': topic}))
+            await wait_for_execution(orchestrator, execution_ids[-1])
+
+        executions, pages = await collect_pages(client, '/api/executions', 'executions', limit=2)
+
+        assert pages == 3
+        assert sorted(e['execution_id'] for e in executions) == sorted(execution_ids)
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_execution_documents_support_conditional_get(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        _, client = await api_client(orchestrator)
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline())
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'search'})
+        await wait_for_execution(orchestrator, execution_id)
+
+        response = await client.get(f"/api/executions/{execution_id}")
+        assert response.status == 200
+        etag = response.headers['ETag']
+        assert (await response.json())['status'] == 'completed'
+
+        response = await client.get(f"/api/executions/{execution_id}", headers={'If-None-Match': etag})
+        assert response.status == 304
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_error_responses_carry_cors_headers(make_orchestrator):
+    async def scenario():
+        _, client = await api_client(make_orchestrator())
+
+        missing = await client.get('/api/executions/missing', headers=ORIGIN)
+        bad_cursor = await client.get('/api/pipelines', params={'cursor': '!!'}, headers=ORIGIN)
+        unknown = await client.get('/api/unknown', headers=ORIGIN)
+
+        assert [missing.status, bad_cursor.status, unknown.status] == [404, 400, 404]
+        assert (await missing.json()) == {'error': 'Execution not found: missing'}
+        for response in (missing, bad_cursor, unknown):
+            assert response.headers['Access-Control-Allow-Origin'] == ORIGIN['Origin']
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_websocket_pushes_execution_updates_and_reports_bad_events(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        server, client = await api_client(orchestrator)
+        # start() would also bind a TCP site; only the event dispatch is needed here
+        server._events = orchestrator.event_bus.subscribe()
+        server._dispatch_task = asyncio.create_task(server._dispatch_events())
+
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(make_stage('plan', approval_required=True)))
+        ws = await client.ws_connect('/socket.io/', params={'transport': 'websocket'})
+        assert (await ws.receive_str()).startswith('0')
+        await ws.send_str('40')
+        assert (await ws.receive_str()).startswith('40')
+
+        await ws.send_str('42' + json.dumps(['approval_response', {'approved': True}]))
+        assert await next_event(ws) == ['error', {'message': 'approval_response requires an approvalId'}]
+
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'search'})
+        await ws.send_str('42' + json.dumps(['subscribe_execution', {'executionId': execution_id}]))
+        name, payload = await next_event(ws, 'approval_required')
+        assert payload['executionId'] == execution_id
+        assert payload['stageId'] == 'plan'
+
+        await ws.send_str('42' + json.dumps(['approval_response', {'approvalId': payload['approvalId'], 'approved': True}]))
+        while True:
+            name, payload = await next_event(ws, 'execution_status')
+            if payload['status'] == 'completed':
+                break
+
+        await ws.close()
+        await server.stop()
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+async def next_event(ws, name=None):
+    """Next Socket.IO event (optionally of one name), skipping pings"""
+    while True:
+        packet = await asyncio.wait_for(ws.receive_str(), 5)
+        if packet.startswith('42'):
+            event = json.loads(packet[2:])
+            if name is None or event[0] == name:
+                return event
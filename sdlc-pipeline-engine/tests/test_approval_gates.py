@@ -0,0 +1,179 @@
+"""
+Approval gate tests
+Executions park on disk while awaiting approval and resume or fail on the decision
+"""
+
+import asyncio
+
+import pytest
+from conftest import FakeAIProcessor, make_pipeline, make_stage, wait_for_execution
+
+
+class GatedAIProcessor(FakeAIProcessor):
+    """Holds prompts for the named stages until their gate is opened"""
+
+    def __init__(self, *stage_ids: str):
+        super().__init__()
+        self.gates = {stage_id: asyncio.Event() for stage_id in stage_ids}
+        self.held = {stage_id: asyncio.Event() for stage_id in stage_ids}
+
+    async def process_prompt(self, prompt, model_config, context):
+        stage_id = prompt.split(' ', 1)[0]
+        if stage_id in self.gates:
+            self.held[stage_id].set()
+            await self.gates[stage_id].wait()
+        return await super().process_prompt(prompt, model_config, context)
+
+
+async def park(orchestrator, topic='search'):
+    """Run an approve-then-build pipeline until it is parked on its approval"""
+    pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+        make_stage('plan', approval_required=True, reviewers=['lead']),
+        make_stage('build', dependencies=['plan'])
+    ))
+    execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': topic})
+    await wait_for_execution(orchestrator, execution_id, statuses=('awaiting_approval',))
+    while execution_id in orchestrator.active_executions:
+        await asyncio.sleep(0.01)
+    return execution_id
+
+
+def test_execution_is_parked_until_approved(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        execution_id = await park(orchestrator)
+
+        parked = await orchestrator.artifact_manager.load_parked_execution(execution_id)
+        [(approval_id, stage_id)] = parked['pending_approvals'].items()
+        assert stage_id == 'plan'
+        assert 'build' not in parked['context']['stage_outputs']
+        details = await orchestrator.get_execution_details(execution_id)
+        assert details['status'] == 'awaiting_approval'
+
+        decision = await orchestrator.approve_request(approval_id, approver='lead', comments='ship it')
+        assert decision['status'] == 'approved'
+        details = await wait_for_execution(orchestrator, execution_id)
+
+        assert details['status'] == 'completed'
+        assert details['stage_outputs']['plan']['approval']['approver'] == 'lead'
+        assert details['stage_outputs']['build']['status'] == 'completed'
+        assert await orchestrator.artifact_manager.load_parked_execution(execution_id) is None
+
+    asyncio.run(scenario())
+
+
+def test_rejection_fails_the_parked_execution(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        execution_id = await park(orchestrator)
+        [request] = await orchestrator.list_approval_requests(execution_id=execution_id)
+
+        await orchestrator.reject_request(request['approval_id'], approver='lead', comments='missing risks')
+        details = await wait_for_execution(orchestrator, execution_id)
+
+        assert details['status'] == 'failed'
+        assert details['stage_outputs']['plan']['error'] == 'Stage approval rejected: missing risks'
+        assert 'build' not in details['stage_outputs']
+        assert await orchestrator.artifact_manager.load_parked_execution(execution_id) is None
+
+    asyncio.run(scenario())
+
+
+def test_a_decision_cannot_be_recorded_twice(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        execution_id = await park(orchestrator)
+        [request] = await orchestrator.list_approval_requests(execution_id=execution_id)
+
+        await orchestrator.approve_request(request['approval_id'])
+        with pytest.raises(ValueError, match='already approved'):
+            await orchestrator.reject_request(request['approval_id'])
+        with pytest.raises(ValueError, match='not found'):
+            await orchestrator.approve_request('missing')
+        await wait_for_execution(orchestrator, execution_id)
+
+    asyncio.run(scenario())
+
+
+def test_decision_before_parking_keeps_the_resumed_admission_slot(make_orchestrator):
+    async def scenario():
+        ai = GatedAIProcessor('slow', 'build')
+        orchestrator = make_orchestrator(ai=ai)
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+            make_stage('plan', approval_required=True, reviewers=['lead']),
+            make_stage('slow'),
+            make_stage('build', dependencies=['plan', 'slow'])
+        ))
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'search'})
+
+        # Approve while the sibling stage still holds the level open
+        while not await orchestrator.list_approval_requests(execution_id=execution_id):
+            await asyncio.sleep(0.01)
+        [request] = await orchestrator.list_approval_requests(execution_id=execution_id)
+        await orchestrator.approve_request(request['approval_id'], approver='lead')
+        ai.gates['slow'].set()
+
+        await asyncio.wait_for(ai.held['build'].wait(), timeout=10)
+        assert orchestrator.admission.active_count == 1
+        details = await orchestrator.get_execution_details(execution_id)
+        assert details['status'] == 'running'
+
+        ai.gates['build'].set()
+        details = await wait_for_execution(orchestrator, execution_id)
+        assert details['status'] == 'completed'
+        assert details['stage_outputs']['plan']['approval']['approver'] == 'lead'
+        assert orchestrator.admission.active_count == 0
+
+    asyncio.run(scenario())
+
+
+def test_parked_execution_resumes_the_definition_it_started_with(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        execution_id = await park(orchestrator)
+        parked = await orchestrator.artifact_manager.load_parked_execution(execution_id)
+        await orchestrator.update_pipeline(parked['pipeline_id'], make_pipeline(make_stage('review')))
+
+        [request] = await orchestrator.list_approval_requests(execution_id=execution_id)
+        await orchestrator.approve_request(request['approval_id'])
+        details = await wait_for_execution(orchestrator, execution_id)
+
+        assert details['status'] == 'completed'
+        assert details['stage_outputs']['build']['status'] == 'completed'
+        assert 'review' not in details['stage_outputs']
+        assert await orchestrator.artifact_manager.load_parked_execution(execution_id) is None
+
+    asyncio.run(scenario())
+
+
+def test_parked_execution_resumes_in_a_new_orchestrator(make_orchestrator):
+    async def scenario():
+        execution_id = await park(make_orchestrator())
+
+        restarted = make_orchestrator()
+        await restarted.start()
+        [request] = await restarted.list_approval_requests(execution_id=execution_id, status='pending')
+        await restarted.approve_request(request['approval_id'])
+        details = await wait_for_execution(restarted, execution_id)
+
+        assert details['status'] == 'completed'
+        assert details['stage_outputs']['build']['status'] == 'completed'
+        await restarted.stop()
+
+    asyncio.run(scenario())
+
+
+def test_approval_requests_page_in_creation_order(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        execution_ids = [await park(orchestrator, topic) for topic in ('a', 'b', 'c')]
+
+        first = await orchestrator.list_approval_requests(status='pending', limit=2)
+        last = first[-1]
+        rest = await orchestrator.list_approval_requests(
+            status='pending', after=(last['created_at'], last['approval_id']), limit=2
+        )
+
+        assert [r['execution_id'] for r in first + rest] == execution_ids
+
+    asyncio.run(scenario())
@@ -0,0 +1,92 @@
+"""
+Artifact batch tests
+Concurrent blob writes bounded by io_concurrency, one index commit and optional sidecars
+"""
+
+import asyncio
+import json
+import sqlite3
+
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+
+
+def batch(count, execution_id='exec-1'):
+    return [
+        {
+            'name': f"Class{i}", 'content': f"public class Class{i} {{}}" if i else 'shared',
+            'artifact_type': 'source_code', 'execution_id': execution_id, 'stage_id': 'build'
+        }
+        for i in range(count)
+    ]
+
+
+def test_batch_writes_blobs_concurrently_and_commits_once(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path), 'io_concurrency': 3})
+        await manager.start()
+
+        active, peak = 0, 0
+        store_file = manager._store_artifact_file
+
+        async def slow_store(artifact, data):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            try:
+                return await store_file(artifact, data)
+            finally:
+                active -= 1
+
+        commits = []
+        put_many = manager.index_store.put_many
+
+        async def counting_put_many(rows, *args):
+            rows = list(rows)
+            commits.append(len(rows))
+            return await put_many(rows, *args)
+
+        manager._store_artifact_file = slow_store
+        manager.index_store.put_many = counting_put_many
+
+        artifact_ids = await manager.store_artifacts_batch(batch(10))
+
+        assert peak == 3
+        assert commits == [10]
+        assert [manager.artifact_index[i].name for i in artifact_ids] == [f"Class{i}" for i in range(10)]
+        assert await manager.get_artifact_content(artifact_ids[4]) == 'public class Class4 {}'
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_content_in_a_batch_shares_one_blob(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path)})
+        await manager.start()
+
+        entries = batch(1) + batch(1, execution_id='exec-2')
+        first, second = await manager.store_artifacts_batch(entries)
+
+        blob = manager.artifact_index[first].blob
+        assert manager.artifact_index[second].blob == blob
+        conn = sqlite3.connect(str(manager.index_store.path))
+        assert conn.execute('SELECT refcount FROM blobs WHERE checksum = ?', (blob,)).fetchone()[0] == 2
+
+    asyncio.run(scenario())
+
+
+def test_metadata_sidecars_are_optional_and_never_repeat_content(tmp_path):
+    async def scenario():
+        with_sidecars = ArtifactManager({'storage_path': str(tmp_path / 'on')})
+        await with_sidecars.start()
+        await with_sidecars.store_artifacts_batch(batch(2))
+        sidecar = json.loads((tmp_path / 'on' / 'executions' / 'exec-1' / 'build' / 'Class1.metadata.json').read_text())
+        assert sidecar['artifact']['name'] == 'Class1'
+        assert 'content' not in sidecar['artifact']
+
+        without = ArtifactManager({'storage_path': str(tmp_path / 'off'), 'metadata_sidecars': False})
+        await without.start()
+        await without.store_artifacts_batch(batch(2))
+        assert not list((tmp_path / 'off' / 'executions').rglob('*.metadata.json'))
+
+    asyncio.run(scenario())
@@ -0,0 +1,86 @@
+"""
+Artifact compression tests
+Codec selection, streaming round-trips and compressed artifact storage
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from sdlc_pipeline_engine.artifact_compression import (
+    CODEC_GZIP, CODEC_IDENTITY, CODEC_ZSTD, ArtifactCompressor
+)
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+
+MARKDOWN = ''.join(f"## Section {i}\n\nThe service handles request {i} within the latency budget.\n\n" for i in range(200))
+
+
+def test_small_or_incompressible_content_is_stored_as_is(tmp_path):
+    compressor = ArtifactCompressor({'compression_codec': CODEC_GZIP, 'compression_min_size': 512}, tmp_path)
+
+    assert compressor.choose_codec('documentation', 100) == CODEC_IDENTITY
+    assert compressor.choose_codec('documentation', 4096) == CODEC_GZIP
+    assert compressor.compress(CODEC_GZIP, os.urandom(4096))[0] == CODEC_IDENTITY
+
+    disabled = ArtifactCompressor({'compression_enabled': False}, tmp_path)
+    assert disabled.choose_codec('documentation', 10 ** 6) == CODEC_IDENTITY
+
+
+def test_streamed_gzip_round_trips_and_is_detected_from_the_blob(tmp_path):
+    async def scenario():
+        compressor = ArtifactCompressor({'compression_codec': CODEC_GZIP, 'compression_chunk_size': 1000}, tmp_path)
+        data = MARKDOWN.encode('utf-8')
+
+        blob = b''.join([chunk async for chunk in compressor.compress_stream(CODEC_GZIP, data)])
+
+        assert len(blob) * 5 < len(data)
+        assert compressor.detect(blob[:18]) == CODEC_GZIP
+        assert compressor.detect(data[:18]) == CODEC_IDENTITY
+        assert compressor.decompress(blob) == data
+        pieces = [blob[i:i + 7] for i in range(0, len(blob), 7)]
+        assert b''.join(compressor.decompress_chunks(CODEC_GZIP, pieces)) == data
+
+    asyncio.run(scenario())
+
+
+def test_artifacts_are_compressed_on_write_and_decompressed_on_read(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path), 'compression_codec': CODEC_GZIP})
+        await manager.start()
+
+        artifact_id = await manager.store_artifact('design', MARKDOWN, 'documentation', 'exec-1', 'design')
+        small_id = await manager.store_artifact('note', 'short', 'documentation', 'exec-1', 'design')
+
+        artifact = await manager.get_artifact(artifact_id)
+        assert artifact.codec == CODEC_GZIP
+        assert artifact.stored_size < artifact.size
+        assert artifact.compression_ratio > 5
+        assert manager.blob_store.size(artifact.blob) == artifact.stored_size
+        assert (tmp_path / 'executions' / 'exec-1' / 'design' / 'design.md.gz').exists()
+        assert await manager.get_artifact_content(artifact_id) == MARKDOWN
+
+        assert (await manager.get_artifact(small_id)).codec == CODEC_IDENTITY
+        assert await manager.get_artifact_content(small_id) == 'short'
+
+    asyncio.run(scenario())
+
+
+def test_zstd_dictionaries_are_trained_per_artifact_type(tmp_path):
+    pytest.importorskip('zstandard')
+
+    async def scenario():
+        compressor = ArtifactCompressor({
+            'compression_codec': CODEC_ZSTD, 'compression_dictionary_samples': 50, 'compression_dictionary_size': 4096
+        }, tmp_path)
+        samples = [f"apiVersion: v1\nkind: Service\nmetadata:\n  name: service-{i}\n".encode() * 3 for i in range(50)]
+        for sample in samples:
+            await compressor.observe('kubernetes', sample)
+
+        codec = compressor.choose_codec('kubernetes', 10)
+        assert codec.startswith(f"{CODEC_ZSTD}:")
+        _, blob = compressor.compress(codec, samples[0])
+        assert compressor.detect(blob[:18]) == codec
+        assert compressor.decompress(blob) == samples[0]
+
+    asyncio.run(scenario())
@@ -0,0 +1,114 @@
+"""
+Artifact index tests
+SQLite index migration from the legacy JSON file, concurrent writes and document paging
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+
+from sdlc_pipeline_engine.artifact_index import ArtifactIndexStore
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+
+
+def write_legacy_index(storage_path, contents):
+    """Index and content files as written by the JSON-index ArtifactManager"""
+    artifacts = []
+    for index, content in enumerate(contents):
+        stage_dir = storage_path / 'executions' / 'exec-1' / 'design'
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        (stage_dir / f"doc{index}.md").write_text(content)
+        artifacts.append({
+            'id': f"legacy-{index}", 'name': f"doc{index}", 'type': 'documentation', 'content': content,
+            'metadata': {'source': 'legacy'}, 'created_at': f"2024-01-0{index + 1}T00:00:00",
+            'size': len(content), 'checksum': hashlib.sha256(content.encode()).hexdigest(),
+            'execution_id': 'exec-1', 'stage_id': 'design', 'version': '1.0'
+        })
+    (storage_path / 'metadata').mkdir(parents=True, exist_ok=True)
+    index_file = storage_path / 'metadata' / 'artifact_index.json'
+    index_file.write_text(json.dumps({'artifacts': artifacts, 'total_count': len(artifacts)}, indent=2))
+    return index_file
+
+
+def test_legacy_json_index_is_migrated_once(tmp_path):
+    async def scenario():
+        index_file = write_legacy_index(tmp_path, ['# First', '# Second'])
+
+        manager = ArtifactManager({'storage_path': str(tmp_path)})
+        await manager.start()
+
+        assert not index_file.exists()
+        assert index_file.with_suffix('.json.migrated').exists()
+        assert await manager.index_store.count() == 2
+        artifact = await manager.get_artifact('legacy-1')
+        assert artifact.metadata == {'source': 'legacy'}
+        assert await manager.get_artifact_content('legacy-1') == '# Second'
+
+        restarted = ArtifactManager({'storage_path': str(tmp_path)})
+        await restarted.start()
+        assert await restarted.index_store.count() == 2
+        assert sorted(restarted.artifact_index) == ['legacy-0', 'legacy-1']
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_stores_and_deletes_are_single_row_transactions(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path)})
+        await manager.start()
+
+        artifact_ids = await asyncio.gather(*(
+            manager.store_artifact(f"doc{i}", f"content {i}", 'documentation', f"exec-{i % 3}", 'design')
+            for i in range(30)
+        ))
+        assert await manager.delete_artifact(artifact_ids[0])
+
+        restarted = ArtifactManager({'storage_path': str(tmp_path)})
+        await restarted.start()
+        assert await restarted.index_store.count() == 29
+        assert set(restarted.artifact_index) == set(artifact_ids[1:])
+        assert await restarted.get_artifact_content(artifact_ids[7]) == 'content 7'
+
+    asyncio.run(scenario())
+
+
+def test_index_uses_wal_and_indexes_its_lookup_columns(tmp_path):
+    async def scenario():
+        store = ArtifactIndexStore(tmp_path / 'index.db')
+        await store.open()
+        await store.close()
+
+        conn = sqlite3.connect(str(tmp_path / 'index.db'))
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        indexed = {row[2] for name in [r[1] for r in conn.execute("PRAGMA index_list('artifacts')")]
+                   for row in conn.execute(f"PRAGMA index_info('{name}')")}
+        assert {'execution_id', 'stage_id', 'type', 'created_at'} <= indexed
+
+    asyncio.run(scenario())
+
+
+def test_documents_page_by_creation_time_and_id(tmp_path):
+    async def scenario():
+        store = ArtifactIndexStore(tmp_path / 'index.db')
+        await store.put_documents([
+            {'kind': 'execution', 'id': execution_id, 'created_at': created_at, 'pipeline_id': pipeline_id,
+             'status': 'running'}
+            for execution_id, created_at, pipeline_id in [
+                ('b', '2024-01-01', 'p1'), ('a', '2024-01-01', 'p2'), ('c', '2024-01-02', 'p1'), ('d', '2024-01-03', 'p1')
+            ]
+        ])
+        # Updates keep the original created_at, so rows do not move between pages
+        await store.put_documents([{'kind': 'execution', 'id': 'a', 'created_at': '2025-01-01', 'status': 'completed'}])
+
+        first = await store.list_documents('execution', limit=2)
+        assert [(d['id'], d['status']) for d in first] == [('a', 'completed'), ('b', 'running')]
+        rest = await store.list_documents('execution', after=(first[-1]['created_at'], first[-1]['id']), limit=10)
+        assert [d['id'] for d in rest] == ['c', 'd']
+        assert [d['id'] for d in await store.list_documents('execution', limit=-1, pipeline_id='p1')] == ['b', 'c', 'd']
+
+        await store.delete_document('execution', 'c')
+        assert await store.count_documents() == 3
+        await store.close()
+
+    asyncio.run(scenario())
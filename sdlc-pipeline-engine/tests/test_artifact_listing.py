@@ -0,0 +1,81 @@
+"""
+Artifact listing tests
+Secondary indexes, newest-first ordering and keyset pagination cursors
+"""
+
+import asyncio
+
+import pytest
+
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+
+
+async def populated_manager(tmp_path):
+    manager = ArtifactManager({'storage_path': str(tmp_path)})
+    await manager.start()
+    for i in range(12):
+        await manager.store_artifact(
+            f"doc{i}", f"content {i}", 'documentation' if i % 2 else 'source_code', f"exec-{i % 3}", f"stage-{i % 4}"
+        )
+    return manager
+
+
+def newest_first(manager, predicate=lambda record: True):
+    records = [record for record in manager.artifact_index.values() if predicate(record)]
+    return [record.id for record in sorted(records, key=lambda r: (r.created_at, r.id), reverse=True)]
+
+
+def test_filters_combine_and_results_are_newest_first(tmp_path):
+    async def scenario():
+        manager = await populated_manager(tmp_path)
+
+        listed = await manager.list_artifacts(execution_id='exec-1', artifact_type='documentation')
+        assert [a.id for a in listed] == newest_first(
+            manager, lambda r: r.execution_id == 'exec-1' and r.type == 'documentation'
+        )
+        assert all(a.content is None for a in listed)
+
+        by_stage = [r.id for r in manager.iter_artifacts(stage_id='stage-2')]
+        assert by_stage == newest_first(manager, lambda r: r.stage_id == 'stage-2')
+        assert await manager.list_artifacts(execution_id='exec-unknown') == []
+
+    asyncio.run(scenario())
+
+
+def test_cursor_pages_are_stable_across_stores_and_deletes(tmp_path):
+    async def scenario():
+        manager = await populated_manager(tmp_path)
+        expected = newest_first(manager)
+
+        first = await manager.list_artifacts(limit=5)
+        assert [a.id for a in first] == expected[:5]
+
+        # Newer artifacts sort before the cursor; deleting an unseen one just drops it
+        await manager.store_artifact('late', 'late', 'documentation', 'exec-0', 'stage-0')
+        await manager.delete_artifact(expected[6])
+
+        rest, cursor = [], manager.artifact_cursor(first[-1])
+        while cursor:
+            page = await manager.list_artifacts(limit=5, cursor=cursor)
+            rest.extend(a.id for a in page)
+            cursor = manager.artifact_cursor(page[-1]) if len(page) == 5 else None
+
+        assert rest == expected[5:6] + expected[7:]
+
+    asyncio.run(scenario())
+
+
+def test_iteration_is_lazy_and_survives_concurrent_deletes(tmp_path):
+    async def scenario():
+        manager = await populated_manager(tmp_path)
+        expected = newest_first(manager, lambda r: r.execution_id == 'exec-0')
+
+        iterator = manager.iter_artifacts(execution_id='exec-0')
+        assert next(iterator).id == expected[0]
+        await manager.delete_artifact(expected[1])
+        assert [record.id for record in iterator] == expected[2:]
+
+        with pytest.raises(ValueError):
+            list(manager.iter_artifacts(cursor='no-separator'))
+
+    asyncio.run(scenario())
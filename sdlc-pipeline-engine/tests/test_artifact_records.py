@@ -0,0 +1,66 @@
+"""
+Artifact record tests
+Metadata-only index records with interned ids and content loaded on demand
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from sdlc_pipeline_engine.artifact_manager import Artifact, ArtifactManager, ArtifactRecord
+
+
+def make_record(**overrides):
+    fields = {
+        'id': 'artifact-1', 'name': 'design', 'type': 'documentation', 'metadata': {'stage': 'design'},
+        'created_at': '2024-01-01T00:00:00', 'size': 10, 'checksum': 'c' * 64,
+        'execution_id': 'exec-1', 'stage_id': 'design', 'blob': 'c' * 64
+    }
+    fields.update(overrides)
+    return ArtifactRecord(**fields)
+
+
+def test_records_use_slots_and_share_interned_ids():
+    record = make_record(execution_id=''.join(['exec', '-1']))
+    other = make_record(id='artifact-2', execution_id=''.join(['exec', '-', '1']))
+
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.content = 'text'
+    assert record.execution_id is other.execution_id is sys.intern('exec-1')
+    assert record.type is other.type
+
+
+def test_records_convert_to_and_from_artifacts():
+    record = make_record(codec='gzip', stored_size=4)
+
+    artifact = record.to_artifact()
+    assert isinstance(artifact, Artifact)
+    assert artifact.content is None
+    assert artifact.compression_ratio == record.compression_ratio == 2.5
+    assert record.to_artifact('body').content == 'body'
+
+    round_tripped = ArtifactRecord.from_artifact(record.to_artifact('body'))
+    assert {name: getattr(round_tripped, name) for name in ArtifactRecord.__slots__} == {
+        name: getattr(record, name) for name in ArtifactRecord.__slots__
+    }
+
+
+def test_index_holds_metadata_and_content_is_read_on_demand(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path)})
+        await manager.start()
+        artifact_id = await manager.store_artifact('design', '# Design', 'documentation', 'exec-1', 'design')
+
+        restarted = ArtifactManager({'storage_path': str(tmp_path)})
+        await restarted.start()
+        assert isinstance(restarted.artifact_index[artifact_id], ArtifactRecord)
+
+        assert (await restarted.get_artifact(artifact_id)).content is None
+        full = await restarted.get_artifact(artifact_id, include_content=True)
+        assert full.content == '# Design'
+        assert full.size == len('# Design')
+        assert await restarted.get_artifact('missing') is None
+
+    asyncio.run(scenario())
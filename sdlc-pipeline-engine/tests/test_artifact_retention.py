@@ -0,0 +1,101 @@
+"""
+Artifact retention tests
+Time-ordered expiry, whole-execution drops, batched paced deletes and the opt-in scheduler
+"""
+
+import asyncio
+import sqlite3
+import time
+
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+
+OLD = '2020-01-01T00:00:00'
+
+
+async def aged_manager(tmp_path, **config):
+    """exec-old has only expired artifacts, exec-mixed one expired and one current"""
+    manager = ArtifactManager({'storage_path': str(tmp_path), 'compression_enabled': False})
+    await manager.start()
+    ids = {
+        'old-1': await manager.store_artifact('old1', 'old 1', 'documentation', 'exec-old', 'plan'),
+        'old-2': await manager.store_artifact('old2', 'old 2', 'documentation', 'exec-old', 'build'),
+        'mixed-old': await manager.store_artifact('mixed1', 'mixed 1', 'documentation', 'exec-mixed', 'plan'),
+        'mixed-new': await manager.store_artifact('mixed2', 'mixed 2', 'documentation', 'exec-mixed', 'plan'),
+    }
+    conn = sqlite3.connect(str(manager.index_store.path))
+    conn.executemany('UPDATE artifacts SET created_at = ? WHERE id = ?',
+                     [(OLD, ids[key]) for key in ('old-1', 'old-2', 'mixed-old')])
+    conn.commit()
+
+    restarted = ArtifactManager({'storage_path': str(tmp_path), 'compression_enabled': False, **config})
+    await restarted.start()
+    return restarted, ids
+
+
+def test_expired_prefix_is_deleted_and_fully_expired_executions_are_dropped(tmp_path):
+    async def scenario():
+        manager, ids = await aged_manager(tmp_path)
+
+        stats = await manager.cleanup_old_artifacts(days=30)
+
+        assert stats['artifacts_deleted'] == 3
+        assert stats['executions_dropped'] == 1
+        assert stats['bytes_freed'] == len('old 1') + len('old 2') + len('mixed 1')
+        assert stats['errors'] == []
+        assert set(manager.artifact_index) == {ids['mixed-new']}
+        assert await manager.index_store.count() == 1
+        assert not (tmp_path / 'executions' / 'exec-old').exists()
+        assert not (tmp_path / 'executions' / 'exec-mixed' / 'plan' / 'mixed1.md').exists()
+        assert await manager.get_artifact_content(ids['mixed-new']) == 'mixed 2'
+
+    asyncio.run(scenario())
+
+
+def test_deletes_are_batched_and_rate_limited(tmp_path):
+    async def scenario():
+        manager, _ = await aged_manager(tmp_path, retention_batch_size=2, retention_max_deletes_per_second=20)
+        batches = []
+        delete_many = manager.index_store.delete_many
+
+        async def recording_delete_many(artifact_ids, *args):
+            batches.append(len(artifact_ids))
+            return await delete_many(artifact_ids, *args)
+
+        manager.index_store.delete_many = recording_delete_many
+        started = time.perf_counter()
+        await manager.cleanup_old_artifacts(days=30)
+
+        assert batches == [2, 1]
+        # Three deletes at 20 per second
+        assert time.perf_counter() - started >= 0.14
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_is_opt_in_and_waits_one_interval(tmp_path):
+    async def scenario():
+        disabled = ArtifactManager({'storage_path': str(tmp_path / 'off')})
+        await disabled.start_retention_scheduler()
+        assert disabled._retention_task is None
+
+        manager = ArtifactManager({
+            'storage_path': str(tmp_path / 'on'), 'retention_interval_seconds': 0.1, 'gc_interval_seconds': 0.25
+        })
+        runs = []
+
+        async def cleanup(days=None, collect_garbage=False):
+            runs.append(collect_garbage)
+            return {}
+
+        manager.cleanup_old_artifacts = cleanup
+        await manager.start_retention_scheduler()
+        await asyncio.sleep(0.05)
+        assert runs == []
+
+        await asyncio.sleep(0.5)
+        await manager.stop_retention_scheduler()
+        # Garbage collection only once gc_interval_seconds has passed since the last one
+        assert runs[:3] == [False, False, True]
+        assert manager._retention_task is None
+
+    asyncio.run(scenario())
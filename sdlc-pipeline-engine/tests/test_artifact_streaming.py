@@ -0,0 +1,97 @@
+"""
+Artifact streaming tests
+Byte ranges over plain and compressed blobs, and ranged HTTP downloads
+"""
+
+import asyncio
+import gzip
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from conftest import FakeAIProcessor
+
+from sdlc_pipeline_engine.api_server import PipelineAPIServer
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+
+CONTENT = ''.join(f"line {i:04d}\n" for i in range(500))
+RANGES = [(0, None), (0, 1), (13, 40), (100, 100), (5990, None), (4000, 10 ** 9)]
+
+
+async def read(manager, artifact_id, start=0, end=None, decode=True):
+    chunks = await manager.stream_artifact_content(artifact_id, start, end, decode=decode)
+    return b''.join([chunk async for chunk in chunks])
+
+
+async def store(tmp_path, **config):
+    manager = ArtifactManager({'storage_path': str(tmp_path), 'read_chunk_size': 7, **config})
+    await manager.start()
+    artifact_id = await manager.store_artifact('bundle', CONTENT, 'documentation', 'exec-1', 'build')
+    return manager, artifact_id
+
+
+@pytest.mark.parametrize('config', [
+    {'compression_enabled': False},
+    {'compression_codec': 'gzip'}
+], ids=['file', 'gzip'])
+def test_ranges_match_the_content(tmp_path, config):
+    async def scenario():
+        manager, artifact_id = await store(tmp_path, **config)
+        data = CONTENT.encode('utf-8')
+
+        for start, end in RANGES:
+            assert await read(manager, artifact_id, start, end) == data[start:end]
+        assert await manager.stream_artifact_content('missing') is None
+
+    asyncio.run(scenario())
+
+
+def test_a_stream_can_be_abandoned(tmp_path):
+    async def scenario():
+        manager, artifact_id = await store(tmp_path, compression_enabled=False)
+
+        chunks = await manager.stream_artifact_content(artifact_id, 10, 60)
+        first = await chunks.__anext__()
+        assert type(first) is bytes and first == CONTENT.encode('utf-8')[10:17]
+        await chunks.aclose()
+
+        assert await read(manager, artifact_id, 10, 60) == CONTENT.encode('utf-8')[10:60]
+
+    asyncio.run(scenario())
+
+
+def test_stored_bytes_are_streamed_without_decoding(tmp_path):
+    async def scenario():
+        manager, artifact_id = await store(tmp_path, compression_codec='gzip')
+
+        stored = await read(manager, artifact_id, decode=False)
+        assert stored == manager.blob_store.path_for(manager.artifact_index[artifact_id].blob).read_bytes()
+        assert gzip.decompress(stored).decode('utf-8') == CONTENT
+
+    asyncio.run(scenario())
+
+
+def test_content_endpoint_serves_ranges_and_passes_gzip_through(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(ai=FakeAIProcessor(), artifact_config={'compression_codec': 'gzip'})
+        manager = orchestrator.artifact_manager
+        await manager.start()
+        artifact_id = await manager.store_artifact('bundle', CONTENT, 'documentation', 'exec-1', 'build')
+        client = TestClient(TestServer(PipelineAPIServer(orchestrator, {}).build_app()))
+        await client.start_server()
+        path = f"/api/artifacts/{artifact_id}/content"
+
+        ranged = await client.get(path, headers={'Range': 'bytes=12-23', 'Accept-Encoding': 'identity'})
+        assert ranged.status == 206
+        assert ranged.headers['Content-Range'] == f"bytes 12-23/{len(CONTENT)}"
+        assert await ranged.text() == CONTENT[12:24]
+
+        passthrough = await client.get(path, headers={'Accept-Encoding': 'gzip'})
+        assert passthrough.headers['Content-Encoding'] == 'gzip'
+        assert int(passthrough.headers['Content-Length']) == manager.artifact_index[artifact_id].stored_size
+        assert await passthrough.text() == CONTENT
+
+        unsatisfiable = await client.get(path, headers={'Range': f"bytes={len(CONTENT)}-"})
+        assert unsatisfiable.status == 416
+        await client.close()
+
+    asyncio.run(scenario())
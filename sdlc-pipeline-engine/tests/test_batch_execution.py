@@ -0,0 +1,76 @@
+"""
+Batch execution tests
+Worker pool, admission control and sharing of identical in-flight prompts
+"""
+
+import asyncio
+
+from conftest import FakeAIProcessor, make_pipeline
+
+
+async def _collect(orchestrator, inputs_list, **options):
+    await orchestrator.start()
+    try:
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline())
+        return [event async for event in orchestrator.execute_pipeline_batch(pipeline_id, inputs_list, options)]
+    finally:
+        await orchestrator.stop()
+
+
+def test_identical_prompts_in_flight_are_sent_once(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FakeAIProcessor(delay=0.2))
+        events = await _collect(orchestrator, [{'topic': i % 3} for i in range(9)], max_concurrency=9)
+
+        assert sorted(event['index'] for event in events) == list(range(9))
+        assert all(event['status'] == 'completed' for event in events)
+        assert sorted(orchestrator.ai_processor.prompts) == ['plan for 0', 'plan for 1', 'plan for 2']
+        assert orchestrator._batch_prompt_calls == {}
+
+    asyncio.run(scenario())
+
+
+def test_deduplication_can_be_disabled(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FakeAIProcessor(delay=0.05))
+        await _collect(orchestrator, [{'topic': 'same'}] * 4, max_concurrency=4, deduplicate_prompts=False)
+
+        assert len(orchestrator.ai_processor.prompts) == 4
+
+    asyncio.run(scenario())
+
+
+def test_batch_executions_take_admission_slots(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(
+            FakeAIProcessor(delay=0.05), admission_config={'max_active_executions': 2}
+        )
+        events = await _collect(orchestrator, [{'topic': i} for i in range(6)], max_concurrency=5)
+
+        assert all(event['status'] == 'completed' for event in events)
+        assert orchestrator.ai_processor.peak_active == 2
+        stats = orchestrator.admission.stats()
+        assert stats['admitted'] == 6 and stats['active'] == 0 and stats['waiting'] == 0
+
+    asyncio.run(scenario())
+
+
+def test_closing_the_batch_early_stops_its_workers(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FakeAIProcessor(delay=0.05), admission_config={'max_active_executions': 1})
+        await orchestrator.start()
+        try:
+            pipeline_id = await orchestrator.create_pipeline(make_pipeline())
+            batch = orchestrator.execute_pipeline_batch(pipeline_id, [{'topic': i} for i in range(5)], {'max_concurrency': 3})
+            first = await batch.__anext__()
+            await batch.aclose()
+            await asyncio.sleep(0.1)
+
+            assert first['status'] == 'completed'
+            assert orchestrator._batch_prompt_calls == {}
+            assert orchestrator.admission.stats()['waiting'] == 0
+            assert len(orchestrator.ai_processor.prompts) < 5
+        finally:
+            await orchestrator.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,83 @@
+"""
+Blob store tests
+Deduplicated content, reference counting and garbage collection of unreferenced blobs
+"""
+
+import asyncio
+import os
+import sqlite3
+
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+from sdlc_pipeline_engine.blob_store import BlobStore
+
+
+def refcount(manager, blob):
+    conn = sqlite3.connect(str(manager.index_store.path))
+    row = conn.execute('SELECT refcount FROM blobs WHERE checksum = ?', (blob,)).fetchone()
+    return row[0] if row else None
+
+
+def blob_files(manager):
+    return sorted(manager.blob_store.iter_blobs())
+
+
+def test_blobs_are_sharded_by_checksum_and_written_once(tmp_path):
+    async def scenario():
+        store = BlobStore(tmp_path / 'objects')
+        checksum = 'ab' * 32
+
+        assert await store.write(checksum, b'content') == 7
+        assert store.path_for(checksum) == tmp_path / 'objects' / 'ab' / 'ab' / checksum
+        assert await store.write(checksum, b'ignored') == 7
+        assert await store.read(checksum) == b'content'
+        assert list(store.iter_blobs()) == [checksum]
+        assert list(store.iter_blobs(min_age_seconds=3600)) == []
+
+    asyncio.run(scenario())
+
+
+def test_identical_content_is_stored_once_and_freed_with_its_last_reference(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path)})
+        await manager.start()
+
+        first = await manager.store_artifact('plan', 'same output', 'documentation', 'exec-1', 'plan')
+        second = await manager.store_artifact('plan', 'same output', 'documentation', 'exec-2', 'plan')
+        other = await manager.store_artifact('notes', 'other output', 'documentation', 'exec-2', 'plan')
+
+        blob = manager.artifact_index[first].blob
+        assert manager.artifact_index[second].blob == blob
+        assert len(blob_files(manager)) == 2
+        assert refcount(manager, blob) == 2
+        # Execution paths are hard links to the blob, not copies
+        execution_file = tmp_path / 'executions' / 'exec-1' / 'plan' / manager._artifact_file_name(manager.artifact_index[first])
+        assert os.stat(execution_file).st_ino == os.stat(manager.blob_store.path_for(blob)).st_ino
+
+        assert await manager.delete_artifact(first)
+        assert refcount(manager, blob) == 1
+        assert await manager.get_artifact_content(second) == 'same output'
+
+        assert await manager.delete_artifact(second)
+        assert refcount(manager, blob) is None
+        assert not manager.blob_store.exists(blob)
+        assert blob_files(manager) == [manager.artifact_index[other].blob]
+
+    asyncio.run(scenario())
+
+
+def test_garbage_collection_removes_only_unreferenced_blobs(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path)})
+        await manager.start()
+        kept = await manager.store_artifact('plan', 'kept', 'documentation', 'exec-1', 'plan')
+        # Left behind by a store interrupted before it was indexed
+        orphan = 'cd' * 32
+        await manager.blob_store.write(orphan, b'orphaned')
+
+        assert await manager.collect_garbage(min_age_seconds=3600) == 0
+        assert await manager.collect_garbage(min_age_seconds=0) == 1
+
+        assert not manager.blob_store.exists(orphan)
+        assert blob_files(manager) == [manager.artifact_index[kept].blob]
+
+    asyncio.run(scenario())
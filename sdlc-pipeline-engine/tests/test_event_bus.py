@@ -0,0 +1,120 @@
+"""
+Event bus tests
+Subscription filtering, overflow handling and the orchestrator's pause gates
+"""
+
+import asyncio
+
+from conftest import FakeAIProcessor, make_pipeline, make_stage, wait_for_execution
+
+from sdlc_pipeline_engine.event_bus import ExecutionEventBus
+
+
+def test_subscriptions_filter_by_execution_and_event_type():
+    async def scenario():
+        bus = ExecutionEventBus({})
+        everything = bus.subscribe()
+        one_execution = bus.subscribe('exec-1', event_types=['stage_completed'])
+
+        await bus.publish('stage_started', 'exec-1', stage_id='plan')
+        await bus.publish('stage_completed', 'exec-1', stage_id='plan')
+        await bus.publish('stage_completed', 'exec-2', stage_id='plan')
+
+        assert [(e['event'], e['execution_id']) for e in drain(everything)] == [
+            ('stage_started', 'exec-1'), ('stage_completed', 'exec-1'), ('stage_completed', 'exec-2')
+        ]
+        assert [(e['event'], e['stage_id']) for e in drain(one_execution)] == [('stage_completed', 'plan')]
+
+        one_execution.close()
+        assert bus.subscriber_count == 1
+        assert await one_execution.get() is None
+
+    asyncio.run(scenario())
+
+
+def test_drop_oldest_keeps_the_latest_events():
+    async def scenario():
+        bus = ExecutionEventBus({'max_queue_size': 2})
+        subscription = bus.subscribe()
+
+        for index in range(5):
+            await bus.publish('execution_status', 'exec-1', index=index)
+
+        assert [e['index'] for e in drain(subscription)] == [3, 4]
+        assert subscription.dropped == 3
+
+    asyncio.run(scenario())
+
+
+def test_block_overflow_never_makes_the_publisher_wait():
+    async def scenario():
+        bus = ExecutionEventBus({'max_queue_size': 2, 'overflow': 'block', 'publish_timeout_seconds': 5})
+        subscription = bus.subscribe()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for index in range(4):
+            await bus.publish('execution_status', 'exec-1', index=index)
+        assert loop.time() - started < 0.1
+
+        received = [(await subscription.get())['index'] for _ in range(4)]
+        assert received == [0, 1, 2, 3]
+        assert subscription.dropped == 0
+        subscription.close()
+
+    asyncio.run(scenario())
+
+
+def test_block_overflow_drops_the_oldest_after_the_timeout():
+    async def scenario():
+        bus = ExecutionEventBus({'max_queue_size': 1, 'overflow': 'block', 'publish_timeout_seconds': 0.02})
+        subscription = bus.subscribe()
+
+        for index in range(3):
+            await bus.publish('execution_status', 'exec-1', index=index)
+        await asyncio.sleep(0.2)
+
+        assert [e['index'] for e in drain(subscription)] == [2]
+        assert subscription.dropped == 2
+
+    asyncio.run(scenario())
+
+
+def test_pause_holds_stages_until_resume(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(ai=FakeAIProcessor(delay=0.1))
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+            make_stage('plan'), make_stage('build', dependencies=['plan'])
+        ))
+        subscription = orchestrator.event_bus.subscribe(event_types=['execution_status', 'stage_completed'])
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'search'})
+        await wait_for_execution(orchestrator, execution_id, statuses=('running',))
+
+        await orchestrator.pause_execution(execution_id)
+        await asyncio.sleep(0.3)
+        assert (await orchestrator.get_execution_details(execution_id))['status'] == 'paused'
+        assert 'build' not in (await orchestrator.get_execution_details(execution_id))['stage_outputs']
+
+        await orchestrator.resume_execution(execution_id)
+        events = await asyncio.wait_for(collect_until(subscription, ('execution_status', 'completed')), 5)
+
+        assert ('execution_status', 'paused') in events
+        assert events.index(('execution_status', 'paused')) < events.index(('stage_completed', 'build'))
+        assert (await orchestrator.get_execution_details(execution_id))['status'] == 'completed'
+
+    asyncio.run(scenario())
+
+
+async def collect_until(subscription, last):
+    events = []
+    async for event in subscription:
+        events.append((event['event'], event.get('stage_id') or event['status']))
+        if events[-1] == last:
+            return events
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
@@ -0,0 +1,80 @@
+"""
+Execution Plan tests
+Dependency levels, content hashing, critical path and the orchestrator's plan cache
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import make_pipeline, make_stage
+from sdlc_pipeline_engine.execution_plan import ExecutionPlan, build_execution_levels, hash_pipeline_definition
+
+
+def _stage(stage_id, *dependencies):
+    return SimpleNamespace(stage_id=stage_id, dependencies=list(dependencies))
+
+
+def _ids(levels):
+    return [[stage.stage_id for stage in level] for level in levels]
+
+
+def test_levels_follow_dependencies_and_keep_definition_order():
+    stages = [_stage('deploy', 'test'), _stage('design'), _stage('plan'), _stage('test', 'design', 'plan')]
+
+    assert _ids(build_execution_levels(stages)) == [['design', 'plan'], ['test'], ['deploy']]
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match='Circular'):
+        build_execution_levels([_stage('a', 'b'), _stage('b', 'a')])
+    with pytest.raises(ValueError, match='Invalid dependency'):
+        build_execution_levels([_stage('a', 'missing')])
+
+
+def test_hash_ignores_storage_metadata():
+    definition = make_pipeline()
+    stored = {**definition, 'id': 'abc', 'stored_at': '2026-01-01T00:00:00'}
+
+    assert hash_pipeline_definition(stored) == hash_pipeline_definition(definition)
+    assert hash_pipeline_definition({**definition, 'version': '2.0'}) != hash_pipeline_definition(definition)
+
+
+def test_critical_path_and_slack():
+    # plan -> (design, docs) -> build; docs is short so it has slack
+    stages = [_stage('plan'), _stage('design', 'plan'), _stage('docs', 'plan'), _stage('build', 'design', 'docs')]
+    plan = ExecutionPlan.compile({'stages': []}, stages, content_hash='x')
+
+    path = plan.critical_path({'plan': 1, 'design': 4, 'docs': 1, 'build': 2})
+
+    assert path['stages'] == ['plan', 'design', 'build']
+    assert path['duration'] == 7
+    assert path['slack'] == {'plan': 0, 'design': 0, 'docs': 3, 'build': 0}
+
+
+def test_plan_cache_shares_equal_content_and_evicts_replaced_plans(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        first = await orchestrator.create_pipeline(make_pipeline())
+        second = await orchestrator.create_pipeline(make_pipeline())
+
+        assert orchestrator._plans[first] is orchestrator._plans[second]
+        assert len(orchestrator._plans_by_hash) == 1
+
+        # Changing one pipeline keeps the shared plan for the other
+        await orchestrator.update_pipeline(first, make_pipeline(make_stage('plan'), make_stage('review')))
+        assert len(orchestrator._plans_by_hash) == 2
+        assert [stage.stage_id for stage in (await orchestrator._get_execution_plan(first)).stages] == ['plan', 'review']
+
+        # The old content goes once no pipeline uses it
+        await orchestrator.update_pipeline(second, make_pipeline(make_stage('draft')))
+        assert len(orchestrator._plans_by_hash) == 2
+        await orchestrator.delete_pipeline(first)
+        await orchestrator.delete_pipeline(second)
+        assert orchestrator._plans == {} and orchestrator._plans_by_hash == {}
+
+        with pytest.raises(ValueError, match='not found'):
+            await orchestrator._get_execution_plan(first)
+
+    asyncio.run(scenario())
@@ -0,0 +1,115 @@
+"""
+Execution planner tests
+Batched stage statistics writes and dry-run token, cost and quota estimates
+"""
+
+import asyncio
+import json
+
+from conftest import make_pipeline, make_stage, wait_for_execution
+
+from sdlc_pipeline_engine.execution_planner import ExecutionPlanner, StageStatistics
+
+TIMINGS = {'phases': {'provider_call': 2.0}, 'counters': {'provider_calls': 1, 'input_tokens': 100, 'output_tokens': 400}}
+
+
+def test_statistics_are_written_once_a_batch_accumulates(tmp_path):
+    async def scenario():
+        path = tmp_path / 'stats.json'
+        statistics = StageStatistics(path, flush_batch=2, flush_interval_seconds=60)
+
+        await statistics.record('pipeline', 'plan', 3.0, TIMINGS)
+        assert not path.exists()
+        await statistics.record('pipeline', 'plan', 5.0, TIMINGS)
+        assert json.loads(path.read_text())['pipeline']['plan']['samples'] == 2
+
+        assert await statistics.get('pipeline', 'plan') == {
+            'samples': 2, 'stage_seconds': 4.0, 'provider_seconds': 2.0,
+            'provider_calls': 1.0, 'input_tokens': 100.0, 'output_tokens': 400.0
+        }
+        assert await statistics.get('pipeline', 'missing') is None
+        await statistics.close()
+
+    asyncio.run(scenario())
+
+
+def test_statistics_are_written_after_the_flush_interval_and_on_close(tmp_path):
+    async def scenario():
+        path = tmp_path / 'stats.json'
+        statistics = StageStatistics(path, flush_batch=100, flush_interval_seconds=0.05)
+
+        await statistics.record('pipeline', 'plan', 3.0, TIMINGS)
+        assert not path.exists()
+        await asyncio.sleep(0.15)
+        assert json.loads(path.read_text())['pipeline']['plan']['samples'] == 1
+
+        await statistics.record('pipeline', 'design', 1.0, TIMINGS)
+        await statistics.close()
+        reloaded = StageStatistics(path)
+        assert (await reloaded.get('pipeline', 'design'))['samples'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_stage_estimates_use_history_when_available(tmp_path):
+    async def scenario():
+        statistics = StageStatistics(tmp_path / 'stats.json')
+        planner = ExecutionPlanner({
+            'default_output_tokens': 500, 'default_tokens_per_second': 50,
+            'pricing': {'model-a': {'input_per_1k_tokens': 1.0, 'output_per_1k_tokens': 2.0}}
+        }, statistics)
+
+        cold = await planner.estimate_stage('pipeline', 'plan', [100, 100], 50, 'openai', 'model-a', 4000, parallelism=2)
+        assert cold['input_tokens'] == 300
+        assert cold['output_tokens'] == 1000
+        assert cold['duration_seconds'] == 10.0
+        assert cold['cost'] == 2.3
+        assert cold['history_samples'] == 0
+
+        await statistics.record('pipeline', 'plan', 3.0, TIMINGS)
+        warm = await planner.estimate_stage('pipeline', 'plan', [100], 0, 'openai', 'model-a', 4000)
+        assert warm['output_tokens'] == 400
+        # One 2s provider call plus 1s of stage overhead
+        assert warm['duration_seconds'] == 3.0
+        assert warm['history_samples'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_batch_summary_flags_runs_that_exceed_provider_quota(tmp_path):
+    planner = ExecutionPlanner({'quotas': {'openai': {'requests_per_minute': 10}}}, StageStatistics(tmp_path / 's.json'))
+    estimate = {
+        'stage_id': 'plan', 'provider': 'openai', 'model': 'model-a', 'provider_calls': 1,
+        'input_tokens': 100, 'output_tokens': 100, 'duration_seconds': 6.0, 'cost': None
+    }
+
+    summary = planner.summarize({'plan': estimate}, {'duration': 6.0}, executions=40, max_concurrency=20)
+
+    quota = summary['quota']['model-a']
+    assert quota['requests'] == 40
+    # Two waves of 6s would send 40 requests in 12s; 10/min needs four minutes
+    assert quota['within_quota'] is False
+    assert quota['min_duration_seconds'] == 240.0
+    assert summary['estimated_wall_clock_seconds'] == 240.0
+    assert summary['total']['unpriced_models'] == ['model-a']
+
+
+def test_plan_execution_renders_prompts_without_calling_providers(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+            make_stage('plan'), make_stage('design', dependencies=['plan'])
+        ))
+
+        cold = await orchestrator.plan_execution(pipeline_id, {'topic': 'search'}, executions=3)
+        assert orchestrator.ai_processor.prompts == []
+        assert [stage['stage_id'] for stage in cold['stages']] == ['plan', 'design']
+        assert cold['critical_path']['stages'] == ['plan', 'design']
+        assert cold['total']['provider_calls'] == 6
+
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'search'})
+        await wait_for_execution(orchestrator, execution_id)
+        warm = await orchestrator.plan_execution(pipeline_id, {'topic': 'search'})
+        assert [stage['history_samples'] for stage in warm['stages']] == [1, 1]
+
+    asyncio.run(scenario())
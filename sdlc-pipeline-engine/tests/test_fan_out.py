@@ -0,0 +1,97 @@
+"""
+Fan-out stage tests
+Per-item failure isolation, bounded parallelism and the reduce prompt
+"""
+
+import asyncio
+
+from conftest import FakeAIProcessor, make_pipeline, make_stage, wait_for_execution
+
+
+class FailingItemsAI(FakeAIProcessor):
+    """Fails every prompt that mentions one of ``failing`` items"""
+
+    def __init__(self, failing=(), delay=0.0):
+        super().__init__(delay=delay)
+        self.failing = set(failing)
+
+    async def process_prompt(self, prompt, model_config, context):
+        result = await super().process_prompt(prompt, model_config, context)
+        if any(item in prompt for item in self.failing):
+            raise RuntimeError(f"provider rejected {prompt}")
+        return result
+
+
+def _fan_out_stage(**fan_out):
+    return make_stage(
+        'services',
+        prompt_template="design {{ item }}",
+        fan_out={'items': 'user_inputs.services', **fan_out}
+    )
+
+
+async def _run(orchestrator, stage, services):
+    await orchestrator.start()
+    try:
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(stage))
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'services': services})
+        return await wait_for_execution(orchestrator, execution_id)
+    finally:
+        await orchestrator.stop()
+
+
+def test_failed_items_are_isolated(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FailingItemsAI(failing={'billing'}))
+        details = await _run(orchestrator, _fan_out_stage(), ['auth', 'billing', 'search'])
+
+        assert details['status'] == 'completed'
+        outputs = details['stage_outputs']['services']['outputs']
+        assert outputs['item_count'] == 3 and outputs['failed_count'] == 1
+        assert [(r['item'], r['status']) for r in outputs['items']] == [
+            ('auth', 'completed'), ('billing', 'failed'), ('search', 'completed')
+        ]
+        assert outputs['generated_content'] == 'generated: design auth\n\ngenerated: design search'
+
+    asyncio.run(scenario())
+
+
+def test_item_errors_fail_the_stage_when_requested_or_when_all_fail(make_orchestrator):
+    async def scenario():
+        strict = await _run(
+            make_orchestrator(FailingItemsAI(failing={'billing'})),
+            _fan_out_stage(fail_on_item_error=True),
+            ['auth', 'billing']
+        )
+        all_failed = await _run(
+            make_orchestrator(FailingItemsAI(failing={'auth', 'billing'})), _fan_out_stage(), ['auth', 'billing']
+        )
+
+        assert strict['status'] == 'failed'
+        assert '1 of 2 fan-out items failed' in strict['stage_outputs']['services']['error']
+        assert all_failed['status'] == 'failed'
+        assert 'All 2 fan-out items failed' in all_failed['stage_outputs']['services']['error']
+
+    asyncio.run(scenario())
+
+
+def test_parallelism_is_bounded(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FakeAIProcessor(delay=0.05))
+        details = await _run(orchestrator, _fan_out_stage(max_parallelism=2), [f"svc{i}" for i in range(6)])
+
+        assert details['status'] == 'completed'
+        assert orchestrator.ai_processor.peak_active == 2
+
+    asyncio.run(scenario())
+
+
+def test_reduce_prompt_merges_successful_items(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FailingItemsAI(failing={'billing'}))
+        stage = _fan_out_stage(reduce_prompt="merge {{ results | map(attribute='item') | join(',') }}")
+        details = await _run(orchestrator, stage, ['auth', 'billing', 'search'])
+
+        assert details['stage_outputs']['services']['outputs']['generated_content'] == 'generated: merge auth,search'
+
+    asyncio.run(scenario())
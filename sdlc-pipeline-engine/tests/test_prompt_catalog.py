@@ -0,0 +1,83 @@
+"""
+Prompt Catalog tests
+Key lookup, mtime refresh and template handles
+"""
+
+import asyncio
+import os
+
+from sdlc_pipeline_engine.prompt_catalog import PromptCatalog
+
+
+def _write_prompt(base, stage_dir, name, content):
+    path = base / stage_dir / 'prompts' / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def test_resolves_logical_stage_qualified_and_relative_keys(tmp_path):
+    _write_prompt(tmp_path, '1-planning', 'project_charter.md', 'charter for {{ user_inputs.name }}')
+    catalog = PromptCatalog(str(tmp_path), refresh_interval_seconds=-1)
+
+    for spec in ('project_charter', 'project_charter.md', '1-planning/project_charter', 'file: 1-planning/prompts/project_charter.md'):
+        assert catalog.resolve(spec, 'planning') == 'charter for {{ user_inputs.name }}'
+
+
+def test_markdown_wins_over_other_extensions(tmp_path):
+    _write_prompt(tmp_path, '3-design', 'architecture.txt', 'text')
+    _write_prompt(tmp_path, '3-design', 'architecture.md', 'markdown')
+    catalog = PromptCatalog(str(tmp_path), refresh_interval_seconds=-1)
+
+    assert catalog.resolve('architecture', 'design') == 'markdown'
+
+
+def test_unknown_spec_raises(tmp_path):
+    catalog = PromptCatalog(str(tmp_path), refresh_interval_seconds=-1)
+
+    try:
+        catalog.resolve('missing', 'planning')
+    except FileNotFoundError:
+        pass
+    else:
+        raise AssertionError("expected FileNotFoundError")
+
+
+def test_refresh_rereads_changed_files_and_bumps_generation(tmp_path):
+    path = _write_prompt(tmp_path, '1-planning', 'charter.md', 'v1')
+    catalog = PromptCatalog(str(tmp_path), refresh_interval_seconds=0)
+    generation = catalog.generation
+
+    path.write_text('version two')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert catalog.resolve('charter', 'planning') == 'version two'
+    assert catalog.generation > generation
+
+
+def test_refresh_inside_the_event_loop_runs_in_the_background(tmp_path):
+    path = _write_prompt(tmp_path, '1-planning', 'charter.md', 'v1')
+    catalog = PromptCatalog(str(tmp_path), refresh_interval_seconds=0)
+
+    async def scenario():
+        path.write_text('version two')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        # The lookup that triggers the rescan is served from memory
+        assert catalog.resolve('charter', 'planning') == 'v1'
+        while catalog.resolve('charter', 'planning') != 'version two':
+            await asyncio.sleep(0.01)
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+
+
+def test_handle_falls_back_to_inline_template_and_reports_variables(tmp_path):
+    catalog = PromptCatalog(str(tmp_path), refresh_interval_seconds=-1)
+    handle = catalog.handle('Summarize {{ user_inputs.topic }} using {{ stage_outputs.plan }}', 'planning')
+
+    assert isinstance(handle.resolution_error, FileNotFoundError)
+    assert handle.variables == {'user_inputs', 'stage_outputs'}
+    assert handle.template() is handle.template()
+    assert handle.template().render(user_inputs={'topic': 'x'}, stage_outputs={'plan': 'p'}) == 'Summarize x using p'
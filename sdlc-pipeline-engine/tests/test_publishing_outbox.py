@@ -0,0 +1,87 @@
+"""
+Publishing Outbox tests
+Retries with backoff, the failed/ directory and recovery of pending jobs
+"""
+
+import asyncio
+import json
+
+from sdlc_pipeline_engine.publishing_outbox import PublishingOutbox
+
+FAST_RETRIES = {'workers': 2, 'max_attempts': 3, 'retry_delay_seconds': 0.01, 'backoff_multiplier': 2.0}
+
+
+def test_job_is_retried_until_the_handler_succeeds(tmp_path):
+    async def scenario():
+        attempts = []
+
+        async def handler(job):
+            attempts.append(job['attempts'])
+            if len(attempts) < 3:
+                raise ConnectionError('repository unavailable')
+
+        outbox = PublishingOutbox(FAST_RETRIES, tmp_path, handler)
+        await outbox.enqueue({'stage_id': 'plan'})
+        await asyncio.wait_for(outbox.join(), 5)
+        await outbox.stop()
+
+        assert attempts == [1, 2, 3]
+        assert outbox.outstanding_count == 0
+        assert list((tmp_path / 'pending').iterdir()) == []
+        assert list((tmp_path / 'failed').iterdir()) == []
+
+    asyncio.run(scenario())
+
+
+def test_job_moves_to_failed_after_its_last_attempt(tmp_path):
+    async def scenario():
+        failures = []
+
+        async def handler(job):
+            raise ConnectionError(f"attempt {job['attempts']} refused")
+
+        async def on_failed(job, error):
+            failures.append((job['job_id'], str(error)))
+
+        outbox = PublishingOutbox(FAST_RETRIES, tmp_path, handler, on_failed)
+        job_id = await outbox.enqueue({'stage_id': 'plan'})
+        await asyncio.wait_for(outbox.join(), 5)
+        await outbox.stop()
+
+        failed = json.loads((tmp_path / 'failed' / f"{job_id}.json").read_text())
+        assert failed['attempts'] == 3
+        assert failed['last_error'] == 'attempt 3 refused'
+        assert failed['stage_id'] == 'plan'
+        assert failures == [(job_id, 'attempt 3 refused')]
+        assert list((tmp_path / 'pending').iterdir()) == []
+
+    asyncio.run(scenario())
+
+
+def test_pending_jobs_survive_a_restart(tmp_path):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def stuck(job):
+            await release.wait()
+
+        first = PublishingOutbox(FAST_RETRIES, tmp_path, stuck)
+        job_id = await first.enqueue({'stage_id': 'design'})
+        await asyncio.sleep(0.05)
+        await first.stop()
+        assert (tmp_path / 'pending' / f"{job_id}.json").exists()
+
+        published = []
+
+        async def handler(job):
+            published.append((job['job_id'], job['stage_id']))
+
+        second = PublishingOutbox(FAST_RETRIES, tmp_path, handler)
+        await second.start()
+        await asyncio.wait_for(second.join(), 5)
+        await second.stop()
+
+        assert published == [(job_id, 'design')]
+        assert not (tmp_path / 'pending' / f"{job_id}.json").exists()
+
+    asyncio.run(scenario())
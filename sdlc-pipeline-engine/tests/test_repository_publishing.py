@@ -0,0 +1,126 @@
+"""
+Repository publishing tests
+Concurrent publishing per stage, the parallelism cap, per-repository timeouts and retries
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from conftest import make_pipeline, make_stage, wait_for_execution
+
+
+class FakeConnector:
+    """Records published artifacts; per-repository delays and failure counts are configurable"""
+
+    def __init__(self, delays=None, failures=None):
+        self.delays = delays or {}
+        self.failures = dict(failures or {})
+        self.published = []
+        self.active = 0
+        self.peak_active = 0
+
+    async def store_artifacts(self, artifacts, config, context):
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(config['name'], 0.05))
+            if self.failures.get(config['name'], 0) > 0:
+                self.failures[config['name']] -= 1
+                raise ConnectionError(f"{config['name']} unavailable")
+            self.published.append((config['name'], [a['name'] for a in artifacts]))
+            return {'stored': len(artifacts)}
+        finally:
+            self.active -= 1
+
+
+def repository(name, **overrides):
+    config = {
+        'name': name,
+        'type': 'fake',
+        'artifact_mappings': [
+            {'output_key': 'generated_content', 'artifact_name': f"{name}.md", 'artifact_type': 'document'}
+        ]
+    }
+    config.update(overrides)
+    return config
+
+
+def publish(orchestrator, repositories, max_parallelism=None):
+    context = SimpleNamespace(execution_id='exec-1', project_id='project-1')
+    return orchestrator._store_stage_artifacts(
+        repositories, {'generated_content': 'plan'}, context, max_parallelism
+    )
+
+
+def test_repositories_are_published_concurrently(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        connector = FakeConnector()
+        orchestrator.repository_factory.connectors['fake'] = connector
+
+        results = await publish(orchestrator, [repository('git'), repository('wiki'), repository('jira')])
+
+        assert connector.peak_active == 3
+        assert set(results) == {'git', 'wiki', 'jira'}
+        assert all(result['stored'] == 1 for result in results.values())
+        assert sorted(connector.published) == [('git', ['git.md']), ('jira', ['jira.md']), ('wiki', ['wiki.md'])]
+
+    asyncio.run(scenario())
+
+
+def test_max_parallelism_caps_concurrent_repositories(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        connector = FakeConnector()
+        orchestrator.repository_factory.connectors['fake'] = connector
+
+        await publish(orchestrator, [repository('git'), repository('wiki'), repository('jira')], max_parallelism=1)
+
+        assert connector.peak_active == 1
+        assert len(connector.published) == 3
+
+    asyncio.run(scenario())
+
+
+def test_slow_or_failing_repositories_do_not_affect_the_others(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(publishing_config={'repository_timeout_seconds': 0.2})
+        connector = FakeConnector(delays={'wiki': 5}, failures={'jira': 1})
+        orchestrator.repository_factory.connectors['fake'] = connector
+
+        results = await publish(orchestrator, [
+            repository('git'), repository('wiki'), repository('jira'), repository('slow', timeout_seconds=0.05)
+        ])
+
+        assert results['git']['stored'] == 1
+        assert results['wiki'] == {'error': 'Timed out after 0.2s'}
+        assert results['jira'] == {'error': 'jira unavailable'}
+        assert results['slow'] == {'error': 'Timed out after 0.05s'}
+
+    asyncio.run(scenario())
+
+
+def test_only_failed_repositories_are_retried(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(publishing_config={'retry_delay_seconds': 0.01, 'max_attempts': 3})
+        connector = FakeConnector(failures={'jira': 1})
+        orchestrator.repository_factory.connectors['fake'] = connector
+        await orchestrator.start()
+
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+            make_stage('plan', repositories=[repository('git'), repository('jira')])
+        ))
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'search'})
+        await wait_for_execution(orchestrator, execution_id)
+        await asyncio.wait_for(orchestrator.publishing_outbox.join(), 5)
+
+        details = await orchestrator.get_execution_details(execution_id)
+        repositories = details['stage_outputs']['plan']['repositories']
+        assert repositories['git']['status'] == 'published'
+        assert repositories['git']['attempts'] == 1
+        assert repositories['jira']['status'] == 'published'
+        assert repositories['jira']['attempts'] == 2
+        assert [name for name, _ in connector.published] == ['git', 'jira']
+        await orchestrator.stop()
+
+    asyncio.run(scenario())
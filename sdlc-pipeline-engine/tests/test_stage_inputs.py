@@ -0,0 +1,55 @@
+"""
+Stage input tests
+Templates receive only the variables they reference, with upstream outputs as plain dicts
+"""
+
+import asyncio
+import json
+
+from conftest import make_pipeline, make_stage, wait_for_execution
+
+
+def test_downstream_prompt_renders_upstream_output(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        await orchestrator.start()
+        try:
+            pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+                make_stage('plan'),
+                make_stage('review', dependencies=['plan'],
+                           prompt_template="review: {{ plan_output.generated_content }}")
+            ))
+            execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'billing'})
+            details = await wait_for_execution(orchestrator, execution_id)
+        finally:
+            await orchestrator.stop()
+
+        assert details['status'] == 'completed'
+        assert orchestrator.ai_processor.prompts == ['plan for billing', 'review: generated: plan for billing']
+
+    asyncio.run(scenario())
+
+
+def test_only_referenced_variables_are_built(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+            make_stage('plan'),
+            make_stage('design'),
+            make_stage('review', dependencies=['plan', 'design'],
+                       prompt_template="{{ design_output.generated_content }}")
+        ))
+        plan = await orchestrator._get_execution_plan(pipeline_id)
+        execution_id = await orchestrator._create_execution(plan, pipeline_id, {'topic': 'x'})
+        context = orchestrator.active_executions[execution_id]['context']
+        for stage_id in ('plan', 'design'):
+            context.stage_outputs[stage_id] = {'status': 'completed', 'outputs': {'generated_content': stage_id}}
+
+        inputs = await orchestrator._prepare_stage_inputs(plan.stage('review'), context)
+
+        assert inputs == {'design_output': {'generated_content': 'design'}}
+        # Upstream outputs are shared, not copied, and stay JSON-serializable
+        assert inputs['design_output'] is context.stage_outputs['design']['outputs']
+        json.dumps(inputs)
+
+    asyncio.run(scenario())
@@ -0,0 +1,107 @@
+"""
+Stage profiler tests
+Phase timings, critical path metadata and Chrome/OTLP trace export
+"""
+
+import asyncio
+import json
+import time
+
+from conftest import FakeAIProcessor, make_pipeline, make_stage, wait_for_execution
+
+from sdlc_pipeline_engine.stage_profiler import (
+    StageProfile, build_chrome_trace, build_otlp_trace, current_profile, profile_phase, stage_profile
+)
+
+
+def test_phases_accumulate_only_inside_a_stage_profile():
+    with profile_phase('prompt_rendering'):
+        assert current_profile() is None
+
+    with stage_profile(StageProfile(record_spans=True)) as profile:
+        for _ in range(2):
+            with profile_phase('validation'):
+                time.sleep(0.01)
+        profile.count('provider_calls')
+    assert current_profile() is None
+
+    timings = profile.to_dict()
+    assert timings['phases']['validation'] >= 0.02
+    assert timings['total'] >= timings['phases']['validation']
+    assert timings['counters'] == {'provider_calls': 1}
+    assert [span['phase'] for span in timings['spans']] == ['validation', 'validation']
+    assert timings['spans'][1]['offset'] >= timings['spans'][0]['duration']
+
+
+def sample_outputs():
+    return {
+        'plan': {'status': 'completed', 'timings': {
+            'started_at': 1000.0, 'total': 2.0, 'phases': {'provider_call': 1.5},
+            'spans': [{'phase': 'provider_call', 'offset': 0.25, 'duration': 1.5}]
+        }},
+        'skipped': {'status': 'skipped'}
+    }
+
+
+def test_chrome_trace_has_a_thread_per_stage_and_phase_slices():
+    trace = build_chrome_trace('exec-1', sample_outputs())
+
+    slices = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    assert [(e['name'], e['cat'], e['ts'], e['dur']) for e in slices] == [
+        ('plan', 'stage', 1000.0 * 1e6, 2.0 * 1e6),
+        ('provider_call', 'phase', 1000.25 * 1e6, 1.5 * 1e6)
+    ]
+    threads = [e['args']['name'] for e in trace['traceEvents'] if e['name'] == 'thread_name']
+    assert threads == ['plan']
+
+
+def test_otlp_trace_nests_phase_spans_under_stage_spans():
+    trace = build_otlp_trace('0b5e-42', sample_outputs())
+
+    [stage_span, phase_span] = trace['resourceSpans'][0]['scopeSpans'][0]['spans']
+    assert stage_span['traceId'] == '0b5e42'.ljust(32, '0')
+    assert stage_span['name'] == 'stage plan'
+    assert stage_span['startTimeUnixNano'] == str(1000 * 10**9)
+    assert stage_span['endTimeUnixNano'] == str(1002 * 10**9)
+    assert {'key': 'phase.provider_call.seconds', 'value': {'doubleValue': 1.5}} in stage_span['attributes']
+    assert phase_span['parentSpanId'] == stage_span['spanId']
+    assert phase_span['startTimeUnixNano'] == str(1000_250_000_000)
+
+
+def test_execution_records_phase_timings_critical_path_and_trace(make_orchestrator, tmp_path):
+    async def scenario():
+        orchestrator = make_orchestrator(
+            ai=FakeAIProcessor(delay=0.02),
+            profiling_config={'trace_dir': str(tmp_path / 'traces'), 'trace_format': 'otlp'}
+        )
+        pipeline_id = await orchestrator.create_pipeline(make_pipeline(
+            make_stage('plan'),
+            make_stage('design', dependencies=['plan']),
+            make_stage('docs', dependencies=['plan'], prompt_template='docs')
+        ))
+        statuses = orchestrator.event_bus.subscribe(event_types=['execution_status'])
+        execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'search'})
+        details = await wait_for_execution(orchestrator, execution_id)
+        # The trace is written just before the final status event
+        async def completed():
+            async for event in statuses:
+                if event['status'] == 'completed':
+                    return
+        await asyncio.wait_for(completed(), timeout=10)
+
+        timings = details['stage_outputs']['plan']['timings']
+        assert {'input_preparation', 'prompt_rendering', 'provider_call', 'validation'} <= set(timings['phases'])
+        assert timings['counters']['provider_calls'] == 1
+
+        critical_path = details['critical_path']
+        assert critical_path['stages'][0] == 'plan'
+        assert critical_path['slack']['plan'] == 0.0
+        assert set(critical_path['slack']) == {'plan', 'design', 'docs'}
+
+        trace = json.loads((tmp_path / 'traces' / f"{execution_id}.otlp.json").read_text())
+        spans = trace['resourceSpans'][0]['scopeSpans'][0]['spans']
+        assert sorted(s['name'] for s in spans if 'parentSpanId' not in s) == [
+            'stage design', 'stage docs', 'stage plan'
+        ]
+
+    asyncio.run(scenario())
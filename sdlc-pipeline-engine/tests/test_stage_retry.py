@@ -0,0 +1,140 @@
+"""
+Stage retry tests
+Deadlines, exponential backoff, provider error classification and cancellation of in-flight stages
+"""
+
+import asyncio
+import time
+
+from conftest import FakeAIProcessor, make_pipeline, make_stage, wait_for_execution
+from sdlc_pipeline_engine.ai_processor import ProviderAPIError
+
+
+async def _run(orchestrator, *stages):
+    await orchestrator.start()
+    pipeline_id = await orchestrator.create_pipeline(make_pipeline(*stages))
+    execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'retries'})
+    return execution_id, await wait_for_execution(orchestrator, execution_id)
+
+
+def test_retryable_failure_is_retried_after_backoff(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        orchestrator.ai_processor.failures = [RuntimeError('connection reset')]
+        try:
+            started = time.perf_counter()
+            _, details = await _run(orchestrator, make_stage(
+                'plan', retry_policy={'max_retries': 2, 'retry_delay_seconds': 0.1}
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            await orchestrator.stop()
+
+        assert details['status'] == 'completed'
+        assert details['stage_outputs']['plan']['attempts'] == 2
+        assert elapsed >= 0.1
+        assert len(orchestrator.ai_processor.prompts) == 2
+
+    asyncio.run(scenario())
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(make_orchestrator):
+    orchestrator = make_orchestrator()
+    policy = {'retry_delay_seconds': 1, 'backoff_multiplier': 3, 'max_delay_seconds': 20}
+
+    assert [orchestrator._retry_delay(policy, attempt) for attempt in (1, 2, 3, 4)] == [1, 3, 9, 20]
+
+
+def test_stage_deadline_fails_a_stalled_stage(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FakeAIProcessor(delay=5))
+        try:
+            started = time.perf_counter()
+            # 0.005 minutes = 0.3 s
+            _, details = await _run(orchestrator, make_stage('plan', timeout_minutes=0.005))
+            elapsed = time.perf_counter() - started
+        finally:
+            await orchestrator.stop()
+
+        assert details['status'] == 'failed'
+        assert 'exceeded its timeout' in details['stage_outputs']['plan']['error']
+        assert elapsed < 2
+
+    asyncio.run(scenario())
+
+
+def test_retry_that_would_cross_the_deadline_is_not_attempted(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        orchestrator.ai_processor.failures = [RuntimeError('flaky')]
+        try:
+            started = time.perf_counter()
+            _, details = await _run(orchestrator, make_stage(
+                'plan', timeout_minutes=0.01, retry_policy={'max_retries': 3, 'retry_delay_seconds': 5}
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            await orchestrator.stop()
+
+        assert details['status'] == 'failed'
+        assert details['stage_outputs']['plan']['attempts'] == 1
+        assert elapsed < 2
+
+    asyncio.run(scenario())
+
+
+def test_provider_errors_are_classified(make_orchestrator):
+    orchestrator = make_orchestrator()
+    retryable = lambda error, **policy: orchestrator._is_retryable_error(error, policy)  # noqa: E731
+
+    # Auth and request errors are final even when retry_on names them
+    assert not retryable(ProviderAPIError('unauthorized', 401), retry_provider_errors=True)
+    assert not retryable(ProviderAPIError('bad request', 400), retry_on=['ProviderAPIError'])
+    # Transient provider errors were already retried by the client; stage retries are opt-in
+    assert not retryable(ProviderAPIError('unavailable', 503))
+    assert retryable(ProviderAPIError('unavailable', 503), retry_provider_errors=True)
+    assert retryable(ProviderAPIError('rate limited', 429), retry_on=['ProviderAPIError'])
+    # Validation and configuration errors are final; anything else is retried
+    assert not retryable(ValueError('invalid output'))
+    assert retryable(ConnectionError('reset'))
+    assert not retryable(ConnectionError('reset'), retry_on=['TimeoutError'])
+
+
+def test_non_retryable_provider_error_fails_on_first_attempt(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator()
+        orchestrator.ai_processor.failures = [ProviderAPIError('invalid api key', 401)]
+        try:
+            _, details = await _run(orchestrator, make_stage(
+                'plan', retry_policy={'max_retries': 3, 'retry_delay_seconds': 0, 'retry_provider_errors': True}
+            ))
+        finally:
+            await orchestrator.stop()
+
+        assert details['status'] == 'failed'
+        assert details['stage_outputs']['plan']['attempts'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancel_interrupts_an_in_flight_provider_call(make_orchestrator):
+    async def scenario():
+        orchestrator = make_orchestrator(FakeAIProcessor(delay=30))
+        await orchestrator.start()
+        try:
+            pipeline_id = await orchestrator.create_pipeline(make_pipeline())
+            execution_id = await orchestrator.execute_pipeline(pipeline_id, {'topic': 'cancel'})
+            while orchestrator.ai_processor.active == 0:
+                await asyncio.sleep(0.01)
+
+            started = time.perf_counter()
+            await orchestrator.cancel_execution(execution_id)
+            details = await wait_for_execution(orchestrator, execution_id, timeout=2)
+        finally:
+            await orchestrator.stop()
+
+        assert details['status'] == 'cancelled'
+        assert time.perf_counter() - started < 2
+        assert orchestrator.ai_processor.active == 0
+
+    asyncio.run(scenario())
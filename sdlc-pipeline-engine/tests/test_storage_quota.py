@@ -0,0 +1,132 @@
+"""
+Storage quota tests
+Incremental usage counters, quota policies and batched access-time tracking
+"""
+
+import asyncio
+
+import pytest
+
+from sdlc_pipeline_engine.artifact_manager import ArtifactManager
+from sdlc_pipeline_engine.storage_quota import StorageQuotaExceededError
+
+
+async def quota_manager(tmp_path, policy, **config):
+    manager = ArtifactManager({
+        'storage_path': str(tmp_path), 'compression_enabled': False, 'max_storage_size': 35,
+        'storage_quota_policy': policy, 'eviction_min_idle_seconds': 0, **config
+    })
+    await manager.start()
+    return manager
+
+
+async def store(manager, name, execution_id='exec-1'):
+    # Ten bytes each, distinct content so no blobs are shared
+    artifact_id = await manager.store_artifact(name, f"{name:>10}", 'documentation', execution_id, 'stage')
+    await asyncio.sleep(0.01)
+    return artifact_id
+
+
+def test_usage_counters_follow_stores_and_deletes(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path), 'compression_enabled': False})
+        await manager.start()
+        a = await store(manager, 'a')
+        await manager.store_artifact('dup', '         a', 'source_code', 'exec-2', 'stage')
+        await store(manager, 'b', 'exec-2')
+
+        stats = await manager.get_storage_stats()
+        assert (stats['total_artifacts'], stats['total_size'], stats['total_stored_size']) == (3, 30, 20)
+        assert stats['by_type'] == {'documentation': {'count': 2, 'size': 20}, 'source_code': {'count': 1, 'size': 10}}
+        assert stats['by_execution']['exec-2'] == {'count': 2, 'size': 20}
+
+        await manager.delete_artifact(a)
+        stats = await manager.get_storage_stats()
+        assert (stats['total_artifacts'], stats['total_stored_size']) == (2, 20)
+        assert 'exec-1' not in stats['by_execution']
+
+    asyncio.run(scenario())
+
+
+def test_reject_policy_refuses_stores_over_the_quota(tmp_path):
+    async def scenario():
+        manager = await quota_manager(tmp_path, 'reject')
+        for name in 'abc':
+            await store(manager, name)
+
+        with pytest.raises(StorageQuotaExceededError) as rejected:
+            await store(manager, 'd')
+
+        assert (rejected.value.required_bytes, rejected.value.available_bytes) == (10, 5)
+        assert (await manager.get_storage_stats())['total_artifacts'] == 3
+        # Content already held needs no new space
+        await manager.store_artifact('copy', '         a', 'documentation', 'exec-2', 'stage')
+
+    asyncio.run(scenario())
+
+
+def test_lru_policy_evicts_the_least_recently_accessed_artifacts(tmp_path):
+    async def scenario():
+        manager = await quota_manager(tmp_path, 'evict_lru')
+        a, b, c = [await store(manager, name) for name in 'abc']
+        b_blob = manager.artifact_index[b].blob
+        await manager.get_artifact_content(a)
+        await asyncio.sleep(0.01)
+
+        d = await store(manager, 'd')
+
+        assert set(manager.artifact_index) == {a, c, d}
+        assert manager.evicted_artifacts == 1
+        assert not manager.blob_store.exists(b_blob)
+
+    asyncio.run(scenario())
+
+
+def test_oldest_execution_policy_evicts_whole_executions(tmp_path):
+    async def scenario():
+        manager = await quota_manager(tmp_path, 'evict_oldest_execution')
+        await store(manager, 'a', 'exec-1')
+        await store(manager, 'b', 'exec-2')
+        await store(manager, 'c', 'exec-1')
+
+        await store(manager, 'd', 'exec-3')
+
+        assert {record.execution_id for record in manager.artifact_index.values()} == {'exec-2', 'exec-3'}
+        assert manager.evicted_artifacts == 2
+
+    asyncio.run(scenario())
+
+
+def test_recently_used_artifacts_are_never_evicted(tmp_path):
+    async def scenario():
+        manager = await quota_manager(tmp_path, 'evict_lru', eviction_min_idle_seconds=3600)
+        for name in 'abc':
+            await store(manager, name)
+
+        with pytest.raises(StorageQuotaExceededError):
+            await store(manager, 'd')
+        assert len(manager.artifact_index) == 3
+
+    asyncio.run(scenario())
+
+
+def test_access_times_are_persisted_in_batches(tmp_path):
+    async def scenario():
+        manager = ArtifactManager({'storage_path': str(tmp_path), 'access_flush_batch': 2})
+        await manager.start()
+        a = await store(manager, 'a')
+        b = await store(manager, 'b')
+
+        await manager.get_artifact_content(a)
+        await asyncio.sleep(0.05)
+        assert await manager.index_store.load_access_times() == {}
+
+        await manager.get_artifact_content(b)
+        await asyncio.sleep(0.05)
+        assert set(await manager.index_store.load_access_times()) == {a, b}
+
+        restarted = ArtifactManager({'storage_path': str(tmp_path)})
+        await restarted.start()
+        assert restarted.usage.last_access(b) == manager.usage.last_access(b)
+
+    asyncio.run(scenario())
@@ -0,0 +1,114 @@
+"""
+Transformation Sandbox tests
+Worker isolation, timeouts that replace only the stuck worker, and restricted builtins
+"""
+
+import asyncio
+
+import pytest
+
+from sdlc_pipeline_engine.transformation_sandbox import TransformationSandbox, TransformationTimeoutError
+
+UPPERCASE = "artifact['content'] = artifact['content'].upper()"
+HANG = "while True:\n    pass"
+
+
+def _sandbox(**config):
+    return TransformationSandbox({'max_workers': 2, 'timeout_seconds': 1, **config})
+
+
+def test_runs_script_against_artifact():
+    async def scenario():
+        sandbox = _sandbox()
+        try:
+            result = await sandbox.run({'name': 'doc', 'content': 'hello'}, UPPERCASE)
+        finally:
+            sandbox.shutdown()
+        assert result == {'name': 'doc', 'content': 'HELLO'}
+
+    asyncio.run(scenario())
+
+
+def test_timeout_replaces_only_the_stuck_worker():
+    async def scenario():
+        sandbox = _sandbox()
+        try:
+            hung = asyncio.create_task(sandbox.run({'content': 'x'}, HANG))
+            healthy = asyncio.create_task(sandbox.run({'content': 'ok'}, UPPERCASE))
+
+            assert (await healthy)['content'] == 'OK'
+            with pytest.raises(TransformationTimeoutError):
+                await hung
+
+            # The pool keeps serving after the timeout
+            results = await asyncio.gather(*(sandbox.run({'content': str(i)}, UPPERCASE) for i in range(4)))
+            assert [r['content'] for r in results] == ['0', '1', '2', '3']
+            assert len(sandbox._workers) <= sandbox.max_workers
+        finally:
+            sandbox.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_script_errors_propagate_without_killing_the_worker():
+    async def scenario():
+        sandbox = _sandbox(max_workers=1)
+        try:
+            with pytest.raises(KeyError):
+                await sandbox.run({'content': 'x'}, "artifact['missing']")
+            worker = next(iter(sandbox._workers))
+            assert (await sandbox.run({'content': 'x'}, UPPERCASE))['content'] == 'X'
+            assert sandbox._workers == {worker}
+        finally:
+            sandbox.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_scripts_cannot_import_unlisted_modules_or_open_files():
+    async def scenario():
+        sandbox = _sandbox(max_workers=1)
+        try:
+            with pytest.raises(ImportError):
+                await sandbox.run({}, "import os")
+            with pytest.raises(NameError):
+                await sandbox.run({}, "open('/etc/passwd')")
+            result = await sandbox.run({'content': 'a,b'}, "import re\nartifact['parts'] = re.split(',', artifact['content'])")
+            assert result['parts'] == ['a', 'b']
+        finally:
+            sandbox.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_scripts_can_use_introspection_builtins():
+    async def scenario():
+        sandbox = _sandbox(max_workers=1)
+        script = (
+            "class Doc:\n"
+            "    pass\n"
+            "doc = Doc()\n"
+            "setattr(doc, 'title', getattr(artifact, 'get')('name'))\n"
+            "artifact['kind'] = type(doc).__name__\n"
+            "artifact['title'] = doc.title if hasattr(doc, 'title') else None"
+        )
+        try:
+            result = await sandbox.run({'name': 'spec'}, script)
+            with pytest.raises(NameError):
+                await sandbox.run({}, "eval('1')")
+        finally:
+            sandbox.shutdown()
+        assert result == {'name': 'spec', 'kind': 'Doc', 'title': 'spec'}
+
+    asyncio.run(scenario())
+
+
+def test_compile_is_cached_and_syntax_errors_are_remembered():
+    sandbox = _sandbox()
+
+    assert sandbox.compile(UPPERCASE) is not None
+    assert sandbox.compile(UPPERCASE)[1] is sandbox.compile(UPPERCASE)[1]
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            sandbox.compile("artifact[")
+    assert len(sandbox._compile_errors) == 1
@@ -0,0 +1,278 @@
+"""
+Transformation Sandbox
+Runs user-supplied artifact transformation scripts in isolated worker processes
+"""
+
+import asyncio
+import builtins
+import hashlib
+import json
+import logging
+import marshal
+import multiprocessing
+import signal
+from datetime import datetime
+from types import CodeType
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+class TransformationTimeoutError(Exception):
+    """Raised when a transformation script exceeds its time budget"""
+
+
+# Modules transformation scripts may import unless transformation_config.allowed_modules says otherwise
+DEFAULT_ALLOWED_MODULES = (
+    'base64', 'collections', 'datetime', 'functools', 'hashlib', 'itertools',
+    'json', 'math', 're', 'string', 'textwrap', 'uuid'
+)
+
+# Builtins available to scripts: everything except file and process access, eval/exec/compile,
+# and frame or namespace access (globals, locals, vars, breakpoint, input)
+_SAFE_BUILTIN_NAMES = (
+    'abs', 'all', 'any', 'ascii', 'bin', 'bool', 'bytearray', 'bytes', 'callable', 'chr', 'classmethod',
+    'complex', 'delattr', 'dict', 'dir', 'divmod', 'enumerate', 'filter', 'float', 'format', 'frozenset',
+    'getattr', 'hasattr', 'hash', 'hex', 'id', 'int', 'isinstance', 'issubclass', 'iter', 'len', 'list',
+    'map', 'max', 'memoryview', 'min', 'next', 'object', 'oct', 'ord', 'pow', 'print', 'property',
+    'range', 'repr', 'reversed', 'round', 'set', 'setattr', 'slice', 'sorted', 'staticmethod', 'str',
+    'sum', 'super', 'tuple', 'type', 'zip', '__build_class__', 'NotImplemented', 'Ellipsis',
+    'BaseException', 'Exception', 'ArithmeticError', 'AssertionError', 'AttributeError', 'ImportError',
+    'IndexError', 'KeyError', 'LookupError', 'NameError', 'NotImplementedError', 'OverflowError',
+    'RuntimeError', 'StopIteration', 'TypeError', 'UnicodeDecodeError', 'UnicodeEncodeError',
+    'UnicodeError', 'ValueError', 'ZeroDivisionError'
+)
+
+# Worker-side state: unmarshalled code objects by script hash, and the scripts' builtins
+_worker_code_cache: Dict[str, CodeType] = {}
+_worker_builtins: Dict[str, Any] = {}
+
+
+def _restricted_import(allowed_modules: Set[str]):
+    def _import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level != 0 or name.split('.', 1)[0] not in allowed_modules:
+            raise ImportError(f"Module {name!r} is not available to transformation scripts")
+        return builtins.__import__(name, globals, locals, fromlist, level)
+    return _import
+
+
+def _init_worker(memory_limit_bytes: int, allowed_modules: Iterable[str]):
+    """Apply the per-worker memory limit (POSIX only) and build the scripts' builtins"""
+    if resource is not None and memory_limit_bytes > 0:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+        except (ValueError, OSError):
+            pass
+
+    _worker_builtins.clear()
+    _worker_builtins.update({name: getattr(builtins, name) for name in _SAFE_BUILTIN_NAMES})
+    _worker_builtins['__import__'] = _restricted_import(set(allowed_modules))
+
+
+def _raise_timeout(signum, frame):
+    raise TransformationTimeoutError("Transformation script timed out")
+
+
+def _run_transformation(
+    script_hash: str,
+    code_bytes: Optional[bytes],
+    artifact: Dict[str, Any],
+    timeout_seconds: float
+) -> Dict[str, Any]:
+    """Execute a compiled transformation script against an artifact inside a worker"""
+
+    code = _worker_code_cache.get(script_hash)
+    if code is None:
+        code = marshal.loads(code_bytes)
+        _worker_code_cache[script_hash] = code
+
+    use_alarm = hasattr(signal, 'setitimer') and timeout_seconds > 0
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        exec_globals = {
+            "__builtins__": _worker_builtins,
+            "__name__": "__transformation__",
+            "artifact": artifact,
+            "json": json,
+            "datetime": datetime
+        }
+        exec(code, exec_globals)
+        return exec_globals["artifact"]
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _worker_main(conn, memory_limit_bytes: int, allowed_modules: Tuple[str, ...]):
+    """Serve transformation calls from the parent until it sends None or goes away"""
+
+    _init_worker(memory_limit_bytes, allowed_modules)
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+
+        try:
+            reply = ('ok', _run_transformation(*message))
+        except BaseException as e:
+            reply = ('error', e)
+        try:
+            conn.send(reply)
+        except Exception:
+            # Unpicklable result or exception
+            conn.send(('error', RuntimeError(f"{type(reply[1]).__name__}: {reply[1]}")))
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe"""
+
+    def __init__(self, context, memory_limit_bytes: int, allowed_modules: Tuple[str, ...]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit_bytes, allowed_modules),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        # Script hashes whose code this worker has already been sent
+        self.scripts: Set[str] = set()
+
+    def call(self, message: Tuple[Any, ...], timeout: float) -> Tuple[str, Any]:
+        """Send one call and wait for its reply (blocking; run in a thread)"""
+
+        self.conn.send(message)
+        if not self.conn.poll(timeout):
+            raise TransformationTimeoutError(
+                f"Transformation script exceeded {timeout}s and was terminated"
+            )
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            raise RuntimeError(f"Transformation worker exited unexpectedly (exit code {self.process.exitcode})")
+
+    def kill(self):
+        try:
+            self.process.kill()
+        except Exception:
+            pass
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except Exception:
+            self.kill()
+
+
+class TransformationSandbox:
+    """Executes transformation scripts off the event loop in separate processes.
+
+    Each call runs in its own worker process with a time limit, a memory limit
+    and restricted builtins and imports. A worker that times out, crashes or
+    is abandoned mid-call is killed and replaced on its own; calls running in
+    other workers are unaffected. Restricting builtins keeps scripts from
+    reaching files or processes by accident; it is not a boundary against
+    hostile code, which would need OS-level confinement of the workers.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+        self.max_workers = config.get('max_workers', 2)
+        self.timeout_seconds = config.get('timeout_seconds', 30)
+        self.memory_limit_bytes = int(config.get('memory_limit_mb', 512)) * 1024 * 1024
+        self.allowed_modules = tuple(config.get('allowed_modules', DEFAULT_ALLOWED_MODULES))
+        self.start_method = config.get('start_method', 'spawn')
+
+        # Compiled scripts keyed by SHA-256 of the source (marshalled for transfer to workers)
+        self._compiled: Dict[str, bytes] = {}
+        self._compile_errors: Dict[str, str] = {}
+
+        self._context = multiprocessing.get_context(self.start_method)
+        self._idle: List[_Worker] = []
+        self._workers: Set[_Worker] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def compile(self, script: str) -> Tuple[str, bytes]:
+        """Compile a script once and return its cache key and marshalled code object"""
+
+        script_hash = hashlib.sha256(script.encode('utf-8')).hexdigest()
+        if script_hash in self._compiled:
+            return script_hash, self._compiled[script_hash]
+        if script_hash in self._compile_errors:
+            raise SyntaxError(self._compile_errors[script_hash])
+
+        try:
+            code = compile(script, f"<transformation:{script_hash[:12]}>", "exec")
+        except SyntaxError as e:
+            self._compile_errors[script_hash] = str(e)
+            raise
+
+        code_bytes = marshal.dumps(code)
+        self._compiled[script_hash] = code_bytes
+        return script_hash, code_bytes
+
+    async def run(self, artifact: Dict[str, Any], script: str) -> Dict[str, Any]:
+        """Run a transformation script against an artifact in a worker process"""
+
+        script_hash, code_bytes = self.compile(script)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else await asyncio.to_thread(self._start_worker)
+            message = (
+                script_hash,
+                None if script_hash in worker.scripts else code_bytes,
+                dict(artifact),
+                self.timeout_seconds
+            )
+            try:
+                # The worker enforces the timeout itself; the grace period covers scripts
+                # stuck in C code that cannot be interrupted, whose worker is then killed.
+                status, value = await asyncio.to_thread(worker.call, message, self.timeout_seconds + 5)
+            except BaseException as e:
+                # Timed out, crashed or cancelled mid-call: replace only this worker
+                self._discard_worker(worker)
+                if isinstance(e, TransformationTimeoutError):
+                    self.logger.warning(f"Killed transformation worker after {self.timeout_seconds}s")
+                raise
+            worker.scripts.add(script_hash)
+            self._idle.append(worker)
+
+        if status == 'error':
+            raise value
+        return value
+
+    def _start_worker(self) -> _Worker:
+        worker = _Worker(self._context, self.memory_limit_bytes, self.allowed_modules)
+        self._workers.add(worker)
+        return worker
+
+    def _discard_worker(self, worker: _Worker):
+        worker.kill()
+        self._workers.discard(worker)
+
+    def shutdown(self):
+        """Stop all worker processes"""
+
+        idle = set(self._idle)
+        for worker in list(self._workers):
+            if worker in idle:
+                worker.stop()
+            else:
+                worker.kill()
+        self._idle.clear()
+        self._workers.clear()
+
+
+__all__ = ['TransformationSandbox', 'TransformationTimeoutError']
@@ -71,10 +71,32 @@ class ValidationEngine:
         self.custom_validators[name] = validator
         self.logger.info(f"Registered custom validator: {name}")
 
+    def parse_rules(self, rules: List[Any]) -> List[ValidationRule]:
+        """Convert rule dictionaries to ValidationRule objects.
+        Already parsed ValidationRule instances are returned as-is, so callers can
+        parse a stage's rules once and reuse them across executions.
+        """
+
+        validation_rules = []
+        for rule_dict in rules:
+            if isinstance(rule_dict, ValidationRule):
+                validation_rules.append(rule_dict)
+                continue
+            rule = ValidationRule(
+                name=rule_dict.get('name', rule_dict.get('rule', 'unnamed')),
+                description=rule_dict.get('description', ''),
+                severity=ValidationSeverity(rule_dict.get('severity', 'error')),
+                rule_type=rule_dict.get('rule', rule_dict.get('type', 'contains_text')),
+                parameters=rule_dict.get('parameters', {}),
+                custom_validator=rule_dict.get('custom_validator')
+            )
+            validation_rules.append(rule)
+        return validation_rules
+
     async def validate(
             self,
             outputs: Dict[str, Any],
-            rules: List[Dict[str, Any]],
+            rules: List[Any],
             quality_gates: Optional[List[Dict[str, Any]]] = None
     ) -> ValidationResult:
         """Validate outputs against specified rules"""
@@ -88,18 +110,8 @@ class ValidationEngine:
             details={}
         )
 
-        # Convert rule dictionaries to ValidationRule objects
-        validation_rules = []
-        for rule_dict in rules:
-            rule = ValidationRule(
-                name=rule_dict.get('name', rule_dict.get('rule', 'unnamed')),
-                description=rule_dict.get('description', ''),
-                severity=ValidationSeverity(rule_dict.get('severity', 'error')),
-                rule_type=rule_dict.get('rule', rule_dict.get('type', 'contains_text')),
-                parameters=rule_dict.get('parameters', {}),
-                custom_validator=rule_dict.get('custom_validator')
-            )
-            validation_rules.append(rule)
+        # Convert rule dictionaries to ValidationRule objects (pre-parsed rules pass through)
+        validation_rules = self.parse_rules(rules)
 
         # Execute validation rules
         for rule in validation_rules:
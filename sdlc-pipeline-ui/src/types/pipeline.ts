@@ -116,9 +116,16 @@ export interface PipelineExecution {
   progress: number;
   user_inputs: Record<string, any>;
   stage_outputs: Record<string, StageOutput>;
+  critical_path?: CriticalPath | null;
   error_message?: string;
 }
 
+export interface CriticalPath {
+  stages: string[];
+  duration: number;
+  slack: Record<string, number>;
+}
+
 export enum ExecutionStatus {
   PENDING = 'pending',
   RUNNING = 'running',